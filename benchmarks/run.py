@@ -0,0 +1,194 @@
+"""
+Benchmarks for django-tailwind's hot paths.
+
+Measures the per-render cost of the template tags with DEBUG on and off,
+the throughput of settings lookups, and the end-to-end time of
+`tailwind build` for a synthetic project with thousands of templates.
+Builds use a local stand-in for the standalone binary, so no network or
+Node.js is needed and the numbers cover this package's own overhead.
+
+    python -m benchmarks.run --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from io import StringIO
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+FAKE_BINARY_VERSION = "benchmark"
+
+FAKE_TAILWIND_CLI = """#!{python}
+import os
+import sys
+
+args = sys.argv[1:]
+output = args[args.index("-o") + 1]
+os.makedirs(os.path.dirname(output), exist_ok=True)
+with open(output, "w") as f:
+    f.write(".p-4{{padding:1rem}}" * 1000)
+"""
+
+TEMPLATE = """<div class="p-4 m-{index} text-gray-{shade} hover:bg-blue-{shade}">
+  <span class="font-bold w-{index}">Page {index}</span>
+</div>
+"""
+
+
+def per_call(func, number, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def bench_template_tags(number):
+    from django.template import Context
+    from django.template import Template
+    from django.test import override_settings
+
+    results = {}
+    for debug in (False, True):
+        for tag in ("tailwind_css", "tailwind_preload_css"):
+            template = Template(f"{{% load tailwind_tags %}}{{% {tag} %}}")
+            with override_settings(DEBUG=debug, TAILWIND_APP_NAME="theme"):
+                results[f"render_{tag}_debug_{str(debug).lower()}"] = {
+                    "seconds": per_call(lambda t=template: t.render(Context()), number),
+                    "unit": "per_call",
+                }
+    return results
+
+
+def bench_settings(number):
+    from tailwind import get_config
+    from tailwind import get_settings
+    from tailwind.conf import TailwindSettings
+
+    return {
+        "get_config": {
+            "seconds": per_call(lambda: get_config("TAILWIND_CSS_PATH"), number),
+            "unit": "per_call",
+        },
+        "get_settings": {"seconds": per_call(get_settings, number), "unit": "per_call"},
+        "settings_from_scratch": {
+            "seconds": per_call(TailwindSettings.from_settings, number),
+            "unit": "per_call",
+        },
+    }
+
+
+def create_project(root, templates):
+    """Writes a standalone Tailwind app, `templates` templates and a fake binary."""
+    app_dir = os.path.join(root, "bench_theme")
+    os.makedirs(os.path.join(app_dir, "static_src", "src"))
+    with open(os.path.join(app_dir, "__init__.py"), "w"):
+        pass
+    with open(os.path.join(app_dir, "static_src", "src", "styles.css"), "w") as f:
+        f.write('@import "tailwindcss";\n@source "../../../templates";\n')
+
+    templates_dir = os.path.join(root, "templates")
+    for index in range(templates):
+        subdir = os.path.join(templates_dir, f"section_{index % 50}")
+        os.makedirs(subdir, exist_ok=True)
+        with open(os.path.join(subdir, f"page_{index}.html"), "w") as f:
+            f.write(TEMPLATE.format(index=index, shade=(index % 9 + 1) * 100))
+
+    bin_dir = os.path.join(root, "bin", FAKE_BINARY_VERSION)
+    os.makedirs(bin_dir)
+    bin_path = os.path.join(bin_dir, "tailwindcss")
+    with open(bin_path, "w") as f:
+        f.write(FAKE_TAILWIND_CLI.format(python=sys.executable))
+    os.chmod(bin_path, 0o755)
+    return os.path.join(templates_dir, "section_0", "page_0.html")
+
+
+def bench_build(templates, repeat):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    def build(*args):
+        call_command("tailwind", "build", *args, stdout=StringIO())
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        changed_template = create_project(root, templates)
+        sys.path.insert(0, root)
+        os.environ["TAILWINDCSS_BIN_DIR"] = os.path.join(root, "bin")
+        try:
+            with override_settings(
+                INSTALLED_APPS=[*settings.INSTALLED_APPS, "bench_theme"],
+                TAILWIND_APP_NAME="bench_theme",
+                TAILWIND_STANDALONE_BINARY_VERSION=FAKE_BINARY_VERSION,
+                TAILWIND_BUILD_CACHE_DIR=os.path.join(root, "cache"),
+            ):
+                results["build"] = {
+                    "seconds": min(
+                        timeit.repeat(lambda: build("--force"), number=1, repeat=repeat)
+                    ),
+                    "unit": "per_run",
+                }
+                build()
+                results["build_cached"] = {
+                    "seconds": min(timeit.repeat(build, number=1, repeat=repeat)),
+                    "unit": "per_run",
+                }
+
+                def touch_and_build():
+                    with open(changed_template, "a") as f:
+                        f.write("<p class='mt-1'></p>\n")
+                    build()
+
+                results["build_after_template_change"] = {
+                    "seconds": min(timeit.repeat(touch_and_build, number=1, repeat=repeat)),
+                    "unit": "per_run",
+                }
+        finally:
+            sys.path.remove(root)
+            del os.environ["TAILWINDCSS_BIN_DIR"]
+
+    for result in results.values():
+        result["templates"] = templates
+    return results
+
+
+def run(number=2000, templates=2000, repeat=3):
+    django.setup()
+    results = {}
+    results.update(bench_template_tags(number))
+    results.update(bench_settings(number * 10))
+    results.update(bench_build(templates, repeat))
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing")
+    parser.add_argument("--templates", type=int, default=2000, help="Templates to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Builds per timing")
+    parser.add_argument("--output", help="Writes results to this file as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(number=args.number, templates=args.templates, repeat=args.repeat)
+    for name, result in report["results"].items():
+        if result["unit"] == "per_call":
+            print(f"{name:<40} {result['seconds'] * 1e6:>10.2f} us")
+        else:
+            print(f"{name:<40} {result['seconds'] * 1e3:>10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TailwindConfig(AppConfig):
     name = "tailwind"
+
+    def ready(self):
+        # connects the autoreload_started receiver
+        from . import autoreload  # noqa: F401
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+from django.dispatch import receiver
+from django.utils.autoreload import autoreload_started
+
+from tailwind import get_settings
+
+from .project import TailwindProject
+
+
+def get_pruned_paths():
+    """
+    The node_modules directories and build output of the Tailwind apps, which
+    runserver's reloader has no reason to watch.
+    """
+    pruned_paths = set()
+    for app_name in get_settings().app_names:
+        try:
+            project = TailwindProject.resolve(app_name)
+        except LookupError:
+            # not installed yet, `tailwind` commands report it
+            continue
+        pruned_paths.add(Path(project.src_path, "node_modules").absolute())
+        output_dir = os.path.dirname(project.css_output_path)
+        if output_dir in (project.app_path, os.path.join(project.app_path, "static")):
+            # the stylesheet is written next to other files, only skip the file itself
+            pruned_paths.add(Path(project.css_output_path).absolute())
+        else:
+            pruned_paths.add(Path(output_dir).absolute())
+    return pruned_paths
+
+
+def is_pruned(path, pruned_paths):
+    return path in pruned_paths or not pruned_paths.isdisjoint(path.parents)
+
+
+def iter_pruned_glob(directory, pattern, pruned_paths):
+    """Like `directory.glob(pattern)`, without walking into the pruned paths."""
+    if is_pruned(directory, pruned_paths):
+        return
+    if not any(directory in path.parents for path in pruned_paths):
+        yield from directory.glob(pattern)
+        return
+
+    if pattern.startswith("**/"):
+        pattern = pattern[3:]
+        for root, dirs, _files in os.walk(directory):
+            root = Path(root)
+            dirs[:] = [name for name in dirs if root / name not in pruned_paths]
+            yield from (path for path in root.glob(pattern) if path not in pruned_paths)
+    else:
+        yield from (path for path in directory.glob(pattern) if not is_pruned(path, pruned_paths))
+
+
+@receiver(autoreload_started, dispatch_uid="tailwind_prune_watched_paths")
+def prune_watched_paths(sender, **kwargs):
+    """
+    Keeps the reloader from globbing through node_modules and the build
+    output when it watches a directory containing them, e.g. a template
+    directory set to BASE_DIR. The globs are pruned when the reloader lists
+    its files, so directories watched by receivers that run after this one
+    are pruned too.
+    """
+    pruned_paths = get_pruned_paths()
+    if not pruned_paths:
+        return
+
+    watched_files = sender.watched_files
+
+    def pruned_watched_files(include_globs=True):
+        yield from watched_files(include_globs=False)
+        if include_globs:
+            for directory, patterns in sender.directory_globs.items():
+                for pattern in patterns:
+                    yield from iter_pruned_glob(directory, pattern, pruned_paths)
+
+    sender.watched_files = pruned_watched_files
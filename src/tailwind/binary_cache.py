@@ -0,0 +1,235 @@
+import hashlib
+import os
+import platform
+import shutil
+import sysconfig
+import tempfile
+import urllib.error
+import urllib.request
+
+RELEASES_URL = "https://github.com/tailwindlabs/tailwindcss/releases/download"
+CHECKSUMS_FILE_NAME = "sha256sums.txt"
+DOWNLOAD_TIMEOUT = 60
+
+# Every standalone binary Tailwind CSS publishes
+TARGETS = (
+    "linux-x64",
+    "linux-arm64",
+    "linux-x64-musl",
+    "linux-arm64-musl",
+    "macos-x64",
+    "macos-arm64",
+    "windows-x64.exe",
+)
+OS_NAMES = {"linux": "linux", "darwin": "macos", "windows": "windows"}
+ARCH_NAMES = {"amd64": "x64", "x86_64": "x64", "arm64": "arm64", "aarch64": "arm64"}
+
+
+class BinaryCacheError(Exception):
+    pass
+
+
+def detect_target():
+    """Returns the release target of the running platform, e.g. `linux-x64` or `macos-arm64`."""
+    os_name = OS_NAMES.get(platform.system().lower())
+    arch = ARCH_NAMES.get(platform.machine().lower())
+    if os_name is None or arch is None:
+        raise BinaryCacheError(
+            f"Tailwind CSS doesn't publish a standalone binary for {platform.system()} "
+            f"{platform.machine()}."
+        )
+    if os_name == "windows":
+        return f"{os_name}-{arch}.exe"
+    if os_name == "linux" and "musl" in (sysconfig.get_config_var("HOST_GNU_TYPE") or ""):
+        return f"{os_name}-{arch}-musl"
+    return f"{os_name}-{arch}"
+
+
+def get_binary_name(target):
+    return f"tailwindcss-{target}"
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_checksums(text):
+    """Returns a {binary name: sha256} dict of a release's sha256sums.txt."""
+    checksums = {}
+    # lines look like "<sha256>  ./tailwindcss-linux-x64"
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 2:
+            checksums[fields[1].removeprefix("./")] = fields[0].lower()
+    return checksums
+
+
+class BinaryCache:
+    """
+    A content-addressed store of standalone Tailwind CSS binaries that several
+    projects, versions and platforms can share.
+
+    Binaries are stored once under `blobs/<sha256>`, and `<version>/<target>`
+    files point at them, so a binary is only ever fetched once per cache. New
+    binaries are fetched from `mirror`, a local directory or URL laid out like
+    the GitHub releases (`<mirror>/<version>/tailwindcss-<target>`), and checked
+    against the release's sha256sums.txt when it publishes one.
+    """
+
+    def __init__(self, cache_dir, mirror=None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.mirror = mirror or RELEASES_URL
+
+    def get_ref_path(self, version, target):
+        return os.path.join(self.cache_dir, version, target)
+
+    def get_blob_path(self, sha256, target):
+        # Windows only runs binaries with an .exe extension
+        extension = ".exe" if target.endswith(".exe") else ""
+        return os.path.join(self.cache_dir, "blobs", f"{sha256}{extension}")
+
+    def read_ref(self, version, target):
+        try:
+            with open(self.get_ref_path(version, target)) as f:
+                sha256, size = f.read().split()
+        except (OSError, ValueError):
+            return None
+        return sha256, int(size)
+
+    def lookup(self, version, target):
+        """Returns the path of the cached binary, or None if it isn't cached or was truncated."""
+        ref = self.read_ref(version, target)
+        if ref is None:
+            return None
+        sha256, size = ref
+        blob_path = self.get_blob_path(sha256, target)
+        try:
+            if os.path.getsize(blob_path) == size:
+                return blob_path
+        except OSError:
+            pass
+        return None
+
+    def get(self, version, target=None):
+        """Returns the path of the binary, fetching it into the cache first if needed."""
+        if version == "latest":
+            raise BinaryCacheError(
+                "The binary cache needs a pinned TAILWIND_STANDALONE_BINARY_VERSION, not 'latest'."
+            )
+        target = target or detect_target()
+        return self.lookup(version, target) or self.fetch(version, target)
+
+    def add(self, version, target, source_path, expected_sha256=None):
+        """Copies the binary at `source_path` into the cache and returns its cached path."""
+        if target not in TARGETS:
+            raise BinaryCacheError(
+                f"Unknown target '{target}', expected one of: {', '.join(TARGETS)}"
+            )
+
+        blobs_dir = os.path.join(self.cache_dir, "blobs")
+        os.makedirs(blobs_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tailwindcss-", suffix=".part", dir=blobs_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp, open(source_path, "rb") as source:
+                shutil.copyfileobj(source, tmp)
+            sha256 = hash_file(tmp_path)
+            if expected_sha256 and sha256 != expected_sha256.lower():
+                raise BinaryCacheError(
+                    f"Checksum mismatch for {get_binary_name(target)} ({version}): "
+                    f"expected {expected_sha256}, got {sha256}."
+                )
+            os.chmod(tmp_path, 0o755)
+            blob_path = self.get_blob_path(sha256, target)
+            os.replace(tmp_path, blob_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.write_ref(version, target, sha256, os.path.getsize(blob_path))
+        return blob_path
+
+    def write_ref(self, version, target, sha256, size):
+        ref_path = self.get_ref_path(version, target)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        tmp_path = f"{ref_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{sha256} {size}\n")
+        os.replace(tmp_path, ref_path)
+
+    def fetch(self, version, target):
+        """Fetches the binary from the mirror, verifies it and adds it to the cache."""
+        binary_name = get_binary_name(target)
+        checksums = self.fetch_checksums(version)
+        if checksums is not None and binary_name not in checksums:
+            raise BinaryCacheError(
+                f"{CHECKSUMS_FILE_NAME} of Tailwind CSS {version} has no entry for {binary_name}."
+            )
+        expected_sha256 = checksums[binary_name] if checksums else None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".download-", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp, self.open_mirror(version, binary_name) as response:
+                shutil.copyfileobj(response, tmp)
+            return self.add(version, target, tmp_path, expected_sha256)
+        except FileNotFoundError:
+            raise BinaryCacheError(
+                f"{self.mirror} has no {binary_name} for Tailwind CSS {version}."
+            ) from None
+        finally:
+            os.remove(tmp_path)
+
+    def fetch_checksums(self, version):
+        """Returns the checksums of the release, or None for releases without them (v3)."""
+        try:
+            with self.open_mirror(version, CHECKSUMS_FILE_NAME) as f:
+                return parse_checksums(f.read().decode())
+        except FileNotFoundError:
+            return None
+
+    def verify(self):
+        """Re-hashes every cached binary; returns the (version, target) refs that don't match."""
+        corrupted = []
+        if not os.path.isdir(self.cache_dir):
+            return corrupted
+        for version in sorted(os.listdir(self.cache_dir)):
+            version_dir = os.path.join(self.cache_dir, version)
+            if version == "blobs" or not os.path.isdir(version_dir):
+                continue
+            for target in sorted(os.listdir(version_dir)):
+                if target not in TARGETS:
+                    continue
+                sha256, _ = self.read_ref(version, target) or (None, None)
+                blob_path = self.get_blob_path(sha256, target) if sha256 else None
+                if not blob_path or not os.path.isfile(blob_path) or hash_file(blob_path) != sha256:
+                    corrupted.append((version, target))
+        return corrupted
+
+    def is_local_mirror(self):
+        return "://" not in self.mirror
+
+    def get_mirror_path(self, version, file_name):
+        return os.path.join(self.mirror, version, file_name)
+
+    def open_mirror(self, version, file_name):
+        """Opens a file of a release on the mirror; raises FileNotFoundError if it's missing."""
+        if self.is_local_mirror():
+            return open(self.get_mirror_path(version, file_name), "rb")
+
+        url = f"{self.mirror.rstrip('/')}/{version}/{file_name}"
+        try:
+            return urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT)
+        except urllib.error.HTTPError as err:
+            err.close()
+            if err.code == 404:
+                raise FileNotFoundError(url) from err
+            raise BinaryCacheError(
+                f"Downloading {url} failed: HTTP {err.code} {err.reason}"
+            ) from err
+        except (urllib.error.URLError, OSError) as err:
+            raise BinaryCacheError(f"Downloading {url} failed: {err}") from err
@@ -0,0 +1,175 @@
+import hashlib
+import itertools
+import json
+import os
+import shutil
+
+from .sources import get_source_globs
+from .sources import iter_source_files
+from .sources import walk_files
+
+FINGERPRINT_VERSION = 1
+
+# Files next to src/ that change the output when they change
+CONFIG_FILE_NAMES = (
+    "package.json",
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lock",
+    "bun.lockb",
+    "postcss.config.js",
+    "postcss.config.cjs",
+    "postcss.config.mjs",
+    "tailwind.config.js",
+    "tailwind.config.cjs",
+    "tailwind.config.mjs",
+    "tailwind.config.ts",
+)
+
+MAX_LISTED_FILES = 5
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_files(label, paths):
+    paths = sorted(paths)
+    listed = ", ".join(paths[:MAX_LISTED_FILES])
+    if len(paths) > MAX_LISTED_FILES:
+        listed += f" and {len(paths) - MAX_LISTED_FILES} more"
+    return f"{label}: {listed}"
+
+
+def iter_config_files(tailwind_src_path):
+    """Yields the files in static_src/src and the package and config files next to it."""
+    yield from walk_files(os.path.join(tailwind_src_path, "src"))
+    for name in CONFIG_FILE_NAMES:
+        path = os.path.join(tailwind_src_path, name)
+        if os.path.isfile(path):
+            yield path
+
+
+def iter_input_files(tailwind_src_path, source_globs):
+    """Yields the files a build of the app in `tailwind_src_path` depends on."""
+    yield from iter_config_files(tailwind_src_path)
+    yield from iter_source_files(*source_globs)
+
+
+class BuildCache:
+    """
+    Remembers a fingerprint of everything a build depends on, and a copy of the
+    stylesheet it produced, in `cache_dir`.
+
+    The fingerprint covers the files in static_src/src, package and config
+    files, every file matched by the `@source` (v4) or `content` (v3) globs, and
+    `options`, a dict of strings such as the build mode and binary version.
+    File contents are only re-hashed when their size or mtime changed.
+    """
+
+    def __init__(self, cache_dir, app_path, output_path, options):
+        self.cache_dir = cache_dir
+        self.tailwind_src_path = os.path.join(app_path, "static_src")
+        self.output_path = output_path
+        self.options = options
+        self.fingerprint_path = os.path.join(cache_dir, "fingerprint.json")
+        self.cached_output_path = os.path.join(cache_dir, os.path.basename(output_path))
+        self.source_globs = get_source_globs(self.tailwind_src_path)
+
+    def load(self):
+        try:
+            with open(self.fingerprint_path) as f:
+                fingerprint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if fingerprint.get("version") != FINGERPRINT_VERSION:
+            return None
+        return fingerprint
+
+    def compute_fingerprint(self):
+        """
+        Returns the fingerprint of the current inputs, with the number of
+        scanned source files under "source_files".
+        """
+        previous_files = (self.load() or {}).get("files", {})
+        files = {}
+        source_files = list(iter_source_files(*self.source_globs))
+        for path in itertools.chain(iter_config_files(self.tailwind_src_path), source_files):
+            # relative paths keep the cache valid across checkouts in different directories
+            name = os.path.relpath(path, self.tailwind_src_path).replace(os.sep, "/")
+            if name in files:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            previous = previous_files.get(name)
+            if previous and (previous["mtime"], previous["size"]) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                file_hash = previous["hash"]
+            else:
+                file_hash = hash_file(path)
+            files[name] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash}
+
+        return {
+            "version": FINGERPRINT_VERSION,
+            "options": self.options,
+            "files": files,
+            "source_files": len(source_files),
+        }
+
+    def get_rebuild_reasons(self, fingerprint):
+        """Returns a list of reasons to rebuild; an empty list means the cache is fresh."""
+        if not self.source_globs[0]:
+            return ["no @source or content globs found, scanned files can't be tracked"]
+
+        stored = self.load()
+        if stored is None:
+            return ["no cached build found"]
+        if not os.path.isfile(self.cached_output_path):
+            return ["cached stylesheet is missing"]
+
+        reasons = []
+        for key, value in fingerprint["options"].items():
+            stored_value = stored["options"].get(key)
+            if stored_value != value:
+                reasons.append(f"{key} changed: {stored_value} -> {value}")
+
+        stored_hashes = {name: entry["hash"] for name, entry in stored["files"].items()}
+        hashes = {name: entry["hash"] for name, entry in fingerprint["files"].items()}
+        changed = [
+            name
+            for name in hashes.keys() & stored_hashes.keys()
+            if hashes[name] != stored_hashes[name]
+        ]
+        for label, names in (
+            ("changed files", changed),
+            ("new files", hashes.keys() - stored_hashes.keys()),
+            ("removed files", stored_hashes.keys() - hashes.keys()),
+        ):
+            if names:
+                reasons.append(describe_files(label, names))
+        return reasons
+
+    def restore(self):
+        """Puts the cached stylesheet in place, unless the current one is identical."""
+        if os.path.isfile(self.output_path) and hash_file(self.output_path) == hash_file(
+            self.cached_output_path
+        ):
+            return
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        shutil.copyfile(self.cached_output_path, self.output_path)
+
+    def store(self, fingerprint):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        shutil.copyfile(self.output_path, self.cached_output_path)
+        with open(self.fingerprint_path, "w") as f:
+            json.dump(fingerprint, f)
@@ -0,0 +1,117 @@
+import dataclasses
+import gzip
+import os
+import zlib
+
+
+@dataclasses.dataclass
+class CompressedFile:
+    path: str
+    encoding: str
+    raw_size: int
+    compressed_size: int
+    skipped: bool
+
+
+def _gzip_compress(data):
+    # mtime=0 keeps the output byte-for-byte reproducible
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _gzip_decompress(data):
+    return gzip.decompress(data)
+
+
+def get_encoders():
+    """
+    Returns (extension, encoding, compress, decompress) tuples for every
+    available encoding. Brotli is only used when the `brotli` package is
+    installed.
+    """
+    encoders = [("gz", "gzip", _gzip_compress, _gzip_decompress)]
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        encoders.append(
+            (
+                "br",
+                "br",
+                lambda data: brotli.compress(data, quality=11, mode=brotli.MODE_TEXT),
+                brotli.decompress,
+            )
+        )
+    return encoders
+
+
+class StreamCompressor:
+    """Compresses data fed in chunks, keeping only the running compressed size."""
+
+    def __init__(self, encoding, compress, flush):
+        self.encoding = encoding
+        self.compressed_size = 0
+        self._compress = compress
+        self._flush = flush
+
+    def update(self, data):
+        self.compressed_size += len(self._compress(data))
+
+    def finish(self):
+        self.compressed_size += len(self._flush())
+        return self.compressed_size
+
+
+def get_stream_compressors():
+    """Returns a StreamCompressor for every encoding of get_encoders()."""
+    # wbits=31 writes the gzip container, like gzip.compress()
+    gzip_compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    compressors = [StreamCompressor("gzip", gzip_compressor.compress, gzip_compressor.flush)]
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        brotli_compressor = brotli.Compressor(quality=11, mode=brotli.MODE_TEXT)
+        compressors.append(
+            StreamCompressor("br", brotli_compressor.process, brotli_compressor.finish)
+        )
+    return compressors
+
+
+def is_up_to_date(compressed_path, data, decompress):
+    try:
+        with open(compressed_path, "rb") as f:
+            return decompress(f.read()) == data
+    except Exception:
+        # missing file, or a corrupt/foreign archive: write it again
+        return False
+
+
+def compress_file(path):
+    """
+    Writes precompressed siblings of `path` (`styles.css.gz`, `styles.css.br`)
+    at maximum compression, so they can be served as-is by WhiteNoise, nginx's
+    gzip_static or a CDN. Existing siblings whose contents still match are left
+    untouched.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    results = []
+    for extension, encoding, compress, decompress in get_encoders():
+        compressed_path = f"{path}.{extension}"
+        skipped = is_up_to_date(compressed_path, data, decompress)
+        if not skipped:
+            with open(compressed_path, "wb") as f:
+                f.write(compress(data))
+        results.append(
+            CompressedFile(
+                path=compressed_path,
+                encoding=encoding,
+                raw_size=len(data),
+                compressed_size=os.path.getsize(compressed_path),
+                skipped=skipped,
+            )
+        )
+    return results
@@ -0,0 +1,135 @@
+import dataclasses
+import functools
+import os
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+@dataclasses.dataclass(frozen=True)
+class TailwindSettings:
+    npm_bin_path: str
+    # None detects the package manager from the lockfile of each app
+    package_manager: str | None
+    package_manager_bin_path: str | None
+    package_manager_store_dir: str | None
+    # 'TAILWIND_DEV_MODE' is deprecated. Leaving it here
+    # to support legacy browser-sync based configs.
+    dev_mode: bool
+    css_path: str
+    css_versioning: str | None
+    inline_css_max_size: int
+    live_reload: bool
+    precompress: bool
+    build_cache_dir: str | None
+    output_dir: str | None
+    generate_sources: bool
+    app_name: str | None
+    # every app in TAILWIND_APP_NAME, which may also be a list; app_name is the first one
+    app_names: tuple[str, ...]
+    build_concurrency: int | None
+    watcher_daemon: bool
+    # seconds; None leaves watching to the watch mode of Tailwind
+    watch_debounce: float | None
+    use_standalone_binary: bool
+    standalone_binary_version: str
+    standalone_binary_cache_dir: str | None
+    standalone_binary_mirror: str | None
+    # either a string, or a dict of strings keyed by app name
+    standalone_start_command_args: str | dict
+    standalone_build_command_args: str | dict
+
+    @classmethod
+    def from_settings(cls):
+        css_path = getattr(settings, "TAILWIND_CSS_PATH", "css/dist/styles.css")
+        app_names = getattr(settings, "TAILWIND_APP_NAME", None)
+        if isinstance(app_names, str):
+            app_names = (app_names,)
+        app_names = tuple(app_names or ())
+        return cls(
+            npm_bin_path=getattr(settings, "NPM_BIN_PATH", "npm"),
+            package_manager=getattr(settings, "TAILWIND_PACKAGE_MANAGER", None),
+            package_manager_bin_path=getattr(settings, "TAILWIND_PACKAGE_MANAGER_BIN_PATH", None),
+            package_manager_store_dir=getattr(
+                settings,
+                "TAILWIND_PACKAGE_MANAGER_STORE_DIR",
+                os.environ.get("TAILWIND_PACKAGE_MANAGER_STORE_DIR"),
+            ),
+            dev_mode=getattr(settings, "TAILWIND_DEV_MODE", False),
+            css_path=css_path,
+            css_versioning=getattr(settings, "TAILWIND_CSS_VERSIONING", None),
+            inline_css_max_size=getattr(settings, "TAILWIND_INLINE_CSS_MAX_SIZE", 14 * 1024),
+            live_reload=getattr(settings, "TAILWIND_LIVE_RELOAD", False),
+            precompress=getattr(settings, "TAILWIND_PRECOMPRESS", False),
+            build_cache_dir=getattr(settings, "TAILWIND_BUILD_CACHE_DIR", None),
+            output_dir=getattr(settings, "TAILWIND_OUTPUT_DIR", None),
+            generate_sources=getattr(settings, "TAILWIND_GENERATE_SOURCES", False),
+            app_name=app_names[0] if app_names else None,
+            app_names=app_names,
+            build_concurrency=getattr(settings, "TAILWIND_BUILD_CONCURRENCY", None),
+            watcher_daemon=getattr(settings, "TAILWIND_WATCHER_DAEMON", False),
+            watch_debounce=getattr(settings, "TAILWIND_WATCH_DEBOUNCE", None),
+            use_standalone_binary=getattr(settings, "TAILWIND_USE_STANDALONE_BINARY", False),
+            standalone_binary_version=getattr(
+                settings,
+                "TAILWIND_STANDALONE_BINARY_VERSION",
+                os.environ.get("TAILWINDCSS_VERSION", "v4.3.0"),
+            ),
+            standalone_binary_cache_dir=getattr(
+                settings,
+                "TAILWIND_STANDALONE_BINARY_CACHE_DIR",
+                os.environ.get("TAILWIND_STANDALONE_BINARY_CACHE_DIR"),
+            ),
+            standalone_binary_mirror=getattr(
+                settings,
+                "TAILWIND_STANDALONE_BINARY_MIRROR",
+                os.environ.get("TAILWIND_STANDALONE_BINARY_MIRROR"),
+            ),
+            standalone_start_command_args=getattr(
+                settings,
+                "TAILWIND_STANDALONE_START_COMMAND_ARGS",
+                get_default_standalone_args(css_path, "--watch"),
+            ),
+            standalone_build_command_args=getattr(
+                settings,
+                "TAILWIND_STANDALONE_BUILD_COMMAND_ARGS",
+                get_default_standalone_args(css_path, "--minify"),
+            ),
+        )
+
+    def get_standalone_command_args(self, app_name, watch=False):
+        if watch:
+            args, flag = self.standalone_start_command_args, "--watch"
+        else:
+            args, flag = self.standalone_build_command_args, "--minify"
+        if isinstance(args, dict):
+            args = args.get(app_name) or get_default_standalone_args(self.css_path, flag)
+        return args
+
+
+def get_default_standalone_args(css_path, flag):
+    return f"-i static_src/src/styles.css -o static/{css_path} {flag}"
+
+
+@functools.cache
+def get_settings():
+    """
+    Returns Tailwind settings resolved from django.conf.settings. The object is
+    built once per process and rebuilt after any setting_changed signal.
+    """
+    return TailwindSettings.from_settings()
+
+
+@receiver(setting_changed)
+def reset_settings(**kwargs):
+    get_settings.cache_clear()
+
+
+def get_config(setting_name):
+    # "TAILWIND_CSS_PATH" -> css_path, "NPM_BIN_PATH" -> npm_bin_path
+    attribute_name = setting_name.removeprefix("TAILWIND_").lower()
+    try:
+        return getattr(get_settings(), attribute_name)
+    except AttributeError:
+        raise KeyError(setting_name) from None
@@ -0,0 +1,263 @@
+import contextlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+STATE_FILE_NAME = ".tailwind-watcher.json"
+LOG_FILE_NAME = ".tailwind-watcher.log"
+LOCK_FILE_NAME = ".tailwind-watcher.lock"
+# seconds after which a lock whose owner is still alive is taken over anyway
+LOCK_TIMEOUT = 10
+# bytes of existing log output shown when attaching
+ATTACH_BACKLOG = 4 * 1024
+
+
+def pid_exists(pid):
+    if os.name == "nt":
+        import ctypes
+
+        # PROCESS_QUERY_LIMITED_INFORMATION; os.kill(pid, 0) would terminate the process
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+
+    try:
+        # reap the supervisor if this process started it and it has exited
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_process_start_time(pid):
+    """
+    Returns an opaque start time of the process, which tells it apart from a
+    later process reusing its pid, or None if it can't be determined.
+    """
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return None
+        try:
+            creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            if not ctypes.windll.kernel32.GetProcessTimes(
+                handle,
+                ctypes.byref(creation),
+                ctypes.byref(exit_time),
+                ctypes.byref(kernel),
+                ctypes.byref(user),
+            ):
+                return None
+            return f"{creation.dwHighDateTime}:{creation.dwLowDateTime}"
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # starttime is the 22nd field; the command name before it may contain spaces
+            return f.read().rpartition(")")[2].split()[19]
+    except (OSError, IndexError):
+        pass
+    try:
+        result = subprocess.run(
+            ["ps", "-o", "lstart=", "-p", str(pid)], capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+class WatcherDaemon:
+    """
+    A Tailwind watcher that outlives `tailwind start`.
+
+    `start()` spawns a detached supervisor, `python -m tailwind.daemon run
+    <state dir>`, which runs the watcher with its output going to a log file. A state
+    file next to the log records the supervisor's pid, its start time and the
+    watcher's arguments, so later `tailwind start` and `tailwind dev` sessions
+    attach to the warm watcher instead of starting a new one. A lock file keeps
+    concurrent sessions from starting a supervisor each.
+    """
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        self.state_path = os.path.join(state_dir, STATE_FILE_NAME)
+        self.log_path = os.path.join(state_dir, LOG_FILE_NAME)
+        self.lock_path = os.path.join(state_dir, LOCK_FILE_NAME)
+
+    def read_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def remove_state(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.state_path)
+
+    def is_running(self, state):
+        if not pid_exists(state["pid"]):
+            return False
+        # the supervisor has exited and its pid now belongs to another process
+        start_time = state.get("pid_start_time")
+        return start_time is None or get_process_start_time(state["pid"]) in (None, start_time)
+
+    def get_state(self):
+        """Returns the state of the running daemon, or None, removing a stale state file."""
+        state = self.read_state()
+        if state is None or not state.get("pid"):
+            return None
+        if not self.is_running(state):
+            self.remove_state()
+            return None
+        return state
+
+    def is_stale_lock(self):
+        try:
+            with open(self.lock_path) as f:
+                pid = f.read()
+        except FileNotFoundError:
+            return False
+        # an empty lock file is still being written by its owner
+        return pid.isdigit() and not pid_exists(int(pid))
+
+    @contextlib.contextmanager
+    def lock(self, timeout=LOCK_TIMEOUT):
+        """Holds the lock file, waiting for other sessions and breaking stale locks."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self.is_stale_lock() or time.monotonic() > deadline:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(self.lock_path)
+                else:
+                    time.sleep(0.05)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            break
+        try:
+            yield
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.lock_path)
+
+    def start(self, job):
+        """
+        Starts a detached supervisor running `job` and returns its state, or
+        None if another session started a daemon first.
+        """
+        with self.lock():
+            if self.get_state() is not None:
+                return None
+            return self.start_supervisor(job)
+
+    def start_supervisor(self, job):
+        state = {"args": job.args, "cwd": job.cwd, "env": job.env, "started": time.time()}
+        self.write_state(state)
+
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = (
+                subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+            )
+        else:
+            kwargs["start_new_session"] = True
+        with open(self.log_path, "w") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "tailwind.daemon", "run", self.state_dir],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                **kwargs,
+            )
+
+        state["pid"] = process.pid
+        state["pid_start_time"] = get_process_start_time(process.pid)
+        self.write_state(state)
+        return state
+
+    def stop(self, timeout=5):
+        """Terminates the running daemon. Returns False if there was none."""
+        state = self.get_state()
+        if state is None:
+            return False
+
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(state["pid"], signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while pid_exists(state["pid"]) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.remove_state()
+        return True
+
+    def attach(self, write, poll_interval=0.2):
+        """
+        Passes the tail of the log, then every new line, to `write` until the
+        daemon exits. Interrupting an attached session leaves the daemon running.
+        """
+        state = self.get_state()
+        if state is None or not os.path.isfile(self.log_path):
+            return
+        with open(self.log_path, errors="replace") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - ATTACH_BACKLOG, 0))
+            if f.tell():
+                # skip the partial first line
+                f.readline()
+            while True:
+                line = f.readline()
+                if line:
+                    write(line.rstrip("\n"))
+                elif not pid_exists(state["pid"]):
+                    return
+                else:
+                    time.sleep(poll_interval)
+
+
+def run_supervisor(state_dir):
+    """Runs the watcher recorded in the state file until it exits or SIGTERM arrives."""
+    daemon = WatcherDaemon(state_dir)
+    state = daemon.read_state()
+    env = {**os.environ, **state["env"]} if state.get("env") else None
+    # stdin stays open: Tailwind's --watch exits as soon as its stdin is closed
+    process = subprocess.Popen(state["args"], cwd=state["cwd"], env=env, stdin=subprocess.PIPE)
+    signal.signal(signal.SIGTERM, lambda signum, frame: process.terminate())
+    try:
+        return process.wait()
+    finally:
+        if (daemon.read_state() or {}).get("pid") == os.getpid():
+            daemon.remove_state()
+
+
+if __name__ == "__main__":
+    # `run <state dir>` supervises the watcher, `attach <state dir>` follows its log
+    action, state_dir = sys.argv[1:3]
+    if action == "run":
+        sys.exit(run_supervisor(state_dir))
+    with contextlib.suppress(KeyboardInterrupt):
+        WatcherDaemon(state_dir).attach(lambda line: print(line, flush=True))
@@ -0,0 +1,53 @@
+import os
+
+from django.contrib.staticfiles import utils
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.utils._os import safe_join
+
+from tailwind import get_settings
+
+
+class TailwindFinder(BaseFinder):
+    """
+    Finds the stylesheets that standalone Tailwind apps build into
+    TAILWIND_OUTPUT_DIR, outside the source tree, as if they were in the
+    static/ directory of their app. Add it to STATICFILES_FINDERS before the
+    default finders.
+    """
+
+    def get_locations(self):
+        output_dir = get_settings().output_dir
+        if not output_dir:
+            return []
+        return [
+            os.path.join(output_dir, app_name.split(".")[-1])
+            for app_name in get_settings().app_names
+        ]
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, find_all=False, **kwargs):
+        # Django < 5.2 passes `all` instead of `find_all`
+        find_all = find_all or kwargs.get("all", False)
+        matches = []
+        for location in self.get_locations():
+            try:
+                matched_path = safe_join(location, path)
+            except SuspiciousFileOperation:
+                continue
+            if os.path.isfile(matched_path):
+                if not find_all:
+                    return matched_path
+                matches.append(matched_path)
+        return matches
+
+    def list(self, ignore_patterns):
+        for location in self.get_locations():
+            if not os.path.isdir(location):
+                continue
+            storage = FileSystemStorage(location=location)
+            for path in utils.get_files(storage, ignore_patterns):
+                yield path, storage
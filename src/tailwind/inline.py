@@ -0,0 +1,59 @@
+import os
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .utils import find_static_file
+
+_lock = threading.Lock()
+# static path -> (file path, mtime, contents); contents is None when the file
+# is missing or over the size budget
+_cache = {}
+
+
+def _load(static_path, max_size):
+    file_path = find_static_file(static_path)
+    try:
+        stat = os.stat(file_path) if file_path else None
+    except OSError:
+        stat = None
+    if stat is None:
+        return file_path, None, None
+    if stat.st_size > max_size:
+        return file_path, stat.st_mtime_ns, None
+
+    with open(file_path, encoding="utf-8") as f:
+        return file_path, stat.st_mtime_ns, f.read()
+
+
+def get_inline_css(static_path, max_size):
+    """
+    Returns the contents of the static stylesheet at `static_path`, or None if
+    it can't be found or is larger than `max_size` bytes.
+
+    The file is located through the staticfiles finders and read once per
+    process. When DEBUG is on, it is re-read whenever its mtime changes.
+    """
+    cached = _cache.get(static_path)
+    if cached is not None:
+        file_path, mtime, contents = cached
+        if not settings.DEBUG:
+            return contents
+        try:
+            if file_path and os.stat(file_path).st_mtime_ns == mtime:
+                return contents
+        except OSError:
+            pass
+
+    entry = _load(static_path, max_size)
+    with _lock:
+        _cache[static_path] = entry
+    return entry[2]
+
+
+@receiver(setting_changed)
+def clear_inline_css_cache(**kwargs):
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+
+POLL_INTERVAL = 0.25
+
+_lock = threading.Lock()
+# file path -> FileWatcher
+_watchers = {}
+
+
+class FileWatcher:
+    """
+    Polls the mtime of one file from a single background thread and wakes
+    every waiting client when it changes, however many are connected.
+    """
+
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.condition = threading.Condition()
+        self.version = self.stat()
+        self.thread = threading.Thread(
+            target=self.run, name=f"tailwind-live-reload:{path}", daemon=True
+        )
+        self.thread.start()
+
+    def stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            version = self.stat()
+            if version != self.version:
+                with self.condition:
+                    self.version = version
+                    self.condition.notify_all()
+
+    def wait_for_change(self, version, timeout):
+        """Returns the file's version once it differs from `version`, or after `timeout`."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+def get_watcher(path):
+    with _lock:
+        if path not in _watchers:
+            _watchers[path] = FileWatcher(path)
+        return _watchers[path]
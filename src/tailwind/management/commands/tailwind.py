@@ -1,23 +1,52 @@
+import json
 import os
-import platform
 import shlex
 import subprocess
 import sys
+import time
 
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
 
-from tailwind import get_config
-
-from ...npm import NPM
+from tailwind import get_settings
+
+from ...binary_cache import BinaryCacheError
+from ...binary_cache import TARGETS as BINARY_TARGETS
+from ...build_cache import BuildCache
+from ...compress import compress_file
+from ...daemon import WatcherDaemon
+from ...manifest import get_hashed_path
+from ...manifest import remove_build_output
+from ...manifest import VERSIONING_FILENAME
+from ...manifest import write_manifest
+from ...npm import get_package_manager
 from ...npm import NPMException
+from ...processes import Job
+from ...processes import run_jobs
+from ...project import TailwindProject
+from ...scan import ClassIndex
+from ...scan import extract_css_classes
+from ...scan import get_scan_roots
+from ...sources import GENERATED_SOURCES_FILE_NAME
+from ...sources import imports_generated_sources
+from ...sources import write_generated_sources
+from ...stats import BuildStats
+from ...stats import CSSBundleStats
+from ...supervisor import parse_procfile
+from ...supervisor import Supervisor
 from ...utils import extract_server_url_from_procfile
-from ...utils import get_app_path
-from ...utils import get_package_json_path
-from ...utils import get_tailwind_src_path
+from ...utils import get_project_source_dirs
 from ...utils import install_pip_package
+from ...utils import remove_watch_args
 from ...validate import ValidationError
 from ...validate import Validations
+from ...watcher import DebouncedWatcher
+from ...watcher import WatchedApp
+
+SCAN_INDEX_FILE_NAME = ".tailwind-scan.json"
+# The package.json key of django-tailwind options, e.g. `"cleanOutput": true` in
+# app_template_v4_lean, whose build script leaves cleaning the output to Python
+PACKAGE_JSON_OPTIONS_KEY = "django-tailwind"
 
 
 class Command(BaseCommand):
@@ -28,7 +57,11 @@ class Command(BaseCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.is_standalone = None
+        self.app_name = None
         self.cwd = None
+        self.stats = None
+        self.project = None
+        self.projects = {}
         self.validate = Validations()
 
     def add_arguments(self, parser):
@@ -51,7 +84,7 @@ class Command(BaseCommand):
         )
         init_parser.add_argument(
             "--tailwind-version",
-            choices=["3", "4", "4s"],
+            choices=["3", "4", "4s", "4l"],
             help="Specifies the Tailwind version to install",
         )
         init_parser.add_argument(
@@ -75,6 +108,15 @@ class Command(BaseCommand):
             action="store_true",
             help="Disables package-lock.json creation during install",
         )
+        install_parser.add_argument(
+            "--frozen-lockfile",
+            action="store_true",
+            help="Installs exactly the versions of the lockfile and fails if it is out of date",
+        )
+        install_parser.add_argument(
+            "--stats-file",
+            help="Writes build timings and stylesheet stats to this file as JSON",
+        )
         install_parser.set_defaults(method=self.handle_install_command)
 
         # build subcommand
@@ -82,6 +124,15 @@ class Command(BaseCommand):
             "build",
             help="Compile tailwind css into production css",
         )
+        build_parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuilds even if the build cache is up to date",
+        )
+        build_parser.add_argument(
+            "--stats-file",
+            help="Writes build timings and stylesheet stats to this file as JSON",
+        )
         build_parser.set_defaults(method=self.handle_build_command)
 
         # start subcommand
@@ -89,6 +140,13 @@ class Command(BaseCommand):
             "start",
             help="Start watching css changes for dev",
         )
+        start_parser.add_argument(
+            "--debounce",
+            type=float,
+            metavar="SECONDS",
+            help="Watches from Python and rebuilds once changes have been quiet this long "
+            "(overrides TAILWIND_WATCH_DEBOUNCE)",
+        )
         start_parser.set_defaults(method=self.handle_start_command)
 
         # dev subcommand
@@ -98,6 +156,89 @@ class Command(BaseCommand):
         )
         dev_parser.set_defaults(method=self.handle_dev_command)
 
+        # daemon subcommand
+        daemon_parser = subparsers.add_parser(
+            "daemon",
+            help="Manage long-lived Tailwind watchers that `start` and `dev` attach to",
+        )
+        daemon_parser.add_argument(
+            "action",
+            choices=["start", "stop", "status"],
+            help="Starts, stops or reports the watcher daemon of every Tailwind app",
+        )
+        daemon_parser.set_defaults(method=self.handle_daemon_command)
+
+        # binary subcommand
+        binary_parser = subparsers.add_parser(
+            "binary",
+            help="Manage the shared standalone binary cache (TAILWIND_STANDALONE_BINARY_CACHE_DIR)",
+        )
+        binary_parser.add_argument(
+            "action",
+            choices=["fetch", "add", "verify"],
+            help="Fetches binaries from the mirror, adds a local binary, or re-checks the cache",
+        )
+        binary_parser.add_argument(
+            "--target",
+            action="append",
+            choices=BINARY_TARGETS,
+            help="Platform of the binary, e.g. linux-x64; repeatable (default: this platform)",
+        )
+        binary_parser.add_argument(
+            "--binary-version",
+            help="Tailwind CSS version (default: TAILWIND_STANDALONE_BINARY_VERSION)",
+        )
+        binary_parser.add_argument(
+            "--file",
+            help="Path of the binary to add",
+        )
+        binary_parser.add_argument(
+            "--sha256",
+            help="Expected checksum of the binary to add",
+        )
+        binary_parser.set_defaults(method=self.handle_binary_command)
+
+        # scan subcommand
+        scan_parser = subparsers.add_parser(
+            "scan",
+            help="Index the classes used by templates and Python sources of the project",
+        )
+        scan_parser.add_argument(
+            "--sources",
+            action="store_true",
+            help="Prints @source directives covering only the files that use classes",
+        )
+        scan_parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of files using the most classes to list",
+        )
+        scan_parser.set_defaults(method=self.handle_scan_command)
+
+        # stats subcommand
+        stats_parser = subparsers.add_parser(
+            "stats",
+            help="Break down the size of the compiled css by layer, selector, media query and utility",
+        )
+        stats_parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of largest selectors, media queries and utilities to list",
+        )
+        stats_parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Prints the stats as JSON instead of a table",
+        )
+        stats_parser.add_argument(
+            "--no-scan",
+            action="store_true",
+            help="Skips the template scan that maps utilities to the files using them",
+        )
+        stats_parser.set_defaults(method=self.handle_stats_command)
+
         # check-updates subcommand
         check_updates_parser = subparsers.add_parser(
             "check-updates",
@@ -126,26 +267,42 @@ class Command(BaseCommand):
     def validate_app(self):
         try:
             self.validate.has_settings()
-            app_name = get_config("TAILWIND_APP_NAME")
-            self.validate.is_installed(app_name)
-            self.validate.is_tailwind_app(app_name)
+            for app_name in get_settings().app_names:
+                self.validate.is_installed(app_name)
+                self.validate.is_tailwind_project(self.get_project(app_name))
         except ValidationError as err:
             return self.print_error(err)
 
+    def get_project(self, app_name):
+        # Every app is resolved once per invocation and shared by all code paths
+        if app_name not in self.projects:
+            self.projects[app_name] = TailwindProject.resolve(app_name)
+        return self.projects[app_name]
+
+    def use_app(self, app_name):
+        # Point the app-specific state at one of the apps in TAILWIND_APP_NAME
+        self.project = self.get_project(app_name)
+        self.app_name = app_name
+        self.cwd = self.project.src_path
+        try:
+            self.npm = get_package_manager(self.cwd)
+        except NPMException as err:
+            return self.print_error(err)
+        self.is_standalone = self.project.is_standalone
+
     def handle(self, *args, method, **options):
         # Validate app for all commands except init
         if method != self.handle_init_command:
             self.validate_app()
-            app_name = get_config("TAILWIND_APP_NAME")
-            self.cwd = get_tailwind_src_path(app_name)
-            self.npm = NPM(cwd=self.cwd)
-            self.is_standalone = get_config("TAILWIND_USE_STANDALONE_BINARY") or not os.path.exists(
-                get_package_json_path(app_name)
-            )
+            self.use_app(get_settings().app_name)
+            self.stats = BuildStats(options["subcommand"])
 
         # Call the subcommand method
         method(**options)
 
+        if method in (self.handle_build_command, self.handle_install_command):
+            self.report_stats(options.get("stats_file"))
+
     def handle_init_command(self, **options):
         app_name = options["app_name"].strip() if options.get("app_name") else None
         if not app_name:
@@ -155,19 +312,23 @@ class Command(BaseCommand):
         tailwind_version = (
             options["tailwind_version"].strip() if options.get("tailwind_version") else None
         )
-        app_template_choice = {"4s": "1", "4": "2", "3": "3", None: None}[tailwind_version]
+        app_template_choice = {"4s": "1", "4": "2", "3": "3", "4l": "4", None: None}[
+            tailwind_version
+        ]
         if not app_template_choice:
             app_template_choice = input("""Choose template:
 1 - Tailwind v4 Standalone - Simple and doesn't require Node.js
 2 - Tailwind v4 Full - All the bells and whistles, requires Node.js
 3 - Tailwind v3 Full - Legacy template for Tailwind v3 projects, requires Node.js
-Enter choice [1-3]: """)
-            self.validate_input(app_template_choice, ["1", "2", "3"])
+4 - Tailwind v4 Lean - Plugins without PostCSS, builds with @tailwindcss/cli, requires Node.js
+Enter choice [1-4]: """)
+            self.validate_input(app_template_choice, ["1", "2", "3", "4"])
 
         app_template = {
             "1": "app_template_v4_standalone",
             "2": "app_template_v4",
             "3": "app_template_v3",
+            "4": "app_template_v4_lean",
         }[app_template_choice]
 
         include_daisy_ui = False
@@ -187,58 +348,527 @@ Enter choice [1-3]: """)
         )
 
     def handle_install_command(self, **options):
-        if self.is_standalone:
-            self.tailwind_cli_install_command()
-
-            # Run the build command after installation
-            self.tailwind_cli_build_command()
-        else:
-            args = ["install"]
-            if options["no_package_lock"]:
-                args.append("--no-package-lock")
-            self.npm_command(*args)
+        app_names = get_settings().app_names
+        binary_installed = False
+        for app_name in app_names:
+            self.use_app(app_name)
+            if len(app_names) > 1:
+                self.print(f"Installing '{app_name}'...")
+
+            if self.is_standalone:
+                if not binary_installed:
+                    with self.app_stats.phase("install"):
+                        self.tailwind_cli_install_command()
+                    binary_installed = True
+            else:
+                args = self.npm.get_install_args(
+                    frozen=options["frozen_lockfile"], no_lockfile=options["no_package_lock"]
+                )
+                with self.app_stats.phase("install"):
+                    self.npm_command(*args)
 
             # Run the build command after installation
-            self.npm_command("run", "build")
+            self.generate_sources()
+            self.run_build()
+            self.finish_build()
 
     def handle_build_command(self, **options):
+        app_names = get_settings().app_names
+        if len(app_names) > 1:
+            return self.build_apps(app_names, force=options.get("force"))
+
+        self.generate_sources()
+        build_cache = self.get_build_cache()
+        fingerprint = self.check_build_cache(build_cache, options.get("force"))
+        if build_cache and fingerprint is None:
+            return self.finish_build()
+
+        self.run_build()
+        self.finish_build(build_cache, fingerprint)
+
+    def run_build(self):
         if self.is_standalone:
-            self.tailwind_cli_build_command()
+            with self.app_stats.phase("compile"):
+                self.tailwind_cli_build_command()
+            return
+
+        # Time the clean and compile steps separately when the app uses the stock build script
+        scripts = self.project.package_json.get("scripts", {})
+        if scripts.get("build") == "npm run build:clean && npm run build:tailwind":
+            with self.app_stats.phase("clean"):
+                self.npm_command(*self.npm.get_run_args("build:clean"))
+            with self.app_stats.phase("compile"):
+                self.npm_command(*self.npm.get_run_args("build:tailwind"))
         else:
-            self.npm_command("run", "build")
+            if self.is_lean_build():
+                with self.app_stats.phase("clean"):
+                    self.clean_css_output()
+            with self.app_stats.phase("compile"):
+                self.npm_command(*self.npm.get_run_args("build"))
+
+    def build_apps(self, app_names, force=False):
+        """Builds several apps concurrently, each in its own subprocess."""
+        jobs, pending = [], {}
+        for app_name in app_names:
+            self.use_app(app_name)
+            self.generate_sources()
+            build_cache = self.get_build_cache()
+            fingerprint = self.check_build_cache(build_cache, force)
+            if build_cache and fingerprint is None:
+                self.finish_build()
+                continue
+            if self.is_lean_build():
+                self.clean_css_output()
+            jobs.append(self.get_build_job())
+            pending[app_name] = (build_cache, fingerprint)
+
+        if not jobs:
+            return
+
+        self.print(f"Building {len(jobs)} Tailwind apps...")
+        started = time.perf_counter()
+        exit_codes = self.run_jobs(jobs, get_settings().build_concurrency)
+        for app_name in pending:
+            self.stats.app(app_name).add_phase("compile", time.perf_counter() - started)
+
+        for app_name, (build_cache, fingerprint) in pending.items():
+            if exit_codes[app_name] == 0:
+                self.use_app(app_name)
+                self.finish_build(build_cache, fingerprint)
+
+        if failed := [name for name, exit_code in exit_codes.items() if exit_code]:
+            return self.print_error(f"Tailwind build failed for: {', '.join(failed)}")
+
+    def is_lean_build(self):
+        if self.is_standalone:
+            return False
+        options = self.project.package_json.get(PACKAGE_JSON_OPTIONS_KEY, {})
+        return options.get("cleanOutput") is True
+
+    def clean_css_output(self):
+        """
+        Removes the previous stylesheet and its hashed and compressed copies
+        before a build, like `rimraf` does in other templates, but without
+        touching other static files next to it.
+        """
+        remove_build_output(self.get_css_output_path())
+
+    def generate_sources(self):
+        """Writes the @source directives of TAILWIND_GENERATE_SOURCES next to styles.css."""
+        if not get_settings().generate_sources:
+            return
+        if os.path.isfile(os.path.join(self.cwd, "tailwind.config.js")):
+            return self.print_warning(
+                f"TAILWIND_GENERATE_SOURCES only supports Tailwind v4 apps, '{self.app_name}' "
+                "uses tailwind.config.js."
+            )
+
+        styles_dir = os.path.join(self.cwd, "src")
+        source_dirs = get_project_source_dirs()
+        path, changed = write_generated_sources(styles_dir, source_dirs)
+        if changed:
+            self.print(f"Wrote {len(source_dirs)} @source directives to {os.path.relpath(path)}")
+        if not imports_generated_sources(os.path.join(styles_dir, "styles.css")):
+            self.print_warning(
+                f'Add `@import "./{GENERATED_SOURCES_FILE_NAME}";` to styles.css of '
+                f"'{self.app_name}' to use the generated @source directives."
+            )
+
+    def check_build_cache(self, build_cache, force=False):
+        """
+        Restores the cached stylesheet and returns None if the build cache is
+        up to date; otherwise prints why and returns the new fingerprint.
+        """
+        if not build_cache:
+            return None
+
+        with self.app_stats.phase("cache_check"):
+            fingerprint = build_cache.compute_fingerprint()
+        self.app_stats.source_files = fingerprint["source_files"]
+        reasons = ["--force was given"] if force else build_cache.get_rebuild_reasons(fingerprint)
+        if not reasons:
+            build_cache.restore()
+            self.app_stats.cached = True
+            self.print_success(
+                f"Build cache of '{self.app_name}' is up to date, restored the cached stylesheet."
+            )
+            return None
+
+        for reason in reasons:
+            self.print(f"Rebuilding '{self.app_name}': {reason}")
+        return fingerprint
+
+    def finish_build(self, build_cache=None, fingerprint=None):
+        with self.app_stats.phase("post_build"):
+            self.post_build()
+        if build_cache and os.path.isfile(build_cache.output_path):
+            build_cache.store(fingerprint)
+        self.app_stats.record_output(self.get_css_output_path(), self.cwd)
+
+    @property
+    def app_stats(self):
+        return self.stats.app(self.app_name)
+
+    def report_stats(self, stats_file=None):
+        self.print("Build stats:")
+        for line in self.stats.format_summary():
+            self.print(f"  {line}")
+        if stats_file:
+            self.stats.write(stats_file)
+            self.print_success(f"Build stats written to {stats_file}")
 
     def handle_start_command(self, **options):
+        app_names = get_settings().app_names
+        debounce = options.get("debounce")
+        if debounce is None:
+            debounce = get_settings().watch_debounce
+        if debounce is not None:
+            return self.run_debounced_watcher(app_names, debounce)
+
+        if len(app_names) > 1:
+            jobs = []
+            for app_name in app_names:
+                self.use_app(app_name)
+                self.generate_sources()
+                if self.get_watcher_daemon():
+                    jobs.append(self.get_attach_job())
+                else:
+                    jobs.append(self.get_start_job())
+            try:
+                self.run_jobs(jobs, max_workers=len(jobs))
+            except KeyboardInterrupt:
+                sys.exit(0)
+            return
+
+        self.generate_sources()
+        if daemon := self.get_watcher_daemon():
+            return self.attach_watcher_daemon(daemon)
+
         if self.is_standalone:
             self.tailwind_cli_start_command()
         else:
-            self.npm_command("run", "start")
+            self.npm_command(*self.npm.get_run_args("start"))
+
+    def run_debounced_watcher(self, app_names, debounce):
+        apps = []
+        for app_name in app_names:
+            self.use_app(app_name)
+            self.generate_sources()
+            apps.append(WatchedApp(app_name, self.cwd, self.get_css_output_path()))
+
+        watcher = DebouncedWatcher(apps, self.rebuild_app, debounce)
+        self.print(
+            f"Watching {len(apps)} Tailwind app{'s' if len(apps) > 1 else ''}, rebuilding "
+            f"once changes have been quiet for {debounce:g}s..."
+        )
+        try:
+            for app_name in app_names:
+                self.rebuild_app(app_name)
+            watcher.run(self.report_rebuild)
+        except KeyboardInterrupt:
+            sys.exit(0)
 
-    def handle_dev_command(self, **options):
-        if platform.system() == "Windows":
+    def rebuild_app(self, app_name):
+        """
+        Builds one app for the debounced watcher: standalone apps with the start
+        arguments minus `--watch`, npm apps with their build script. Returns
+        whether the build succeeded.
+        """
+        self.use_app(app_name)
+        if self.is_standalone:
+            args = shlex.split(remove_watch_args(self.get_standalone_args(watch=True)))
+            process = subprocess.run(
+                [self.get_tailwind_cli_bin_path(), *args], cwd=self.project.app_path, check=False
+            )
+            exit_code = process.returncode
+        else:
+            if self.is_lean_build():
+                self.clean_css_output()
+            try:
+                exit_code = self.npm.run(*self.npm.get_run_args("build")).exit_code
+            except NPMException as err:
+                return self.print_error(err)
+        if exit_code:
+            return False
+        self.post_build()
+        return True
+
+    def report_rebuild(self, rebuild):
+        changes = f"{rebuild.changed_files} changed file{'s' if rebuild.changed_files > 1 else ''}"
+        timings = (
+            f"build {rebuild.duration * 1000:.0f} ms, "
+            f"{rebuild.latency * 1000:.0f} ms after the first change"
+        )
+        if rebuild.ok:
+            self.print_success(f"Rebuilt '{rebuild.app_name}' for {changes} ({timings}).")
+        else:
+            self.print_warning(f"Rebuilding '{rebuild.app_name}' for {changes} failed ({timings}).")
+
+    def get_build_job(self):
+        if self.is_standalone:
+            args = [self.get_tailwind_cli_bin_path(), *shlex.split(self.get_standalone_args())]
+            return Job(self.app_name, args, self.project.app_path)
+        return Job(
+            self.app_name, [self.npm.npm_bin_path, *self.npm.get_run_args("build")], self.cwd
+        )
+
+    def get_start_job(self):
+        if self.is_standalone:
+            args = [
+                self.get_tailwind_cli_bin_path(),
+                *shlex.split(self.get_standalone_args(watch=True)),
+            ]
+            return Job(self.app_name, args, self.project.app_path)
+        return Job(
+            self.app_name, [self.npm.npm_bin_path, *self.npm.get_run_args("start")], self.cwd
+        )
+
+    def get_attach_job(self):
+        args = [sys.executable, "-m", "tailwind.daemon", "attach", self.cwd]
+        return Job(self.app_name, args, self.cwd)
+
+    def get_watcher_daemon(self):
+        """
+        Returns the app's running watcher daemon, starting one first if
+        TAILWIND_WATCHER_DAEMON is enabled, or None to run the watcher in-process.
+        A daemon started with different arguments is restarted.
+        """
+        daemon = WatcherDaemon(self.cwd)
+        state = daemon.get_state()
+        if state is None and not get_settings().watcher_daemon:
+            return None
+
+        job = self.get_start_job()
+        if state and state["args"] != job.args:
+            self.print_warning(
+                f"The watcher daemon of '{self.app_name}' runs with different arguments, "
+                "restarting it."
+            )
+            daemon.stop()
+            state = None
+        # another session may have started one in the meantime, which is attached to instead
+        if state is None and (state := daemon.start(job)):
+            self.print_success(
+                f"Started the watcher daemon of '{self.app_name}' (pid {state['pid']})."
+            )
+        return daemon
+
+    def attach_watcher_daemon(self, daemon):
+        self.print(
+            f"Attached to the watcher daemon of '{self.app_name}'. Ctrl+C detaches, "
+            "`python manage.py tailwind daemon stop` stops it."
+        )
+        try:
+            daemon.attach(self.print)
+        except KeyboardInterrupt:
+            sys.exit(0)
+        self.print_warning(f"The watcher daemon of '{self.app_name}' has exited.")
+
+    def handle_daemon_command(self, action, **options):
+        for app_name in get_settings().app_names:
+            self.use_app(app_name)
+            daemon = WatcherDaemon(self.cwd)
+            state = daemon.get_state()
+            if action == "start" and state is None:
+                if state := daemon.start(self.get_start_job()):
+                    self.print_success(
+                        f"Started the watcher daemon of '{app_name}' (pid {state['pid']})."
+                    )
+                    continue
+                state = daemon.get_state()
+            if action == "stop" and state is not None:
+                daemon.stop()
+                self.print_success(f"Stopped the watcher daemon of '{app_name}'.")
+            elif state is None:
+                self.print(f"The watcher daemon of '{app_name}' is not running.")
+            else:
+                self.print(
+                    f"The watcher daemon of '{app_name}' is running (pid {state['pid']}), "
+                    f"logging to {daemon.log_path}."
+                )
+
+    def handle_binary_command(self, action, **options):
+        binary_cache = self.project.binary_cache
+        if binary_cache is None:
             return self.print_error(
-                "The 'tailwind dev' command is not supported on Windows. "
-                "Please run the Django development server and Tailwind watcher separately. "
-                "Use 'python manage.py tailwind start' to start the Tailwind watcher."
+                "Set TAILWIND_STANDALONE_BINARY_CACHE_DIR to use the standalone binary cache."
             )
 
-        self.maybe_install_honcho()
+        if action == "verify":
+            if corrupted := binary_cache.verify():
+                return self.print_error(
+                    "Corrupted binaries in the cache: "
+                    + ", ".join(f"{version}/{target}" for version, target in corrupted)
+                )
+            return self.print_success(f"Every binary in {binary_cache.cache_dir} is intact.")
+
+        version = options["binary_version"] or self.project.settings.standalone_binary_version
+        try:
+            if action == "add":
+                if not options["file"] or not options["target"]:
+                    return self.print_error("`tailwind binary add` needs --file and --target.")
+                for target in options["target"]:
+                    path = binary_cache.add(version, target, options["file"], options["sha256"])
+                    self.print_success(f"Added {target} binary of {version}: {path}")
+                return
+
+            for target in options["target"] or [None]:
+                path = binary_cache.get(version, target)
+                self.print_success(
+                    f"Cached {target or 'this platform'}'s binary of {version}: {path}"
+                )
+        except (BinaryCacheError, OSError) as err:
+            return self.print_error(err)
+
+    def run_jobs(self, jobs, max_workers=None):
+        return run_jobs(jobs, self.print, max_workers=max_workers)
+
+    def handle_dev_command(self, **options):
         procfile_path = self.get_or_create_procfile()
+        commands = parse_procfile(procfile_path)
+        if not commands:
+            return self.print_error(f"No processes found in {procfile_path}.")
+
         self.print_dev_server_message(procfile_path)
-        self.start_honcho()
+        self.run_supervisor(commands)
+
+    def handle_scan_command(self, **options):
+        roots = get_scan_roots()
+        for app_name in get_settings().app_names:
+            self.use_app(app_name)
+            index = ClassIndex(os.path.join(self.cwd, SCAN_INDEX_FILE_NAME), roots)
+            scanned, reused, removed = index.update()
+            self.print(
+                f"Indexed {len(index.files):,} files of '{app_name}' in {len(roots)} "
+                f"directories: {scanned:,} scanned, {reused:,} unchanged, {removed:,} removed."
+            )
+
+            css_classes = None
+            output_path = self.get_css_output_path()
+            if os.path.isfile(output_path):
+                with open(output_path, encoding="utf-8", errors="replace") as f:
+                    css_classes = extract_css_classes(f.read())
+                self.print_class_usage(index, css_classes, options["top"])
+            else:
+                self.print_warning(
+                    f"Compiled stylesheet not found at {output_path}, run `tailwind build` "
+                    "to get class usage stats."
+                )
+
+            if options["sources"]:
+                styles_dir = os.path.join(self.cwd, "src")
+                self.print("")
+                for glob in index.get_source_globs(styles_dir, css_classes):
+                    self.print(f'@source "{glob}";')
+
+    def print_class_usage(self, index, css_classes, top):
+        used = index.get_used_classes(css_classes)
+        unused = index.get_unused_classes(css_classes)
+        self.print(
+            f"{len(css_classes):,} classes in the stylesheet, used by {len(used):,} files; "
+            f"{len(unused):,} not found in any indexed file."
+        )
+        if unused:
+            examples = ", ".join(sorted(unused)[:10])
+            self.print(f"  Not found: {examples}{' ...' if len(unused) > 10 else ''}")
+        if hot_files := index.get_hot_files(css_classes, top):
+            self.print("Files using the most classes:")
+            for path, count in hot_files:
+                self.print(f"  {count:>6,}  {os.path.relpath(path)}")
+
+    def handle_stats_command(self, **options):
+        roots = None if options["no_scan"] else get_scan_roots()
+        report = {}
+        for app_name in get_settings().app_names:
+            self.use_app(app_name)
+            output_path = self.get_css_output_path()
+            if not os.path.isfile(output_path):
+                message = (
+                    f"Compiled stylesheet of '{app_name}' not found at {output_path}, "
+                    "run `tailwind build` first."
+                )
+                # keep stdout parseable with --json
+                if options["json"]:
+                    self.stderr.write(message)
+                else:
+                    self.print_warning(message)
+                continue
+
+            bundle_stats = CSSBundleStats.from_file(output_path)
+            class_files = None
+            if roots is not None:
+                index = ClassIndex(os.path.join(self.cwd, SCAN_INDEX_FILE_NAME), roots)
+                index.update()
+                class_files = {
+                    css_class: [os.path.relpath(path) for path in paths]
+                    for css_class, paths in index.get_class_files(
+                        set(bundle_stats.utility_sizes)
+                    ).items()
+                }
+            report[app_name] = bundle_stats.as_dict(options["top"], class_files)
+            if not options["json"]:
+                self.print_bundle_stats(app_name, output_path, report[app_name])
+
+        if options["json"]:
+            self.print(json.dumps({"apps": report}, indent=2))
+
+    def print_bundle_stats(self, app_name, output_path, stats):
+        compressed = "".join(
+            f", {size:,} {encoding}" for encoding, size in stats["compressed_sizes"].items()
+        )
+        self.print(f"{app_name}: {os.path.relpath(output_path)}")
+        self.print(f"  Size: {stats['size']:,} bytes{compressed}")
+        self.print(
+            f"  {stats['rules']:,} rules, {len(stats['layers']):,} layers, "
+            f"{stats['custom_properties']:,} custom properties "
+            f"({stats['custom_property_declarations']:,} declarations)"
+        )
+        sections = [
+            ("Layers", list(stats["layers"].items())),
+            (
+                "Largest selectors",
+                [(item["selector"], item["size"]) for item in stats["largest_selectors"]],
+            ),
+            (
+                "Largest media queries",
+                [
+                    (f"@media {item['query']}", item["size"])
+                    for item in stats["largest_media_queries"]
+                ],
+            ),
+        ]
+        for title, rows in sections:
+            if rows:
+                self.print(f"{title}:")
+                for name, size in rows:
+                    self.print(f"  {size:>9,}  {name}")
+
+        if stats["largest_utilities"]:
+            self.print("Largest utilities:")
+        for utility in stats["largest_utilities"]:
+            line = f"  {utility['size']:>9,}  {utility['class']}"
+            if "files" in utility:
+                files = utility["files"]
+                if not files:
+                    line += "  (not found in any indexed file)"
+                else:
+                    more = f" and {len(files) - 3} more" if len(files) > 3 else ""
+                    line += f"  ({', '.join(files[:3])}{more})"
+            self.print(line)
 
     def handle_check_updates_command(self, **options):
         if self.is_standalone:
             return self.print_error(
                 "Check-updates command is not supported for Tailwind projects that use standalone binary."
             )
-        self.npm_command("outdated")
+        self.npm_command(*self.npm.get_outdated_args())
 
     def handle_update_command(self, **options):
         if self.is_standalone:
             return self.print_error(
                 "Update command is not supported for Tailwind projects that use standalone binary."
             )
-        self.npm_command("update")
+        self.npm_command(*self.npm.get_update_args())
 
     def handle_plugin_install_command(self, plugin_name, **options):
         if self.is_standalone:
@@ -249,14 +879,13 @@ Enter choice [1-3]: """)
         # Install the npm package
         self.print(f"Installing {plugin_name} npm package...")
         try:
-            self.npm_command("install", plugin_name, "--save-dev")
+            self.npm_command(*self.npm.get_add_dev_args(plugin_name))
             self.print_success(f"Successfully installed {plugin_name} npm package")
         except Exception as err:
             return self.print_error(f"Failed to install {plugin_name}: {err}")
 
         # Update styles.css to include the plugin
-        app_name = get_config("TAILWIND_APP_NAME")
-        styles_path = os.path.join(get_tailwind_src_path(app_name), "src", "styles.css")
+        styles_path = os.path.join(self.cwd, "src", "styles.css")
 
         if not os.path.exists(styles_path):
             return self.print_error(f"styles.css not found at {styles_path}")
@@ -285,6 +914,60 @@ Enter choice [1-3]: """)
         self.print_success(f"Successfully added {plugin_name} to styles.css")
         self.print(f"Plugin {plugin_name} has been installed and configured!")
 
+    def get_build_cache(self):
+        tailwind_settings = get_settings()
+        if not tailwind_settings.build_cache_dir:
+            return None
+
+        options = {"mode": "standalone" if self.is_standalone else "npm"}
+        if self.is_standalone:
+            options["binary_version"] = tailwind_settings.standalone_binary_version
+            options["build_args"] = self.get_standalone_args()
+        return BuildCache(
+            os.path.join(tailwind_settings.build_cache_dir, self.app_name.split(".")[-1]),
+            self.project.app_path,
+            self.get_css_output_path(),
+            options,
+        )
+
+    def post_build(self):
+        tailwind_settings = get_settings()
+        if not tailwind_settings.css_versioning and not tailwind_settings.precompress:
+            return
+
+        output_path = self.get_css_output_path()
+        if not os.path.isfile(output_path):
+            return self.print_warning(
+                f"Compiled stylesheet not found at {output_path}, skipping post-build steps."
+            )
+
+        output_paths = [output_path]
+        if tailwind_settings.css_versioning:
+            manifest = write_manifest(
+                output_path, self.project.static_css_path, tailwind_settings.css_versioning
+            )
+            self.print_success(f"Wrote CSS manifest, content hash: {manifest['hash']}")
+            if tailwind_settings.css_versioning == VERSIONING_FILENAME:
+                output_paths.append(get_hashed_path(output_path, manifest["hash"]))
+
+        if tailwind_settings.precompress:
+            for path in output_paths:
+                self.compress_css(path)
+
+    def get_standalone_args(self, watch=False):
+        return self.project.get_standalone_args(watch=watch)
+
+    def get_css_output_path(self):
+        return self.project.css_output_path
+
+    def compress_css(self, path):
+        for compressed in compress_file(path):
+            status = "unchanged" if compressed.skipped else "written"
+            self.print(
+                f"{os.path.basename(compressed.path)}: {compressed.raw_size:,} bytes -> "
+                f"{compressed.compressed_size:,} bytes ({compressed.encoding}, {status})"
+            )
+
     def get_or_create_procfile(self):
         # Check if Procfile.tailwind exists, create if not
         procfile_path = os.path.join(os.getcwd(), "Procfile.tailwind")
@@ -343,30 +1026,10 @@ tailwind: python manage.py tailwind start"""
                 )
         return cookiecutter
 
-    def maybe_install_honcho(self):
-        # Check if honcho is installed
+    def run_supervisor(self, commands):
+        supervisor = Supervisor(commands, self.print, colorize=self.stdout.isatty())
         try:
-            subprocess.run(["honcho", "--version"], check=True, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.install_honcho()
-
-    def install_honcho(self):
-        self.print("Honcho is not installed. Installing honcho...")
-        try:
-            install_pip_package("honcho")
-            self.print_success("Honcho installed successfully!")
-        except Exception:
-            return self.print_error(
-                "Failed to install 'honcho' via pip. Please install it manually "
-                "(https://pypi.org/project/honcho/) and run 'python manage.py tailwind dev' again."
-            )
-
-    def start_honcho(self):
-        # Start honcho with the Procfile
-        try:
-            subprocess.run(["honcho", "-f", "Procfile.tailwind", "start"], check=True)
-        except subprocess.CalledProcessError as err:
-            return self.print_error(f"Failed to start honcho: {err}")
+            supervisor.run()
         except KeyboardInterrupt:
             self.print("\nStopping development servers...")
             sys.exit(0)
@@ -387,42 +1050,76 @@ tailwind: python manage.py tailwind start"""
     def tailwind_cli_install_command(self):
         import pytailwindcss
 
+        if self.project.binary_cache:
+            return self.get_cached_bin_path()
         return pytailwindcss.install(
-            version=get_config("TAILWIND_STANDALONE_BINARY_VERSION"),
+            version=get_settings().standalone_binary_version,
         )
 
+    def get_cached_bin_path(self):
+        """The binary of TAILWIND_STANDALONE_BINARY_CACHE_DIR, fetched if missing, or None."""
+        if not self.project.binary_cache:
+            return None
+        try:
+            return self.project.binary_cache.get(self.project.settings.standalone_binary_version)
+        except (BinaryCacheError, OSError) as err:
+            return self.print_error(err)
+
+    def get_tailwind_cli_bin_path(self):
+        import pytailwindcss
+
+        if cached_bin_path := self.get_cached_bin_path():
+            return cached_bin_path
+        bin_path = self.project.standalone_bin_path
+        if not bin_path.exists():
+            pytailwindcss.install(self.project.settings.standalone_binary_version, bin_path)
+        return str(bin_path)
+
     def tailwind_cli_build_command(self):
         import pytailwindcss
 
-        return pytailwindcss.run(
-            shlex.split(get_config("TAILWIND_STANDALONE_BUILD_COMMAND_ARGS")),
-            cwd=get_app_path(get_config("TAILWIND_APP_NAME")),
+        result = pytailwindcss.run(
+            shlex.split(self.get_standalone_args()),
+            cwd=self.project.app_path,
+            bin_path=self.get_cached_bin_path(),
             live_output=True,
             auto_install=True,
-            version=get_config("TAILWIND_STANDALONE_BINARY_VERSION"),
+            version=self.project.settings.standalone_binary_version,
         )
+        # with live_output, a failed build doesn't raise
+        if result.returncode:
+            return self.print_error(
+                f"Tailwind build of '{self.app_name}' failed with exit code {result.returncode}."
+            )
+        return result
 
     def tailwind_cli_start_command(self):
         try:
             import pytailwindcss
 
             pytailwindcss.run(
-                shlex.split(get_config("TAILWIND_STANDALONE_START_COMMAND_ARGS")),
-                cwd=get_app_path(get_config("TAILWIND_APP_NAME")),
+                shlex.split(self.get_standalone_args(watch=True)),
+                cwd=self.project.app_path,
+                bin_path=self.get_cached_bin_path(),
                 live_output=True,
                 auto_install=True,
-                version=get_config("TAILWIND_STANDALONE_BINARY_VERSION"),
+                version=self.project.settings.standalone_binary_version,
             )
         except KeyboardInterrupt:
             sys.exit(0)
 
     def npm_command(self, *args):
         try:
-            self.npm.command(*args)
+            result = self.npm.run(*args)
         except NPMException as err:
             return self.print_error(err)
         except KeyboardInterrupt:
             sys.exit(0)
+        if not result.ok:
+            return self.print_error(
+                f"`{self.npm.name} {' '.join(args)}` failed with exit code {result.exit_code}."
+            )
+        return result
 
     def print(self, message):
         self.stdout.write(message)
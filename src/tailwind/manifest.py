@@ -0,0 +1,156 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .utils import find_static_file
+
+VERSIONING_QUERY = "query"
+VERSIONING_FILENAME = "filename"
+
+HASH_LENGTH = 12
+
+# Seconds a dev version is reused before the stylesheet is stat()ed again
+DEV_VERSION_CHECK_INTERVAL = 1.0
+
+# static css path -> (checked at, file path, version)
+_dev_versions = {}
+
+
+def get_manifest_path(css_path):
+    """styles.css -> styles.manifest.json, next to the stylesheet."""
+    return f"{os.path.splitext(css_path)[0]}.manifest.json"
+
+
+def get_hashed_path(css_path, file_hash):
+    """styles.css -> styles.<hash>.css"""
+    root, ext = os.path.splitext(css_path)
+    return f"{root}.{file_hash}{ext}"
+
+
+def hash_file(path):
+    md5 = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()[:HASH_LENGTH]
+
+
+def remove_stale_hashed_copies(output_path, keep):
+    root, ext = os.path.splitext(os.path.basename(output_path))
+    # also matches precompressed siblings, e.g. styles.<hash>.css.gz
+    pattern = re.compile(
+        rf"^{re.escape(root)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}(\.gz|\.br)?$"
+    )
+    output_dir = os.path.dirname(output_path)
+    for name in os.listdir(output_dir):
+        if pattern.match(name) and not name.startswith(keep):
+            os.remove(os.path.join(output_dir, name))
+
+
+def remove_build_output(output_path):
+    """
+    Removes the compiled stylesheet at `output_path`, its manifest, its hashed
+    copies and their precompressed siblings, leaving other files alone.
+    """
+    root, ext = os.path.splitext(os.path.basename(output_path))
+    pattern = re.compile(
+        rf"^{re.escape(root)}(\.[0-9a-f]{{{HASH_LENGTH}}})?{re.escape(ext)}(\.gz|\.br)?$"
+    )
+    output_dir = os.path.dirname(output_path)
+    try:
+        names = os.listdir(output_dir)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if pattern.match(name) or name == os.path.basename(get_manifest_path(output_path)):
+            os.remove(os.path.join(output_dir, name))
+
+
+def write_manifest(output_path, css_path, versioning):
+    """
+    Hashes the compiled stylesheet at `output_path` and records the hash in a
+    manifest next to it. In "filename" mode a copy named after the hash is
+    written as well, so it can be served with a far-future immutable
+    Cache-Control header.
+    """
+    file_hash = hash_file(output_path)
+    manifest = {
+        "path": css_path,
+        "hash": file_hash,
+        "hashed_path": get_hashed_path(css_path, file_hash),
+    }
+
+    if versioning == VERSIONING_FILENAME:
+        hashed_output_path = get_hashed_path(output_path, file_hash)
+        shutil.copyfile(output_path, hashed_output_path)
+        remove_stale_hashed_copies(output_path, keep=os.path.basename(hashed_output_path))
+
+    with open(get_manifest_path(output_path), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    read_manifest.cache_clear()
+    return manifest
+
+
+@functools.cache
+def read_manifest(css_path):
+    """
+    Returns the manifest for the static `css_path`, or None if the stylesheet
+    hasn't been built with versioning enabled. The result is cached for the
+    lifetime of the process.
+    """
+    manifest_path = find_static_file(get_manifest_path(css_path))
+    if not manifest_path:
+        return None
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stat_version(path):
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def get_dev_version(css_path):
+    """
+    Returns a version for the static `css_path` in DEBUG that only changes
+    when the stylesheet is rebuilt, from the mtime and size of the file the
+    staticfiles finders locate. The file is found once and stat()ed at most
+    once per DEV_VERSION_CHECK_INTERVAL; until it's built, a time-based
+    version is returned.
+    """
+    now = time.monotonic()
+    cached = _dev_versions.get(css_path)
+    if cached and now - cached[0] < DEV_VERSION_CHECK_INTERVAL:
+        return cached[2]
+
+    path = cached[1] if cached else None
+    version = stat_version(path)
+    if version is None:
+        path = find_static_file(css_path)
+        version = stat_version(path)
+    if version is None:
+        return int(time.time())
+    _dev_versions[css_path] = (now, path, version)
+    return version
+
+
+@receiver(setting_changed)
+def clear_manifest_cache(**kwargs):
+    read_manifest.cache_clear()
+    _dev_versions.clear()
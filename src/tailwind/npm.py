@@ -1,37 +1,295 @@
+import asyncio
+import dataclasses
+import json
+import os
 import subprocess
 import sys
+import threading
+import time
 
-from tailwind import get_config
+from tailwind import get_settings
 
 
 class NPMException(Exception):
     pass
 
 
+@dataclasses.dataclass
+class NPMResult:
+    """The outcome of one npm command run by `NPM.run()` or `NPM.run_async()`."""
+
+    args: list
+    exit_code: int
+    duration: float
+    # the merged stdout and stderr lines, if the output was captured
+    output: list | None = None
+    timed_out: bool = False
+
+    @property
+    def ok(self):
+        return self.exit_code == 0 and not self.timed_out
+
+    @property
+    def text(self):
+        return "\n".join(self.output or [])
+
+
 class NPM:
+    """
+    Runs package manager commands in `cwd`. Subclasses map the subcommands the
+    tailwind command needs onto pnpm, Bun and Yarn; `npm_bin_path` is the
+    executable of whichever tool is used.
+    """
+
+    name = "npm"
+    lockfiles = ("package-lock.json", "npm-shrinkwrap.json")
     cwd = None
     npm_bin_path = None
 
-    def __init__(self, cwd=None, npm_bin_path=None):
-        self.npm_bin_path = npm_bin_path if npm_bin_path else get_config("NPM_BIN_PATH")
+    def __init__(self, cwd=None, npm_bin_path=None, store_dir=None):
+        self.npm_bin_path = npm_bin_path if npm_bin_path else self.get_default_bin_path()
         self.cwd = cwd
+        # a package store or cache directory shared by every project on the host
+        self.store_dir = store_dir
+
+    def get_default_bin_path(self):
+        tailwind_settings = get_settings()
+        if self.name == "npm":
+            return tailwind_settings.npm_bin_path
+        return tailwind_settings.package_manager_bin_path or self.name
+
+    def get_install_args(self, frozen=False, no_lockfile=False):
+        args = ["ci"] if frozen else ["install"]
+        if no_lockfile:
+            args.append("--no-package-lock")
+        return args + self.get_store_args()
+
+    def get_store_args(self):
+        return ["--cache", self.store_dir] if self.store_dir else []
+
+    def get_add_dev_args(self, package):
+        return ["install", package, "--save-dev", *self.get_store_args()]
+
+    def get_outdated_args(self):
+        return ["outdated"]
+
+    def get_update_args(self):
+        return ["update", *self.get_store_args()]
+
+    def get_run_args(self, script):
+        return ["run", script]
 
     def cd(self, cwd):
         self.cwd = cwd
 
     def command(self, *args):
-        try:
-            subprocess.run([self.npm_bin_path, *list(args)], cwd=self.cwd, check=True)
-            return True
-        except subprocess.CalledProcessError:
+        if not self.run(*args).ok:
             sys.exit(1)
+        return True
+
+    def run(self, *args, on_line=None, capture=False, timeout=None):
+        """
+        Runs `npm <args>` and returns an NPMResult. By default the output goes
+        straight to the terminal; with `capture` or an `on_line` callback,
+        stdout and stderr are read line by line, collected in the result and/or
+        passed to the callback as they arrive. A command still running after
+        `timeout` seconds is killed.
+        """
+        args = [self.npm_bin_path, *args]
+        piped = capture or on_line is not None
+        started = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                args,
+                cwd=self.cwd,
+                stdout=subprocess.PIPE if piped else None,
+                stderr=subprocess.STDOUT if piped else None,
+                text=True,
+                errors="replace",
+            )
         except OSError as err:
+            raise self.not_found_error() from err
+
+        output = [] if capture else None
+        timed_out = threading.Event()
+        timer = None
+        if timeout is not None:
+
+            def kill():
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+        try:
+            if piped:
+                with process.stdout:
+                    for line in process.stdout:
+                        line = line.rstrip("\n")
+                        if output is not None:
+                            output.append(line)
+                        if on_line is not None:
+                            on_line(line)
+            exit_code = process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        return NPMResult(args, exit_code, time.perf_counter() - started, output, timed_out.is_set())
+
+    async def run_async(self, *args, on_line=None, capture=False, timeout=None):
+        """The asyncio counterpart of `run()`, so several npm commands can run at once."""
+        args = [self.npm_bin_path, *args]
+        piped = capture or on_line is not None
+        started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=self.cwd,
+                stdout=subprocess.PIPE if piped else None,
+                stderr=subprocess.STDOUT if piped else None,
+            )
+        except OSError as err:
+            raise self.not_found_error() from err
+
+        output = [] if capture else None
+
+        async def read_output():
+            if piped:
+                async for line in process.stdout:
+                    line = line.decode(errors="replace").rstrip("\n")
+                    if output is not None:
+                        output.append(line)
+                    if on_line is not None:
+                        on_line(line)
+            return await process.wait()
+
+        timed_out = False
+        try:
+            exit_code = await asyncio.wait_for(read_output(), timeout)
+        except TimeoutError:
+            process.kill()
+            exit_code = await process.wait()
+            timed_out = True
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return NPMResult(args, exit_code, time.perf_counter() - started, output, timed_out)
+
+    def not_found_error(self):
+        if self.name != "npm":
+            return NPMException(
+                f"\n{self.name} is not installed or cannot be found at '{self.npm_bin_path}'.\n\n"
+                f"Install {self.name}, set TAILWIND_PACKAGE_MANAGER_BIN_PATH in settings.py to the "
+                f"path of its executable, or remove the {self.name} lockfile to use npm."
+            )
+        return NPMException(
+            "\nIt looks like node.js and/or npm is not installed or cannot be found.\n\n"
+            "Visit https://nodejs.org to download and install node.js for your system.\n\n"
+            "If you have npm installed and still getting this error message, "
+            "set NPM_BIN_PATH variable in settings.py to match path of NPM executable in your system.\n\n"
+            ""
+            "Example:\n"
+            'NPM_BIN_PATH = "/usr/local/bin/npm"'
+        )
+
+
+class PNPM(NPM):
+    name = "pnpm"
+    lockfiles = ("pnpm-lock.yaml",)
+
+    def get_install_args(self, frozen=False, no_lockfile=False):
+        args = ["install", "--frozen-lockfile" if frozen else "--prefer-offline"]
+        if no_lockfile:
+            args.append("--no-lockfile")
+        return args + self.get_store_args()
+
+    def get_store_args(self):
+        return ["--store-dir", self.store_dir] if self.store_dir else []
+
+    def get_add_dev_args(self, package):
+        return ["add", "--save-dev", package, *self.get_store_args()]
+
+
+class Bun(NPM):
+    name = "bun"
+    lockfiles = ("bun.lock", "bun.lockb")
+
+    def get_install_args(self, frozen=False, no_lockfile=False):
+        args = ["install"]
+        if frozen:
+            args.append("--frozen-lockfile")
+        if no_lockfile:
+            args.append("--no-save")
+        return args + self.get_store_args()
+
+    def get_store_args(self):
+        return ["--cache-dir", self.store_dir] if self.store_dir else []
+
+    def get_add_dev_args(self, package):
+        return ["add", "--dev", package, *self.get_store_args()]
+
+
+class Yarn(NPM):
+    name = "yarn"
+    lockfiles = ("yarn.lock",)
+
+    def get_install_args(self, frozen=False, no_lockfile=False):
+        args = ["install"]
+        if frozen:
+            args.append("--frozen-lockfile")
+        if no_lockfile:
+            args.append("--no-lockfile")
+        return args + self.get_store_args()
+
+    def get_store_args(self):
+        return ["--cache-folder", self.store_dir] if self.store_dir else []
+
+    def get_add_dev_args(self, package):
+        return ["add", "--dev", package, *self.get_store_args()]
+
+    def get_update_args(self):
+        return ["upgrade", *self.get_store_args()]
+
+
+PACKAGE_MANAGERS = {cls.name: cls for cls in (NPM, PNPM, Bun, Yarn)}
+
+
+def detect_package_manager(cwd):
+    """
+    Returns the package manager class of the project in `cwd`: the one whose
+    lockfile is present, then the one named in the `packageManager` field of
+    package.json, and npm otherwise.
+    """
+    for cls in (PNPM, Bun, Yarn, NPM):
+        if any(os.path.isfile(os.path.join(cwd, lockfile)) for lockfile in cls.lockfiles):
+            return cls
+
+    try:
+        with open(os.path.join(cwd, "package.json")) as f:
+            package_manager = json.load(f).get("packageManager") or ""
+    except (OSError, ValueError, AttributeError):
+        package_manager = ""
+    # e.g. "pnpm@9.12.0"
+    return PACKAGE_MANAGERS.get(package_manager.split("@")[0], NPM)
+
+
+def get_package_manager(cwd, name=None, store_dir=None):
+    """Returns a runner for TAILWIND_PACKAGE_MANAGER, or the package manager detected in `cwd`."""
+    tailwind_settings = get_settings()
+    name = name or tailwind_settings.package_manager
+    if name:
+        try:
+            cls = PACKAGE_MANAGERS[name]
+        except KeyError:
             raise NPMException(
-                "\nIt looks like node.js and/or npm is not installed or cannot be found.\n\n"
-                "Visit https://nodejs.org to download and install node.js for your system.\n\n"
-                "If you have npm installed and still getting this error message, "
-                "set NPM_BIN_PATH variable in settings.py to match path of NPM executable in your system.\n\n"
-                ""
-                "Example:\n"
-                'NPM_BIN_PATH = "/usr/local/bin/npm"'
-            ) from err
+                f"Unknown package manager '{name}', expected one of: {', '.join(PACKAGE_MANAGERS)}."
+            ) from None
+    else:
+        cls = detect_package_manager(cwd)
+    return cls(cwd=cwd, store_dir=store_dir or tailwind_settings.package_manager_store_dir)
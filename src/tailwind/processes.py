@@ -0,0 +1,77 @@
+import dataclasses
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+@dataclasses.dataclass
+class Job:
+    name: str
+    args: list
+    cwd: str
+    env: dict | None = None
+
+
+class PrefixedOutput:
+    """Writes whole lines, prefixed with the job name, from several threads."""
+
+    def __init__(self, write):
+        self.write = write
+        self.lock = threading.Lock()
+        self.width = 0
+
+    def line(self, name, line):
+        with self.lock:
+            self.write(f"[{name.ljust(self.width)}] {line}")
+
+
+def run_job(job, output, processes=None):
+    """
+    Runs `job` to completion, passing every line it prints to `output`, and
+    returns its exit code. Started processes are added to `processes`, so
+    they can be terminated from another thread.
+    """
+    try:
+        process = subprocess.Popen(
+            job.args,
+            cwd=job.cwd,
+            env=job.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+    except OSError as err:
+        output.line(job.name, f"Failed to start {job.args[0]}: {err}")
+        return 127
+
+    if processes is not None:
+        processes.append(process)
+    with process.stdout:
+        for line in process.stdout:
+            output.line(job.name, line.rstrip("\n"))
+    return process.wait()
+
+
+def run_jobs(jobs, write, max_workers=None):
+    """
+    Runs `jobs` concurrently, at most `max_workers` at a time, with their
+    output prefixed by the job name. Returns a {job name: exit code} dict.
+    On KeyboardInterrupt every running process is terminated.
+    """
+    output = PrefixedOutput(write)
+    output.width = max((len(job.name) for job in jobs), default=0)
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+    processes = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {job.name: executor.submit(run_job, job, output, processes) for job in jobs}
+        try:
+            return {name: future.result() for name, future in futures.items()}
+        except KeyboardInterrupt:
+            for future in futures.values():
+                future.cancel()
+            for process in processes:
+                process.terminate()
+            raise
@@ -0,0 +1,133 @@
+import dataclasses
+import functools
+import json
+import os
+
+from tailwind import get_settings
+
+from .binary_cache import BinaryCache
+from .conf import TailwindSettings
+from .utils import get_app_path
+from .utils import get_output_arg
+from .utils import get_script_output_arg
+from .utils import replace_output_arg
+
+
+@dataclasses.dataclass(frozen=True)
+class TailwindProject:
+    """
+    Everything a management command needs to know about one Tailwind app,
+    resolved once per invocation: its paths, whether it uses the standalone
+    binary or npm, and the settings it was resolved with.
+    """
+
+    app_name: str
+    app_path: str
+    settings: TailwindSettings
+    has_package_json: bool
+    has_styles_css: bool
+
+    @classmethod
+    def resolve(cls, app_name, tailwind_settings=None):
+        tailwind_settings = tailwind_settings or get_settings()
+        app_path = get_app_path(app_name)
+        src_path = os.path.join(app_path, "static_src")
+        return cls(
+            app_name=app_name,
+            app_path=app_path,
+            settings=tailwind_settings,
+            has_package_json=os.path.isfile(os.path.join(src_path, "package.json")),
+            has_styles_css=os.path.isfile(os.path.join(src_path, "src", "styles.css")),
+        )
+
+    @property
+    def src_path(self):
+        return os.path.join(self.app_path, "static_src")
+
+    @property
+    def styles_dir(self):
+        return os.path.join(self.src_path, "src")
+
+    @property
+    def package_json_path(self):
+        return os.path.join(self.src_path, "package.json")
+
+    @property
+    def is_tailwind_app(self):
+        return self.has_package_json or self.has_styles_css
+
+    @property
+    def is_standalone(self):
+        return self.settings.use_standalone_binary or not self.has_package_json
+
+    @property
+    def app_label(self):
+        return self.app_name.split(".")[-1]
+
+    @property
+    def uses_output_dir(self):
+        # npm scripts choose their output path themselves
+        return bool(self.settings.output_dir) and self.is_standalone
+
+    @property
+    def static_dir(self):
+        """The directory the compiled stylesheet is found in as a static file."""
+        if self.uses_output_dir:
+            return os.path.join(self.settings.output_dir, self.app_label)
+        return os.path.join(self.app_path, "static")
+
+    def get_standalone_args(self, watch=False):
+        args = self.settings.get_standalone_command_args(self.app_name, watch=watch)
+        if self.uses_output_dir:
+            args = replace_output_arg(args, self.css_output_path)
+        return args
+
+    @functools.cached_property
+    def css_output_path(self):
+        """
+        The `-o` argument of the standalone binary or of the npm `build` script
+        if given, otherwise static/<css_path>; moved to the app's directory in
+        TAILWIND_OUTPUT_DIR if set.
+        """
+        output_path = None
+        if self.is_standalone:
+            output = get_output_arg(self.settings.get_standalone_command_args(self.app_name))
+            if output is not None:
+                output_path = os.path.join(self.app_path, output)
+        else:
+            # npm scripts run in static_src
+            output = get_script_output_arg(self.package_json.get("scripts", {}), "build")
+            if output is not None:
+                output_path = os.path.normpath(os.path.join(self.src_path, output))
+        if output_path is None:
+            output_path = os.path.join(self.app_path, "static", self.settings.css_path)
+        if self.uses_output_dir:
+            static_path = os.path.relpath(output_path, os.path.join(self.app_path, "static"))
+            return os.path.join(self.static_dir, static_path)
+        return output_path
+
+    @property
+    def static_css_path(self):
+        """The path of the compiled stylesheet among the static files, e.g. css/dist/styles.css."""
+        return os.path.relpath(self.css_output_path, self.static_dir).replace(os.sep, "/")
+
+    @functools.cached_property
+    def package_json(self):
+        with open(self.package_json_path) as f:
+            return json.load(f)
+
+    @functools.cached_property
+    def binary_cache(self):
+        """The shared binary cache of TAILWIND_STANDALONE_BINARY_CACHE_DIR, if set."""
+        if not self.settings.standalone_binary_cache_dir:
+            return None
+        return BinaryCache(
+            self.settings.standalone_binary_cache_dir, self.settings.standalone_binary_mirror
+        )
+
+    @functools.cached_property
+    def standalone_bin_path(self):
+        """Where pytailwindcss keeps the binary of TAILWIND_STANDALONE_BINARY_VERSION."""
+        import pytailwindcss
+
+        return pytailwindcss.get_bin_path(self.settings.standalone_binary_version)
@@ -0,0 +1,190 @@
+import json
+import os
+import re
+
+from django.apps import apps
+
+from .sources import IGNORED_DIRS
+from .sources import walk_files
+from .utils import is_project_path
+
+INDEX_VERSION = 1
+
+SCAN_EXTENSIONS = (".html", ".htm", ".txt", ".jinja", ".jinja2", ".py", ".js")
+# Directories of Django apps that never contain classes used in templates
+SKIPPED_APP_DIRS = {"migrations", "static_src"}
+
+# Tokens that could be class names: `p-4`, `md:hover:bg-blue-500`, `w-[32rem]`, `!mt-0`
+CANDIDATE_RE = re.compile(r"[!-]?[a-z@\[][\w\-:/.\[\]#%()!,@&]*")
+# Class selectors of a compiled stylesheet, with escaped characters like `md\:flex`
+CSS_CLASS_RE = re.compile(r"\.((?:\\.|[\w-])+)")
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+CSS_DECLARATIONS_RE = re.compile(r"\{[^{}]*\}")
+MAX_CANDIDATE_LENGTH = 100
+
+
+def extract_candidates(text):
+    """Returns the sorted set of tokens in `text` that could be Tailwind classes."""
+    candidates = set()
+    for match in CANDIDATE_RE.finditer(text):
+        candidate = match.group(0).rstrip(".,:")
+        if 1 < len(candidate) <= MAX_CANDIDATE_LENGTH:
+            candidates.add(candidate)
+    return sorted(candidates)
+
+
+def extract_css_classes(css):
+    """Returns the set of class names the selectors of a compiled stylesheet refer to."""
+    css = CSS_COMMENT_RE.sub("", css)
+    # drop declaration blocks, so values like `0.5rem` aren't taken for classes
+    previous = None
+    while previous != css:
+        previous, css = css, CSS_DECLARATIONS_RE.sub("{", css)
+    return {re.sub(r"\\(.)", r"\1", match) for match in CSS_CLASS_RE.findall(css)}
+
+
+def get_scan_roots():
+    """
+    Returns the directories to scan: every project app in INSTALLED_APPS and
+    every template directory of the configured template engines, without
+    directories that are nested in another root.
+    """
+    from django.template import engines
+
+    roots = {app_config.path for app_config in apps.get_app_configs()}
+    for engine in engines.all():
+        roots.update(str(path) for path in engine.template_dirs)
+    roots = sorted(
+        os.path.abspath(root) for root in roots if os.path.isdir(root) and is_project_path(root)
+    )
+
+    top_level = []
+    for root in roots:
+        if not any(root.startswith(parent + os.sep) for parent in top_level):
+            top_level.append(root)
+    return top_level
+
+
+def iter_scanned_files(root):
+    for path in walk_files(root):
+        relative_parts = os.path.relpath(path, root).split(os.sep)[:-1]
+        if SKIPPED_APP_DIRS.intersection(relative_parts) or IGNORED_DIRS.intersection(
+            relative_parts
+        ):
+            continue
+        if path.endswith(SCAN_EXTENSIONS):
+            yield path
+
+
+class ClassIndex:
+    """
+    An on-disk index of the class candidates found in the files under `roots`,
+    stored at `index_path` with the mtime and size of every file, so later
+    updates only re-read files that changed.
+    """
+
+    def __init__(self, index_path, roots):
+        self.index_path = index_path
+        self.roots = roots
+        self.files = {}
+
+    def load(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index["files"]
+
+    def save(self):
+        with open(self.index_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "roots": self.roots, "files": self.files}, f)
+
+    def update(self):
+        """Rescans changed and new files; returns (scanned, reused, removed) counts."""
+        previous_files = self.load()
+        self.files = {}
+        scanned = reused = 0
+        for root in self.roots:
+            for path in iter_scanned_files(root):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                previous = previous_files.get(path)
+                if previous and (previous["mtime"], previous["size"]) == (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                ):
+                    self.files[path] = {**previous, "root": root}
+                    reused += 1
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    candidates = extract_candidates(f.read())
+                self.files[path] = {
+                    "root": root,
+                    "mtime": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "candidates": candidates,
+                }
+                scanned += 1
+        self.save()
+        return scanned, reused, len(previous_files.keys() - self.files.keys())
+
+    def get_used_classes(self, css_classes):
+        """Returns a {path: classes of `css_classes` the file uses} dict of files using any."""
+        used = {}
+        for path, entry in self.files.items():
+            if classes := css_classes.intersection(entry["candidates"]):
+                used[path] = classes
+        return used
+
+    def get_class_files(self, css_classes):
+        """Returns a {class: sorted paths of the files using it} dict for `css_classes`."""
+        class_files = {css_class: [] for css_class in css_classes}
+        for path, entry in sorted(self.files.items()):
+            for css_class in css_classes.intersection(entry["candidates"]):
+                class_files[css_class].append(path)
+        return class_files
+
+    def get_hot_files(self, css_classes, limit=10):
+        """Returns (path, class count) pairs of the files using the most classes."""
+        used = self.get_used_classes(css_classes)
+        return sorted(
+            ((path, len(classes)) for path, classes in used.items()),
+            key=lambda item: (-item[1], item[0]),
+        )[:limit]
+
+    def get_unused_classes(self, css_classes):
+        """Returns the classes of the stylesheet no indexed file mentions."""
+        candidates = set()
+        for entry in self.files.values():
+            candidates.update(entry["candidates"])
+        return css_classes - candidates
+
+    def get_source_globs(self, base_dir, css_classes=None):
+        """
+        Returns `@source` globs, relative to `base_dir`, covering only the roots
+        and file extensions that contain classes: of `css_classes` if given, or
+        any candidate otherwise.
+        """
+        extensions_by_root = {}
+        for path, entry in self.files.items():
+            if css_classes is None:
+                uses_classes = bool(entry["candidates"])
+            else:
+                uses_classes = not css_classes.isdisjoint(entry["candidates"])
+            if uses_classes:
+                extension = os.path.splitext(path)[1].lstrip(".")
+                extensions_by_root.setdefault(entry["root"], set()).add(extension)
+
+        globs = []
+        for root, extensions in sorted(extensions_by_root.items()):
+            relative_root = os.path.relpath(root, base_dir).replace(os.sep, "/")
+            pattern = (
+                f"{{{','.join(sorted(extensions))}}}" if len(extensions) > 1 else extensions.pop()
+            )
+            globs.append(f"{relative_root}/**/*.{pattern}")
+        return globs
@@ -0,0 +1,253 @@
+import os
+import re
+
+# `@source "../templates";` and `@source not "../legacy/**";` in Tailwind v4 stylesheets
+SOURCE_DIRECTIVE_RE = re.compile(r"""@source\s+(not\s+)?(["'])(.+?)\2\s*;""")
+# `@import "./sources.css";` of a local stylesheet
+LOCAL_IMPORT_RE = re.compile(r"""@import\s+(["'])(\.{1,2}/[^"']+\.css)\1""")
+# `content: [...]` in Tailwind v3 configs
+CONTENT_ARRAY_RE = re.compile(r"content\s*:\s*\[(.*?)\]", re.DOTALL)
+JS_STRING_RE = re.compile(r"""(["'])(.+?)\1""")
+# Quoted strings are matched first, so comment markers inside globs like
+# "../**/*.html" are left alone.
+CSS_COMMENT_RE = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|/\*.*?\*/""", re.DOTALL)
+JS_COMMENT_RE = re.compile(
+    r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|/\*.*?\*/|//[^\n]*""", re.DOTALL
+)
+
+GLOB_CHARS = "*?[{"
+
+GENERATED_SOURCES_FILE_NAME = "sources.css"
+GENERATED_SOURCES_HEADER = (
+    "/* Generated from INSTALLED_APPS, TEMPLATES and STATICFILES_DIRS by "
+    "`python manage.py tailwind build/start`, don't edit. */"
+)
+
+# Directories Tailwind never finds classes in; pruned while walking.
+IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "node_modules",
+    "venv",
+}
+
+
+def strip_comments(comment_re, contents):
+    return comment_re.sub(lambda match: match.group(1) or "", contents)
+
+
+def parse_source_globs(styles_css_path, _seen=None):
+    """
+    Returns (includes, excludes) lists of the `@source` globs declared in a
+    Tailwind v4 stylesheet and the local stylesheets it imports, relative to
+    the stylesheet's directory.
+    """
+    with open(styles_css_path) as f:
+        contents = strip_comments(CSS_COMMENT_RE, f.read())
+
+    includes, excludes = [], []
+    for match in SOURCE_DIRECTIVE_RE.finditer(contents):
+        (excludes if match.group(1) else includes).append(match.group(3))
+
+    seen = _seen or {os.path.abspath(styles_css_path)}
+    base_dir = os.path.dirname(styles_css_path)
+    for match in LOCAL_IMPORT_RE.finditer(contents):
+        imported_path = os.path.abspath(os.path.join(base_dir, match.group(2)))
+        if imported_path in seen or not os.path.isfile(imported_path):
+            continue
+        seen.add(imported_path)
+        relative_dir = os.path.relpath(os.path.dirname(imported_path), os.path.abspath(base_dir))
+        imported_includes, imported_excludes = parse_source_globs(imported_path, seen)
+        includes += [os.path.join(relative_dir, glob) for glob in imported_includes]
+        excludes += [os.path.join(relative_dir, glob) for glob in imported_excludes]
+    return includes, excludes
+
+
+def write_generated_sources(styles_dir, source_dirs):
+    """
+    Writes `@source` directives for `source_dirs`, (directory, extension)
+    pairs, to GENERATED_SOURCES_FILE_NAME in `styles_dir`. The file is only
+    rewritten when its contents change, so watchers don't rebuild for nothing.
+    Returns (path, changed).
+    """
+    lines = [GENERATED_SOURCES_HEADER]
+    for directory, extension in source_dirs:
+        glob = os.path.relpath(directory, styles_dir).replace(os.sep, "/")
+        if extension:
+            glob += f"/**/*.{extension}"
+        lines.append(f'@source "{glob}";')
+    contents = "\n".join(lines) + "\n"
+
+    path = os.path.join(styles_dir, GENERATED_SOURCES_FILE_NAME)
+    try:
+        with open(path) as f:
+            if f.read() == contents:
+                return path, False
+    except OSError:
+        pass
+    with open(path, "w") as f:
+        f.write(contents)
+    return path, True
+
+
+def imports_generated_sources(styles_css_path):
+    with open(styles_css_path) as f:
+        contents = strip_comments(CSS_COMMENT_RE, f.read())
+    return any(
+        os.path.basename(match.group(2)) == GENERATED_SOURCES_FILE_NAME
+        for match in LOCAL_IMPORT_RE.finditer(contents)
+    )
+
+
+def parse_content_globs(tailwind_config_path):
+    """
+    Returns (includes, excludes) lists of the `content` globs declared in a
+    Tailwind v3 config, relative to the config's directory.
+    """
+    with open(tailwind_config_path) as f:
+        contents = strip_comments(JS_COMMENT_RE, f.read())
+
+    includes, excludes = [], []
+    match = CONTENT_ARRAY_RE.search(contents)
+    for string_match in JS_STRING_RE.finditer(match.group(1) if match else ""):
+        glob = string_match.group(2)
+        if glob.startswith("!"):
+            excludes.append(glob[1:])
+        else:
+            includes.append(glob)
+    return includes, excludes
+
+
+def get_source_globs(tailwind_src_path):
+    """
+    Returns (includes, excludes) lists of absolute globs Tailwind scans for
+    class names, read from `src/styles.css` (v4) or `tailwind.config.js` (v3).
+    """
+    styles_css_path = os.path.join(tailwind_src_path, "src", "styles.css")
+    includes, excludes = [], []
+    base_dir = tailwind_src_path
+    if os.path.isfile(styles_css_path):
+        includes, excludes = parse_source_globs(styles_css_path)
+        base_dir = os.path.dirname(styles_css_path)
+
+    tailwind_config_path = os.path.join(tailwind_src_path, "tailwind.config.js")
+    if not includes and os.path.isfile(tailwind_config_path):
+        includes, excludes = parse_content_globs(tailwind_config_path)
+        base_dir = tailwind_src_path
+
+    return (
+        [resolve_glob(base_dir, glob) for glob in includes],
+        [resolve_glob(base_dir, glob) for glob in excludes],
+    )
+
+
+def resolve_glob(base_dir, glob):
+    glob = os.path.normpath(os.path.join(base_dir, glob)).replace(os.sep, "/")
+    if not has_glob_chars(glob) and os.path.isdir(glob):
+        # a bare directory means "everything in it"
+        glob = f"{glob}/**/*"
+    return glob
+
+
+def has_glob_chars(path):
+    return any(char in path for char in GLOB_CHARS)
+
+
+def expand_braces(glob):
+    """*.{html,py} -> [*.html, *.py]"""
+    match = re.search(r"\{([^{}]*)\}", glob)
+    if not match:
+        return [glob]
+    expanded = []
+    for option in match.group(1).split(","):
+        expanded += expand_braces(glob[: match.start()] + option + glob[match.end() :])
+    return expanded
+
+
+def glob_to_regex(glob):
+    regex = ""
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif glob.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif glob[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif glob[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i:]:
+            end = glob.index("]", i)
+            char_class = glob[i : end + 1]
+            if char_class.startswith("[!"):
+                char_class = "[^" + char_class[2:]
+            regex += char_class
+            i = end + 1
+        else:
+            regex += re.escape(glob[i])
+            i += 1
+    return re.compile(f"^{regex}$")
+
+
+def compile_globs(globs):
+    """Returns the regexes matching the paths `globs` match, braces expanded."""
+    return [glob_to_regex(pattern) for glob in globs for pattern in expand_braces(glob)]
+
+
+def get_glob_base(glob):
+    """Returns the longest leading directory of `glob` without glob characters."""
+    parts = glob.split("/")
+    for index, part in enumerate(parts):
+        if has_glob_chars(part):
+            return "/".join(parts[:index]) or "/"
+    return os.path.dirname(glob)
+
+
+def iter_source_files(includes, excludes=()):
+    """
+    Yields absolute paths of existing files matched by the `includes` globs
+    and none of the `excludes` globs, pruning IGNORED_DIRS and virtualenvs.
+    Every file is yielded once, even if several globs match it.
+    """
+    exclude_regexes = compile_globs(excludes)
+    patterns_by_base = {}
+    for glob in includes:
+        for pattern in expand_braces(glob):
+            patterns_by_base.setdefault(get_glob_base(pattern), []).append(glob_to_regex(pattern))
+
+    seen = set()
+    for base, regexes in patterns_by_base.items():
+        for file_path in walk_files(base):
+            posix_path = file_path.replace(os.sep, "/")
+            if posix_path in seen:
+                continue
+            if any(r.match(posix_path) for r in regexes) and not any(
+                r.match(posix_path) for r in exclude_regexes
+            ):
+                seen.add(posix_path)
+                yield file_path
+
+
+def walk_files(base):
+    if os.path.isfile(base):
+        yield base
+        return
+    for dir_path, dir_names, file_names in os.walk(base):
+        dir_names[:] = sorted(
+            name
+            for name in dir_names
+            if name not in IGNORED_DIRS
+            and not os.path.isfile(os.path.join(dir_path, name, "pyvenv.cfg"))
+        )
+        for file_name in sorted(file_names):
+            yield os.path.join(dir_path, file_name)
@@ -0,0 +1,316 @@
+import codecs
+import contextlib
+import dataclasses
+import itertools
+import json
+import os
+import re
+import time
+
+from .compress import get_stream_compressors
+from .sources import get_source_globs
+from .sources import iter_source_files
+
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+# the prelude of every block: a selector list or an at-rule
+CSS_BLOCK_RE = re.compile(r"([^{};]*)\{")
+# Comments, strings, punctuation and runs of anything else, with backslash escapes;
+# a `/` only starts a comment with `*`
+CSS_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>/\*.*?\*/)
+    |(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+    |(?P<punct>[{};])
+    |(?P<text>(?:\\.|[^{};"'/\\])+|/)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+# The first class of a selector, e.g. `md:flex` in `.md\:flex:hover`
+CSS_CLASS_RE = re.compile(r"\.((?:\\.|[\w-])+)")
+CHUNK_SIZE = 64 * 1024
+
+
+def count_css_rules(css):
+    """Counts style rules, i.e. blocks that aren't at-rules like @media or @layer."""
+    return sum(
+        1
+        for match in CSS_BLOCK_RE.finditer(CSS_COMMENT_RE.sub("", css))
+        if not match.group(1).strip().startswith("@")
+    )
+
+
+class AppStats:
+    def __init__(self):
+        self.phases = {}
+        self.cached = False
+        self.css_size = None
+        self.css_rules = None
+        self.source_files = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0) + seconds
+
+    def record_output(self, output_path, tailwind_src_path):
+        if os.path.isfile(output_path):
+            with open(output_path, encoding="utf-8", errors="replace") as f:
+                css = f.read()
+            self.css_size = os.path.getsize(output_path)
+            self.css_rules = count_css_rules(css)
+        # the build cache already counted them while fingerprinting the inputs
+        if self.source_files is None:
+            self.source_files = sum(
+                1 for _ in iter_source_files(*get_source_globs(tailwind_src_path))
+            )
+
+    def as_dict(self):
+        return {
+            "cached": self.cached,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "css_size": self.css_size,
+            "css_rules": self.css_rules,
+            "source_files": self.source_files,
+        }
+
+
+class BuildStats:
+    """
+    Wall-clock timings of the phases of `tailwind build`/`install` and the
+    resulting stylesheet size, rule count and number of scanned source files,
+    per app. Phases that run concurrently for several apps share their
+    wall-clock time.
+    """
+
+    def __init__(self, command):
+        self.command = command
+        self.started = time.perf_counter()
+        self.apps = {}
+
+    def app(self, app_name):
+        return self.apps.setdefault(app_name, AppStats())
+
+    def as_dict(self):
+        return {
+            "command": self.command,
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "apps": {name: app.as_dict() for name, app in self.apps.items()},
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def format_summary(self):
+        stats = self.as_dict()
+        lines = []
+        for app_name, app in stats["apps"].items():
+            phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in app["phases"].items())
+            line = f"{app_name}: {phases or 'no phases run'}"
+            if app["cached"]:
+                line += " (restored from build cache)"
+            if app["css_size"] is not None:
+                line += f"; {app['css_size']:,} bytes, {app['css_rules']:,} rules"
+            if app["source_files"] is not None:
+                line += f", {app['source_files']:,} source files"
+            lines.append(line)
+        lines.append(f"Total: {stats['total_seconds']:.2f}s")
+        return lines
+
+
+def iter_css_tokens(chunks):
+    """
+    Yields the tokens of a stylesheet given as an iterable of text chunks:
+    `{`, `}`, `;` and the text in between, with comments dropped. The text
+    between two punctuation tokens may come in several pieces; comments and
+    strings that continue in the next chunk are held back until it arrives.
+    """
+    rest = ""
+    for chunk in itertools.chain(chunks, [None]):
+        at_end = chunk is None
+        text = rest + (chunk or "")
+        pos = 0
+        while pos < len(text):
+            match = CSS_TOKEN_RE.match(text, pos)
+            if match is None or (match.group() == "/" and text.startswith("/*", pos)):
+                # an unterminated string or comment
+                if not at_end:
+                    break
+                if match is None:
+                    yield text[pos:]
+                pos = len(text)
+                break
+            if match.end() == len(text) and not at_end:
+                break
+            if match.lastgroup != "comment":
+                yield match.group()
+            pos = match.end()
+        rest = text[pos:]
+
+
+def iter_file_chunks(path, on_data=None):
+    """Yields the text of a UTF-8 file in chunks, passing each raw chunk to `on_data`."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+            if on_data:
+                on_data(data)
+            yield decoder.decode(data)
+    yield decoder.decode(b"", final=True)
+
+
+def get_first_class(selector):
+    match = CSS_CLASS_RE.search(selector)
+    return re.sub(r"\\(.)", r"\1", match.group(1)) if match else None
+
+
+def get_largest(sizes, limit):
+    return sorted(sizes.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+@dataclasses.dataclass
+class CSSBlock:
+    prelude: str
+    size: int
+    # the selector of the outermost style rule around this block
+    rule: str | None = None
+
+
+class CSSBundleStats:
+    """
+    A breakdown of a compiled stylesheet: its raw and compressed sizes, the
+    number of style rules, layers and custom properties, and the bytes taken
+    by each selector, media query and utility class.
+
+    The stylesheet is read in chunks through a streaming tokenizer, so only
+    the block nesting and the totals are held in memory. A utility is the
+    first class of a top-level style rule, and is charged for the rule's
+    bytes including nested blocks such as Tailwind v4's `@media`.
+    """
+
+    def __init__(self):
+        self.size = 0
+        # encoding -> compressed size
+        self.compressed_sizes = {}
+        self.rules = 0
+        self.layer_sizes = {}
+        self.custom_properties = set()
+        self.custom_property_declarations = 0
+        self.selector_sizes = {}
+        self.media_sizes = {}
+        self.utility_sizes = {}
+
+    @classmethod
+    def from_file(cls, path):
+        stats = cls()
+        compressors = get_stream_compressors()
+
+        def on_data(data):
+            stats.size += len(data)
+            for compressor in compressors:
+                compressor.update(data)
+
+        stats.analyze(iter_file_chunks(path, on_data))
+        for compressor in compressors:
+            stats.compressed_sizes[compressor.encoding] = compressor.finish()
+        return stats
+
+    def analyze(self, chunks):
+        stack = []
+        text = []
+        for token in iter_css_tokens(chunks):
+            if token not in ("{", "}", ";"):
+                text.append(token)
+                continue
+
+            content = "".join(text)
+            text = []
+            size = len(content.encode()) + 1
+            if token == "{":
+                prelude = " ".join(content.split())
+                parent = stack[-1] if stack else None
+                rule = parent.rule if parent else None
+                if rule is None and self.is_style_rule(prelude, parent):
+                    rule = prelude
+                stack.append(CSSBlock(prelude, size, rule))
+                continue
+
+            if content.strip():
+                self.add_statement(content.strip())
+            if not stack:
+                continue
+            stack[-1].size += size
+            if token == "}":
+                block = stack.pop()
+                self.add_block(block, stack[-1] if stack else None)
+                if stack:
+                    stack[-1].size += block.size
+
+    def is_style_rule(self, prelude, parent):
+        if prelude.startswith("@"):
+            return False
+        # `from`, `to` and percentages of @keyframes aren't style rules
+        return not (parent and parent.prelude.startswith(("@keyframes", "@-webkit-keyframes")))
+
+    def add_statement(self, statement):
+        if statement.startswith("--"):
+            self.custom_properties.add(statement.split(":", 1)[0].strip())
+            self.custom_property_declarations += 1
+        elif statement.startswith("@layer"):
+            # `@layer theme, base, components, utilities;` declares the layer order
+            for name in statement[len("@layer") :].split(","):
+                self.layer_sizes.setdefault(name.strip(), 0)
+
+    def add_block(self, block, parent):
+        prelude = block.prelude
+        if prelude.startswith("@media"):
+            query = prelude[len("@media") :].strip()
+            self.media_sizes[query] = self.media_sizes.get(query, 0) + block.size
+        elif prelude.startswith("@layer"):
+            name = prelude[len("@layer") :].strip()
+            self.layer_sizes[name] = self.layer_sizes.get(name, 0) + block.size
+        elif prelude.startswith("@property"):
+            self.custom_properties.add(prelude[len("@property") :].strip())
+        elif self.is_style_rule(prelude, parent):
+            self.rules += 1
+            self.selector_sizes[prelude] = self.selector_sizes.get(prelude, 0) + block.size
+            if (
+                block.rule == prelude
+                and (parent is None or parent.rule is None)
+                and (utility := get_first_class(prelude))
+            ):
+                self.utility_sizes[utility] = self.utility_sizes.get(utility, 0) + block.size
+
+    def as_dict(self, top=10, class_files=None):
+        """
+        The stats with the `top` largest selectors, media queries and utilities;
+        `class_files`, a {class: paths} dict, lists the files using each utility.
+        """
+        utilities = []
+        for name, size in get_largest(self.utility_sizes, top):
+            utility = {"class": name, "size": size}
+            if class_files is not None:
+                utility["files"] = class_files.get(name, [])
+            utilities.append(utility)
+        return {
+            "size": self.size,
+            "compressed_sizes": self.compressed_sizes,
+            "rules": self.rules,
+            "layers": self.layer_sizes,
+            "custom_properties": len(self.custom_properties),
+            "custom_property_declarations": self.custom_property_declarations,
+            "largest_selectors": [
+                {"selector": selector, "size": size}
+                for selector, size in get_largest(self.selector_sizes, top)
+            ],
+            "largest_media_queries": [
+                {"query": query, "size": size} for query, size in get_largest(self.media_sizes, top)
+            ],
+            "largest_utilities": utilities,
+        }
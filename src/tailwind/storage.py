@@ -0,0 +1,73 @@
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from tailwind import get_settings
+
+from .compress import compress_file
+from .project import TailwindProject
+
+
+class TailwindStaticFilesMixin:
+    """
+    Builds the Tailwind apps when `collectstatic` post-processes the collected
+    files, so a deployment runs one command instead of `tailwind build` followed
+    by `collectstatic`.
+
+    The build goes through `tailwind build`, so the build cache skips it when
+    nothing changed. The stylesheets are then written straight into STATIC_ROOT,
+    handed to the storage's own post-processing (e.g. hashed file names) and
+    precompressed there if TAILWIND_PRECOMPRESS is set.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        stylesheets = {} if dry_run else self.build_tailwind(paths)
+
+        parent = getattr(super(), "post_process", None)
+        if parent is None:
+            yield from ((path, path, True) for path in stylesheets)
+        else:
+            yield from parent(paths, dry_run=dry_run, **options)
+
+        if stylesheets and get_settings().precompress:
+            for path in stylesheets:
+                compress_file(self.path(self.get_processed_name(path)))
+
+    def build_tailwind(self, paths):
+        """
+        Builds every app of TAILWIND_APP_NAME, copies each stylesheet into this
+        storage and points `paths` at the fresh output. Returns the static
+        paths of the stylesheets.
+        """
+        from django.core.management import call_command
+
+        call_command("tailwind", "build")
+
+        stylesheets = []
+        for app_name in get_settings().app_names:
+            project = TailwindProject.resolve(app_name)
+            if not os.path.isfile(project.css_output_path):
+                continue
+            path = project.static_css_path
+            if self.exists(path):
+                self.delete(path)
+            with open(project.css_output_path, "rb") as f:
+                self._save(path, File(f))
+            paths[path] = (FileSystemStorage(location=project.static_dir), path)
+            stylesheets.append(path)
+        return stylesheets
+
+    def get_processed_name(self, path):
+        # the hashed name, for storages that hash file names
+        return self.stored_name(path) if hasattr(self, "stored_name") else path
+
+
+class TailwindStaticFilesStorage(TailwindStaticFilesMixin, StaticFilesStorage):
+    pass
+
+
+class TailwindManifestStaticFilesStorage(TailwindStaticFilesMixin, ManifestStaticFilesStorage):
+    pass
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import re
+import signal
+import subprocess
+import time
+
+# `name: command` lines; comments and blank lines don't match
+PROCFILE_LINE_RE = re.compile(r"^([A-Za-z0-9_-]+):\s*(.+)$")
+
+# cyan, yellow, green, magenta, blue, red
+COLORS = ("36", "33", "32", "35", "34", "31")
+
+# Longest output line read from a process
+LINE_LIMIT = 1024 * 1024
+
+
+def parse_procfile(path):
+    """Returns a {process name: shell command} dict of the Procfile at `path`."""
+    commands = {}
+    with open(path) as f:
+        for line in f:
+            if match := PROCFILE_LINE_RE.match(line.strip()):
+                commands[match.group(1)] = match.group(2).strip()
+    return commands
+
+
+class Supervisor:
+    """
+    Runs shell commands side by side in the current interpreter, like
+    `honcho start`. Output lines are prefixed with the time and the process
+    name, SIGINT and SIGTERM stop every process, and a process that exits with
+    an error is restarted after a delay that doubles with every crash in a row.
+    """
+
+    def __init__(
+        self,
+        commands,
+        write,
+        colorize=False,
+        restart_delay=1.0,
+        max_restart_delay=30.0,
+        stable_after=10.0,
+        stop_timeout=5.0,
+    ):
+        self.commands = commands
+        self.write = write
+        self.colorize = colorize
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        # a process that ran this long before crashing is restarted without backoff
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self.width = max((len(name) for name in commands), default=0)
+        self.colors = {name: COLORS[i % len(COLORS)] for i, name in enumerate(commands)}
+        self.stopping = None
+
+    def run(self):
+        """Runs until every process has exited cleanly or a stop signal arrives."""
+        asyncio.run(self.supervise())
+
+    def stop(self):
+        self.stopping.set()
+
+    async def supervise(self):
+        self.stopping = asyncio.Event()
+        if os.name != "nt":
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, self.stop)
+        try:
+            await asyncio.gather(
+                *(self.keep_running(name, command) for name, command in self.commands.items())
+            )
+        finally:
+            if os.name != "nt":
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    loop.remove_signal_handler(signum)
+
+    async def keep_running(self, name, command):
+        delay = self.restart_delay
+        while True:
+            started = time.monotonic()
+            exit_code = await self.run_process(name, command)
+            if self.stopping.is_set() or exit_code == 0:
+                return exit_code
+
+            if time.monotonic() - started >= self.stable_after:
+                delay = self.restart_delay
+            self.output(name, f"exited with code {exit_code}, restarting in {delay:g}s")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), delay)
+                return exit_code
+            except TimeoutError:
+                delay = min(delay * 2, self.max_restart_delay)
+
+    async def run_process(self, name, command):
+        if os.name == "nt":
+            kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            # its own process group, so signals reach the shell and everything it started
+            kwargs = {"start_new_session": True}
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                # stdin stays open: Tailwind's --watch exits as soon as its stdin is closed
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env={**os.environ, "PYTHONUNBUFFERED": "1"},
+                limit=LINE_LIMIT,
+                **kwargs,
+            )
+        except OSError as err:
+            self.output(name, f"failed to start: {err}")
+            return 127
+
+        self.output(name, f"started with pid {process.pid}")
+        reader = asyncio.create_task(self.read_output(name, process))
+        stopper = asyncio.create_task(self.stopping.wait())
+        try:
+            await asyncio.wait({reader, stopper}, return_when=asyncio.FIRST_COMPLETED)
+            if not reader.done():
+                await self.terminate(process)
+            await reader
+            exit_code = await process.wait()
+        except asyncio.CancelledError:
+            # asyncio.run() cancels the tasks on Ctrl+C where signal handlers aren't available
+            await self.terminate(process)
+            raise
+        finally:
+            stopper.cancel()
+        if self.stopping.is_set():
+            self.output(name, "stopped")
+        return exit_code
+
+    async def read_output(self, name, process):
+        async for line in process.stdout:
+            self.output(name, line.decode(errors="replace").rstrip())
+
+    async def terminate(self, process):
+        self.send_signal(process)
+        try:
+            await asyncio.wait_for(process.wait(), self.stop_timeout)
+        except TimeoutError:
+            self.send_signal(process, kill=True)
+            await process.wait()
+
+    def send_signal(self, process, kill=False):
+        if process.returncode is not None:
+            return
+        try:
+            if os.name != "nt":
+                os.killpg(process.pid, signal.SIGKILL if kill else signal.SIGTERM)
+            elif kill:
+                process.kill()
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            pass
+
+    def output(self, name, line):
+        prefix = f"{time.strftime('%H:%M:%S')} {name.ljust(self.width)} |"
+        if self.colorize:
+            prefix = f"\x1b[{self.colors[name]}m{prefix}\x1b[0m"
+        self.write(f"{prefix} {line}")
@@ -1,33 +1,163 @@
-import time
+import functools
 
 from django import template
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+from django.urls import NoReverseMatch
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.safestring import mark_safe
 
-from tailwind import get_config
+from tailwind import get_settings
 
+from ..inline import get_inline_css
+from ..manifest import get_dev_version
+from ..manifest import read_manifest
+from ..manifest import VERSIONING_FILENAME
+from ..project import TailwindProject
 from ..utils import is_path_absolute
 
 register = template.Library()
 
+CSS_TEMPLATE_NAME = "tailwind/tags/css.html"
+PRELOAD_CSS_TEMPLATE_NAME = "tailwind/tags/preload_css.html"
+LIVE_RELOAD_TEMPLATE_NAME = "tailwind/tags/live_reload.html"
 
-@register.inclusion_tag("tailwind/tags/css.html")
-def tailwind_css(v=None):
-    if v is None and settings.DEBUG:
-        # append a time-based suffix to force reload of css in dev mode
-        v = int(time.time())
 
-    return {
-        "dev_mode": get_config("TAILWIND_DEV_MODE"),
-        "v": v,
-        "tailwind_css_path": get_config("TAILWIND_CSS_PATH"),
-        "is_static_path": not is_path_absolute(get_config("TAILWIND_CSS_PATH")),
-    }
+@functools.cache
+def get_app_css_path(app_name):
+    """The static path of the stylesheet of the Tailwind app `app_name`, resolved once."""
+    return TailwindProject.resolve(app_name).static_css_path
 
 
-@register.inclusion_tag("tailwind/tags/preload_css.html")
-def tailwind_preload_css(v=None):
-    return {
-        "v": v,
-        "tailwind_css_path": get_config("TAILWIND_CSS_PATH"),
-        "is_static_path": not is_path_absolute(get_config("TAILWIND_CSS_PATH")),
-    }
+def get_css_path(app=None):
+    """The static path of the stylesheet of `app`, or TAILWIND_CSS_PATH if no app is given."""
+    return get_app_css_path(app) if app else get_settings().css_path
+
+
+def get_versioned_css_path(v, dev_version=True, app=None):
+    """
+    Returns the (css_path, v) pair to render. When no explicit version is
+    given, DEBUG uses a suffix that changes whenever the stylesheet is rebuilt
+    and production uses the content hash recorded by `tailwind build`, if
+    TAILWIND_CSS_VERSIONING is set.
+    """
+    tailwind_settings = get_settings()
+    tailwind_css_path = get_css_path(app)
+    if v is not None or is_path_absolute(tailwind_css_path):
+        return tailwind_css_path, v
+
+    if settings.DEBUG:
+        if not dev_version:
+            return tailwind_css_path, None
+        # append a suffix that changes on every rebuild to force reload of css in dev mode
+        return tailwind_css_path, get_dev_version(tailwind_css_path)
+
+    versioning = tailwind_settings.css_versioning
+    manifest = read_manifest(tailwind_css_path) if versioning else None
+    if manifest is None:
+        return tailwind_css_path, None
+    if versioning == VERSIONING_FILENAME:
+        return manifest["hashed_path"], None
+    return tailwind_css_path, manifest["hash"]
+
+
+def render_tag(engine, template_name, tailwind_css_path, v, autoescape):
+    return engine.get_template(template_name).render(
+        template.Context(
+            {
+                "dev_mode": get_settings().dev_mode,
+                "v": v,
+                "tailwind_css_path": tailwind_css_path,
+                "is_static_path": not is_path_absolute(tailwind_css_path),
+            },
+            autoescape=autoescape,
+        )
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def render_tag_cached(engine, template_name, tailwind_css_path, v, autoescape):
+    """
+    In production the rendered <link> only depends on the arguments, so it's
+    rendered once per process instead of going through the template loader
+    and the static files storage on every page view.
+    """
+    return render_tag(engine, template_name, tailwind_css_path, v, autoescape)
+
+
+@receiver(setting_changed)
+def clear_rendered_tags(**kwargs):
+    render_tag_cached.cache_clear()
+    get_app_css_path.cache_clear()
+
+
+def render_css_tag(context, template_name, tailwind_css_path, v):
+    args = (context.template.engine, template_name, tailwind_css_path, v, context.autoescape)
+    if settings.DEBUG:
+        return render_tag(*args)
+    try:
+        return render_tag_cached(*args)
+    except TypeError:
+        # unhashable version argument, nothing to cache by
+        return render_tag(*args)
+
+
+def render_live_reload_script(context, tailwind_css_path):
+    """
+    Returns a script that swaps the stylesheet whenever it's rebuilt, if
+    TAILWIND_LIVE_RELOAD and DEBUG are on and tailwind.urls is included.
+    """
+    if not settings.DEBUG or not get_settings().live_reload:
+        return ""
+    if is_path_absolute(tailwind_css_path):
+        return ""
+    try:
+        live_reload_url = reverse("tailwind:live_reload")
+    except NoReverseMatch:
+        return ""
+    if tailwind_css_path != get_settings().css_path:
+        live_reload_url += f"?{urlencode({'path': tailwind_css_path})}"
+    return context.template.engine.get_template(LIVE_RELOAD_TEMPLATE_NAME).render(
+        template.Context(
+            {"live_reload_url": live_reload_url, "css_url": static(tailwind_css_path)},
+            autoescape=context.autoescape,
+        )
+    )
+
+
+@register.simple_tag(takes_context=True)
+def tailwind_css(context, v=None, app=None):
+    tailwind_css_path, v = get_versioned_css_path(v, app=app)
+    tag = render_css_tag(context, CSS_TEMPLATE_NAME, tailwind_css_path, v)
+    if script := render_live_reload_script(context, tailwind_css_path):
+        return mark_safe(tag + script)
+    return tag
+
+
+@register.simple_tag(takes_context=True)
+def tailwind_preload_css(context, v=None, app=None):
+    tailwind_css_path, v = get_versioned_css_path(v, dev_version=False, app=app)
+    return render_css_tag(context, PRELOAD_CSS_TEMPLATE_NAME, tailwind_css_path, v)
+
+
+@register.simple_tag(takes_context=True)
+def tailwind_inline_css(context, path=None, v=None, app=None):
+    """
+    Embeds the compiled stylesheet of `app`, or the critical subset at `path`,
+    in a <style> block. Falls back to the regular <link> tag when the file
+    can't be found or is larger than TAILWIND_INLINE_CSS_MAX_SIZE.
+    """
+    tailwind_settings = get_settings()
+    static_path = path or get_css_path(app)
+    css = None
+    if not is_path_absolute(static_path):
+        css = get_inline_css(static_path, tailwind_settings.inline_css_max_size)
+    if css is None:
+        return tailwind_css(context, v=v, app=app)
+
+    # a literal "</style" would close the block early
+    css = css.replace("</style", "<\\/style")
+    return mark_safe(f"<style>{css}</style>")
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = "tailwind"
+
+urlpatterns = [
+    path("live-reload/", views.live_reload, name="live_reload"),
+]
@@ -1,10 +1,13 @@
-import json
 import os
 import re
+import shlex
 
 from django.apps import apps
+from django.conf import settings
 
 DJANGO_TAILWIND_APP_DIR = os.path.dirname(__file__)
+# `npm run build:tailwind` and the like, in package.json scripts
+RUN_SCRIPT_RE = re.compile(r"\b(?:npm|pnpm|yarn|bun) run ([\w:.-]+)")
 
 
 def get_app_path(app_name):
@@ -12,17 +15,105 @@ def get_app_path(app_name):
     return apps.get_app_config(app_label).path
 
 
-def get_tailwind_src_path(app_name):
-    return os.path.join(get_app_path(app_name), "static_src")
+def get_output_arg(args):
+    args = shlex.split(args)
+    for index, arg in enumerate(args):
+        if arg in ("-o", "--output") and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith("--output="):
+            return arg.split("=", 1)[1]
+    return None
 
 
-def get_package_json_path(app_name):
-    return os.path.join(get_app_path(app_name), "static_src", "package.json")
+def get_script_output_arg(scripts, name, _seen=None):
+    """
+    Returns the `-o` argument of the package.json script `name`, following the
+    scripts it runs, e.g. `npm run build:clean && npm run build:tailwind`.
+    """
+    seen = _seen or {name}
+    script = scripts.get(name, "")
+    try:
+        output = get_output_arg(script)
+    except ValueError:
+        output = None
+    if output is not None:
+        return output
+    for referenced in RUN_SCRIPT_RE.findall(script):
+        if referenced not in seen:
+            seen.add(referenced)
+            if output := get_script_output_arg(scripts, referenced, seen):
+                return output
+    return None
+
+
+def replace_output_arg(args, output):
+    """Returns the standalone binary `args` with the `-o` argument set to `output`."""
+    args = shlex.split(args)
+    for index, arg in enumerate(args):
+        if arg in ("-o", "--output") and index + 1 < len(args):
+            args[index + 1] = output
+            break
+        if arg.startswith("--output="):
+            args[index] = f"--output={output}"
+            break
+    else:
+        args += ["-o", output]
+    return shlex.join(args)
+
+
+def remove_watch_args(args):
+    """Returns the standalone binary `args` without the `--watch` and `--poll` flags."""
+    return shlex.join(
+        arg
+        for arg in shlex.split(args)
+        if arg not in ("-w", "--watch", "-p", "--poll") and not arg.startswith("--watch=")
+    )
 
 
-def get_package_json_contents(app_name):
-    with open(get_package_json_path(app_name)) as f:
-        return json.load(f)
+def is_project_path(path):
+    """Whether `path` belongs to the project rather than an installed package."""
+    if "site-packages" in path or "dist-packages" in path:
+        return False
+    base_dir = getattr(settings, "BASE_DIR", None)
+    if base_dir is None:
+        return True
+    base_dir = os.path.abspath(base_dir)
+    path = os.path.abspath(path)
+    return path == base_dir or path.startswith(base_dir + os.sep)
+
+
+def get_project_source_dirs():
+    """
+    Returns (directory, extension) pairs of the places classes are used in:
+    the templates and static directories of every project app in
+    INSTALLED_APPS, TEMPLATES' DIRS and STATICFILES_DIRS. An extension of None
+    means every file of the directory. Only static JavaScript files are used.
+    """
+    from django.template import engines
+
+    source_dirs = []
+    for app_config in apps.get_app_configs():
+        if is_project_path(app_config.path):
+            source_dirs.append((os.path.join(app_config.path, "templates"), None))
+            source_dirs.append((os.path.join(app_config.path, "static"), "js"))
+    for engine in engines.all():
+        source_dirs.extend((str(directory), None) for directory in engine.dirs)
+    for directory in getattr(settings, "STATICFILES_DIRS", ()):
+        # entries may be (prefix, path) tuples
+        directory = directory[1] if isinstance(directory, (list, tuple)) else directory
+        source_dirs.append((str(directory), "js"))
+
+    unique = {}
+    for directory, extension in source_dirs:
+        if os.path.isdir(directory):
+            unique.setdefault((os.path.abspath(directory), extension), None)
+    return list(unique)
+
+
+def find_static_file(path):
+    from django.contrib.staticfiles import finders
+
+    return finders.find(path)
 
 
 def is_path_absolute(path):
@@ -1,9 +1,7 @@
-import os
-
 from django.apps import apps
 from django.conf import settings
 
-from .utils import get_tailwind_src_path
+from .project import TailwindProject
 
 
 class ValidationError(Exception):
@@ -16,12 +14,11 @@ class Validations:
             raise ValidationError(f"{app_name} is not in INSTALLED_APPS")
 
     def is_tailwind_app(self, app_name):
-        if not os.path.isfile(
-            os.path.join(get_tailwind_src_path(app_name), "package.json")
-        ) and not os.path.isfile(
-            os.path.join(get_tailwind_src_path(app_name), "src", "styles.css")
-        ):
-            raise ValidationError(f"'{app_name}' isn't a Tailwind app")
+        self.is_tailwind_project(TailwindProject.resolve(app_name))
+
+    def is_tailwind_project(self, project):
+        if not project.is_tailwind_app:
+            raise ValidationError(f"'{project.app_name}' isn't a Tailwind app")
 
     def has_settings(self):
         if not hasattr(settings, "TAILWIND_APP_NAME"):
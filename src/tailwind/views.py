@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.http import Http404
+from django.http import StreamingHttpResponse
+
+from tailwind import get_settings
+
+from .live_reload import get_watcher
+from .project import TailwindProject
+from .utils import find_static_file
+
+# Comment lines sent while the stylesheet is unchanged keep proxies from closing the stream
+KEEPALIVE_INTERVAL = 15
+
+
+def live_reload(request):
+    """
+    A server-sent events stream with a `css` event, carrying the new version,
+    every time the compiled stylesheet changes. Only available when DEBUG is on.
+    """
+    if not settings.DEBUG:
+        raise Http404("Tailwind live reload is only available when DEBUG is True.")
+
+    tailwind_settings = get_settings()
+    css_path = request.GET.get("path") or tailwind_settings.css_path
+    if css_path != tailwind_settings.css_path and css_path not in get_app_css_paths():
+        raise Http404("Unknown Tailwind stylesheet.")
+
+    file_path = find_static_file(css_path)
+    if not file_path:
+        raise Http404("The compiled Tailwind stylesheet could not be found.")
+
+    response = StreamingHttpResponse(
+        stream_changes(get_watcher(file_path)), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # tells nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def get_app_css_paths():
+    """The static paths of the stylesheets of the Tailwind apps, for `?path=`."""
+    css_paths = set()
+    for app_name in get_settings().app_names:
+        try:
+            css_paths.add(TailwindProject.resolve(app_name).static_css_path)
+        except LookupError:
+            continue
+    return css_paths
+
+
+def stream_changes(watcher):
+    version = watcher.version
+    yield "retry: 1000\n\n"
+    while True:
+        new_version = watcher.wait_for_change(version, KEEPALIVE_INTERVAL)
+        if new_version == version:
+            yield ": keepalive\n\n"
+            continue
+        version = new_version
+        if version is not None:
+            yield f"event: css\ndata: {version}\n\n"
@@ -0,0 +1,253 @@
+import contextlib
+import dataclasses
+import os
+import queue
+import threading
+import time
+
+from .build_cache import CONFIG_FILE_NAMES
+from .build_cache import iter_config_files
+from .sources import compile_globs
+from .sources import get_glob_base
+from .sources import get_source_globs
+from .sources import IGNORED_DIRS
+from .sources import iter_source_files
+
+# seconds between two scans of the watched files when watchfiles isn't installed
+POLL_INTERVAL = 1.0
+
+
+def diff_snapshots(old, new):
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+def import_watchfiles():
+    """Returns the `watchfiles` module for native file system events, or None."""
+    try:
+        import watchfiles
+    except ImportError:
+        return None
+    return watchfiles
+
+
+@dataclasses.dataclass
+class WatchedApp:
+    name: str
+    tailwind_src_path: str
+    # the stylesheet and its compressed or hashed copies are left out, so a
+    # build doesn't trigger the next one
+    output_path: str
+    # the (mtime, size) of the files in static_src/src and the config files,
+    # which the source globs are parsed from again whenever it changes
+    config_snapshot: dict = dataclasses.field(default=None, init=False, repr=False)
+    source_globs: tuple = dataclasses.field(default=None, init=False, repr=False)
+    source_regexes: tuple = dataclasses.field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.refresh_source_globs()
+
+    def is_output(self, path):
+        output_dir, output_name = os.path.split(self.output_path)
+        return os.path.dirname(path) == output_dir and os.path.basename(path).startswith(
+            os.path.splitext(output_name)[0]
+        )
+
+    def is_config_path(self, path):
+        if os.path.dirname(path) == self.tailwind_src_path:
+            return os.path.basename(path) in CONFIG_FILE_NAMES
+        return path.startswith(os.path.join(self.tailwind_src_path, "src") + os.sep)
+
+    def is_input(self, path):
+        """Whether a build of the app depends on `path`, judged by its name alone."""
+        if self.is_output(path):
+            return False
+        if self.is_config_path(path):
+            return True
+        posix_path = path.replace(os.sep, "/")
+        if IGNORED_DIRS.intersection(posix_path.split("/")):
+            return False
+        includes, excludes = self.source_regexes
+        return any(r.match(posix_path) for r in includes) and not any(
+            r.match(posix_path) for r in excludes
+        )
+
+    def stat_files(self, paths):
+        files = {}
+        for path in paths:
+            if self.is_output(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def refresh_source_globs(self):
+        """Parses the source globs again if a file they're declared in has changed."""
+        config_snapshot = self.stat_files(iter_config_files(self.tailwind_src_path))
+        if config_snapshot != self.config_snapshot:
+            self.config_snapshot = config_snapshot
+            self.source_globs = get_source_globs(self.tailwind_src_path)
+            self.source_regexes = tuple(compile_globs(globs) for globs in self.source_globs)
+        return config_snapshot
+
+    def snapshot(self):
+        """The (mtime, size) of every file the app's build depends on, by path."""
+        config_snapshot = self.refresh_source_globs()
+        return {**config_snapshot, **self.stat_files(iter_source_files(*self.source_globs))}
+
+    def get_watched_dirs(self):
+        """static_src and the base directory of every source glob."""
+        return {self.tailwind_src_path, *map(get_glob_base, self.source_globs[0])}
+
+
+class FileEvents:
+    """
+    Collects the paths that native file system events report under `dirs`,
+    using `watchfiles` in a background thread.
+    """
+
+    def __init__(self, watchfiles, dirs):
+        self.dirs = dirs
+        self.paths = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.watch, args=(watchfiles,), daemon=True)
+        self.thread.start()
+
+    def watch(self, watchfiles):
+        for changes in watchfiles.watch(
+            *self.dirs, stop_event=self.stop_event, raise_interrupt=False
+        ):
+            for _change, path in changes:
+                self.paths.put(path)
+
+    def get(self, timeout):
+        """Waits up to `timeout` seconds for events; returns the set of changed paths."""
+        paths = set()
+        with contextlib.suppress(queue.Empty):
+            paths.add(self.paths.get(timeout=timeout))
+            while True:
+                paths.add(self.paths.get_nowait())
+        return paths
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+@dataclasses.dataclass(frozen=True)
+class Rebuild:
+    app_name: str
+    changed_files: int
+    ok: bool
+    # seconds the build took
+    duration: float
+    # seconds from the first change to the end of the build
+    latency: float
+
+
+class DebouncedWatcher:
+    """
+    Watches the inputs of Tailwind builds and rebuilds an app once they have
+    been quiet for `debounce` seconds, so a burst of changes such as a branch
+    switch or a formatter run costs one rebuild instead of one per file.
+    Changes made while a build runs are coalesced into the next one.
+
+    Changes come from native file system events when `watchfiles` is
+    installed; otherwise the watched files are rescanned every
+    `poll_interval` seconds.
+
+    `rebuild(app_name)` builds one app and returns whether it succeeded.
+    """
+
+    def __init__(self, apps, rebuild, debounce, poll_interval=POLL_INTERVAL):
+        self.apps = apps
+        self.rebuild = rebuild
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.watchfiles = import_watchfiles()
+        self.snapshots = {app.name: app.snapshot() for app in apps}
+        # changed paths and time of the first change, by app name
+        self.pending = {}
+        self.last_change = None
+
+    def add_changes(self, app_name, paths, now):
+        pending_paths, _first_change = self.pending.setdefault(app_name, (set(), now))
+        pending_paths.update(paths)
+        self.last_change = now
+
+    def poll(self):
+        """Rescans the watched files and returns the names of the apps with new changes."""
+        now = time.monotonic()
+        changed_apps = []
+        for app in self.apps:
+            snapshot = app.snapshot()
+            changed = diff_snapshots(self.snapshots[app.name], snapshot)
+            self.snapshots[app.name] = snapshot
+            if changed:
+                self.add_changes(app.name, changed, now)
+                changed_apps.append(app.name)
+        return changed_apps
+
+    def record_events(self, paths):
+        """Records the changed `paths` of file events; returns the apps with new changes."""
+        now = time.monotonic()
+        changed_apps = []
+        for app in self.apps:
+            changed = {path for path in paths if app.is_input(path)}
+            if any(app.is_config_path(path) for path in changed):
+                app.refresh_source_globs()
+            if changed:
+                self.add_changes(app.name, changed, now)
+                changed_apps.append(app.name)
+        return changed_apps
+
+    def get_watched_dirs(self):
+        dirs = sorted({d for app in self.apps for d in app.get_watched_dirs() if os.path.isdir(d)})
+        # nested directories are covered by their parents
+        return [
+            directory
+            for directory in dirs
+            if not any(directory.startswith(parent + os.sep) for parent in dirs)
+        ]
+
+    def get_timeout(self):
+        """Seconds to wait for events: until pending changes settle, or poll_interval."""
+        if not self.pending:
+            return self.poll_interval
+        return max(self.debounce - (time.monotonic() - self.last_change), 0)
+
+    def is_settled(self):
+        return bool(self.pending) and time.monotonic() - self.last_change >= self.debounce
+
+    def rebuild_pending(self):
+        """Rebuilds every app with pending changes, yielding a Rebuild for each."""
+        pending, self.pending = self.pending, {}
+        for app_name, (paths, first_change) in pending.items():
+            started = time.monotonic()
+            ok = self.rebuild(app_name)
+            finished = time.monotonic()
+            yield Rebuild(app_name, len(paths), ok, finished - started, finished - first_change)
+
+    def run(self, on_rebuild, should_stop=lambda: False):
+        events = None
+        try:
+            while not should_stop():
+                if self.watchfiles is None:
+                    time.sleep(self.poll_interval)
+                    self.poll()
+                else:
+                    # restart the events when a changed @source moves the watched directories
+                    dirs = self.get_watched_dirs()
+                    if events is None or events.dirs != dirs:
+                        if events is not None:
+                            events.stop()
+                        events = FileEvents(self.watchfiles, dirs)
+                    self.record_events(events.get(self.get_timeout()))
+                if self.is_settled():
+                    for rebuild in self.rebuild_pending():
+                        on_rebuild(rebuild)
+        finally:
+            if events is not None:
+                events.stop()
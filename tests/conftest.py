@@ -1,5 +1,6 @@
 import os
 import shutil
+import sys
 import uuid
 from io import StringIO
 
@@ -38,8 +39,27 @@ def procfile_path():
         os.remove(procfile_path)
 
 
+def init_standalone_apps(settings, count):
+    app_names = [f"test_theme_{str(uuid.uuid1()).replace('-', '_')}" for _ in range(count)]
+    for app_name in app_names:
+        django_call_command(
+            "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+        )
+    settings.INSTALLED_APPS += app_names
+    settings.TAILWIND_APP_NAME = app_names
+    return app_names
+
+
+@pytest.fixture
+def cleanup_apps():
+    app_names = []
+    yield app_names
+    for app_name in app_names:
+        cleanup_theme_app_dir(app_name)
+
+
 def get_tailwind_versions():
-    return ["3", "4", "4s"]
+    return ["3", "4", "4s", "4l"]
 
 
 def call_command_with_output(command_name, *args, **kwargs):
@@ -53,3 +73,49 @@ def call_command_with_output(command_name, *args, **kwargs):
         **kwargs,
     )
     return out.getvalue(), err.getvalue()
+
+
+FAKE_TAILWIND_CLI = """#!{python}
+import os
+import sys
+
+args = sys.argv[1:]
+output = args[args.index("-o") + 1]
+os.makedirs(os.path.dirname(output), exist_ok=True)
+with open(output, "w") as f:
+    f.write("body{{}}")
+print(f"built {{output}}")
+sys.exit({exit_code})
+"""
+
+
+def make_fake_tailwind_cli(directory, exit_code=0):
+    """
+    Writes an executable stand-in for the Tailwind standalone binary that
+    writes a tiny stylesheet to its -o argument, so builds run offline.
+    """
+    path = os.path.join(directory, "tailwindcss")
+    with open(path, "w") as f:
+        f.write(FAKE_TAILWIND_CLI.format(python=sys.executable, exit_code=exit_code))
+    os.chmod(path, 0o755)
+    return path
+
+
+FAKE_PACKAGE_MANAGER = """#!{python}
+import sys
+
+with open({log!r}, "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\\n")
+"""
+
+
+def make_fake_package_manager(directory, name, log):
+    """
+    Writes an executable stand-in for a package manager such as npm or pnpm,
+    named `name`, that appends the arguments of every call to `log`.
+    """
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(FAKE_PACKAGE_MANAGER.format(python=sys.executable, log=str(log)))
+    os.chmod(path, 0o755)
+    return path
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from django.utils.autoreload import autoreload_started
+from django.utils.autoreload import StatReloader
+
+from tailwind.autoreload import iter_pruned_glob
+from tailwind.utils import get_app_path
+
+from .conftest import init_standalone_apps
+
+
+def test_reloader_skips_node_modules_and_build_output(settings, cleanup_apps):
+    """
+    GIVEN a Tailwind app with node_modules and a built stylesheet, in a watched directory
+    WHEN runserver's reloader lists the files it watches
+    THEN it should skip node_modules and the build output, but keep the app's other files
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    app_path = Path(get_app_path(app_name))
+    package = app_path / "static_src" / "node_modules" / "tailwindcss" / "index.js"
+    package.parent.mkdir(parents=True)
+    package.write_text("")
+    stylesheet = app_path / "static" / "css" / "dist" / "styles.css"
+    stylesheet.parent.mkdir(parents=True)
+    stylesheet.write_text("")
+    reloader = StatReloader()
+    reloader.watch_dir(app_path, "**/*")
+
+    autoreload_started.send(sender=reloader)
+    watched_files = set(reloader.watched_files())
+
+    assert app_path / "static_src" / "src" / "styles.css" in watched_files
+    assert app_path / "static" / "css" in watched_files
+    assert not any("node_modules" in path.parts for path in watched_files)
+    assert not any(stylesheet.parent in path.parents for path in watched_files)
+    assert stylesheet.parent not in watched_files
+
+
+def test_iter_pruned_glob(tmp_path):
+    """
+    GIVEN a directory containing a pruned directory
+    WHEN it is globbed recursively and non-recursively
+    THEN the pruned directory and its contents should be left out of both
+    """
+    for name in ["a.html", "sub/b.html", "node_modules/c.js", "node_modules/deep/d.js"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+    pruned_paths = {tmp_path / "node_modules"}
+
+    assert set(iter_pruned_glob(tmp_path, "**/*.html", pruned_paths)) == {
+        tmp_path / "a.html",
+        tmp_path / "sub" / "b.html",
+    }
+    assert set(iter_pruned_glob(tmp_path, "*", pruned_paths)) == {
+        tmp_path / "a.html",
+        tmp_path / "sub",
+    }
+    assert list(iter_pruned_glob(tmp_path / "node_modules", "**/*", pruned_paths)) == []
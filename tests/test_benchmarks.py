@@ -0,0 +1,25 @@
+import json
+
+from benchmarks.run import main
+
+
+def test_benchmarks_write_json_results(tmp_path, capsys):
+    """
+    GIVEN a tiny benchmark run
+    WHEN the results are written with --output
+    THEN every benchmark is reported with a timing
+    """
+    output = tmp_path / "bench.json"
+    main(["--number", "5", "--templates", "20", "--repeat", "1", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert set(report["results"]) >= {
+        "render_tailwind_css_debug_false",
+        "render_tailwind_preload_css_debug_true",
+        "get_config",
+        "build",
+        "build_cached",
+        "build_after_template_change",
+    }
+    assert all(result["seconds"] > 0 for result in report["results"].values())
+    assert "build_cached" in capsys.readouterr().out
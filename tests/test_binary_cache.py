@@ -0,0 +1,128 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management import CommandError
+
+from tailwind.binary_cache import BinaryCache
+from tailwind.binary_cache import BinaryCacheError
+from tailwind.binary_cache import detect_target
+from tailwind.binary_cache import hash_file
+from tailwind.project import TailwindProject
+
+from .conftest import init_standalone_apps
+from .conftest import make_fake_tailwind_cli
+
+VERSION = "v4.3.0"
+
+
+def make_mirror(root, targets, with_checksums=True):
+    """Lays out a release of fake binaries for `targets` like the GitHub releases."""
+    release_dir = os.path.join(root, "mirror", VERSION)
+    os.makedirs(release_dir)
+    checksums = []
+    for target in targets:
+        path = os.path.join(release_dir, f"tailwindcss-{target}")
+        os.replace(make_fake_tailwind_cli(release_dir), path)
+        with open(path, "a") as f:
+            f.write(f"# {target}\n")
+        checksums.append(f"{hash_file(path)}  ./tailwindcss-{target}")
+    if with_checksums:
+        with open(os.path.join(release_dir, "sha256sums.txt"), "w") as f:
+            f.write("\n".join(checksums) + "\n")
+    return os.path.join(root, "mirror")
+
+
+def test_binary_cache_fetches_verified_binaries_once(tmp_path):
+    """
+    GIVEN a local mirror with binaries for two platforms and their checksums
+    WHEN both are fetched into the cache twice
+    THEN each should be stored once by content and looked up from the cache afterwards
+    """
+    mirror = make_mirror(str(tmp_path), ["linux-x64", "macos-arm64"])
+    cache = BinaryCache(str(tmp_path / "cache"), mirror)
+
+    linux_path = cache.get(VERSION, "linux-x64")
+    macos_path = cache.get(VERSION, "macos-arm64")
+
+    assert os.path.basename(linux_path) == hash_file(linux_path)
+    assert linux_path != macos_path
+    assert os.access(linux_path, os.X_OK)
+    os.remove(os.path.join(mirror, VERSION, "tailwindcss-linux-x64"))
+    assert cache.get(VERSION, "linux-x64") == linux_path
+    assert cache.verify() == []
+
+
+def test_binary_cache_rejects_checksum_mismatch(tmp_path):
+    """
+    GIVEN a mirror whose binary doesn't match the published checksum
+    WHEN the binary is fetched
+    THEN BinaryCacheError should be raised and nothing should be cached
+    """
+    mirror = make_mirror(str(tmp_path), ["linux-x64"])
+    with open(os.path.join(mirror, VERSION, "tailwindcss-linux-x64"), "a") as f:
+        f.write("tampered\n")
+    cache = BinaryCache(str(tmp_path / "cache"), mirror)
+
+    with pytest.raises(BinaryCacheError, match="Checksum mismatch"):
+        cache.get(VERSION, "linux-x64")
+    assert cache.lookup(VERSION, "linux-x64") is None
+    assert os.listdir(tmp_path / "cache" / "blobs") == []
+
+
+def test_binary_cache_verify_reports_corrupted_binaries(tmp_path):
+    """
+    GIVEN a binary added to the cache from a local file
+    WHEN the cached copy is modified and the cache is verified
+    THEN the corrupted version and target should be reported
+    """
+    cache = BinaryCache(str(tmp_path / "cache"))
+    path = cache.add(VERSION, "linux-arm64", make_fake_tailwind_cli(str(tmp_path)))
+    with open(path, "r+") as f:
+        f.write("corrupted")
+
+    assert cache.verify() == [(VERSION, "linux-arm64")]
+
+
+def test_binary_cache_refuses_latest(tmp_path):
+    """
+    GIVEN the binary version 'latest'
+    WHEN a binary is requested from the cache
+    THEN BinaryCacheError should ask for a pinned version
+    """
+    with pytest.raises(BinaryCacheError, match="pinned"):
+        BinaryCache(str(tmp_path)).get("latest", "linux-x64")
+
+
+def test_tailwind_build_uses_cached_binary(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN TAILWIND_STANDALONE_BINARY_CACHE_DIR and a local mirror for this platform
+    WHEN `tailwind binary fetch` and then `tailwind build` are run
+    THEN the build should run the binary from the cache, without downloading it
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_STANDALONE_BINARY_VERSION = VERSION
+    settings.TAILWIND_STANDALONE_BINARY_CACHE_DIR = str(tmp_path / "cache")
+    settings.TAILWIND_STANDALONE_BINARY_MIRROR = make_mirror(str(tmp_path), [detect_target()])
+
+    out = StringIO()
+    call_command("tailwind", "binary", "fetch", stdout=out)
+    assert "Cached this platform's binary of v4.3.0" in out.getvalue()
+
+    call_command("tailwind", "build", stdout=StringIO())
+    assert os.path.isfile(TailwindProject.resolve(cleanup_apps[0]).css_output_path)
+
+
+def test_tailwind_binary_command_needs_cache_dir(settings, cleanup_apps):
+    """
+    GIVEN no TAILWIND_STANDALONE_BINARY_CACHE_DIR
+    WHEN `tailwind binary verify` is run
+    THEN CommandError should explain how to enable the cache
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    settings.TAILWIND_APP_NAME = cleanup_apps[0]
+
+    with pytest.raises(CommandError, match="TAILWIND_STANDALONE_BINARY_CACHE_DIR"):
+        call_command("tailwind", "binary", "verify", stdout=StringIO())
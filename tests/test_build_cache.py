@@ -0,0 +1,164 @@
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tailwind.build_cache import BuildCache
+from tailwind.management.commands.tailwind import Command
+from tailwind.project import TailwindProject
+from tailwind.utils import get_app_path
+
+from .conftest import make_fake_tailwind_cli
+
+
+def write(path, contents=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(contents)
+
+
+@pytest.fixture
+def project(tmp_path):
+    write(
+        str(tmp_path / "theme" / "static_src" / "src" / "styles.css"),
+        '@import "tailwindcss";\n@source "../../../**/*.html";\n',
+    )
+    write(str(tmp_path / "app" / "templates" / "index.html"), '<p class="p-4"></p>')
+    return tmp_path
+
+
+def make_cache(project, options=None):
+    return BuildCache(
+        str(project / "cache"),
+        str(project / "theme"),
+        str(project / "theme" / "static" / "css" / "dist" / "styles.css"),
+        options or {"mode": "standalone"},
+    )
+
+
+def build(cache, contents="body{}"):
+    write(cache.output_path, contents)
+    cache.store(cache.compute_fingerprint())
+
+
+def test_build_cache_is_fresh_after_store(project):
+    """
+    GIVEN a build has been stored in the cache
+    WHEN nothing changes
+    THEN there should be no reason to rebuild
+    """
+    cache = make_cache(project)
+    assert cache.get_rebuild_reasons(cache.compute_fingerprint()) == ["no cached build found"]
+
+    build(cache)
+
+    assert cache.get_rebuild_reasons(cache.compute_fingerprint()) == []
+
+
+def test_build_cache_reports_changed_sources_and_options(project):
+    """
+    GIVEN a build has been stored in the cache
+    WHEN a template changes, a template is added and the binary version changes
+    THEN every change should be reported as a reason to rebuild
+    """
+    build(make_cache(project))
+    write(str(project / "app" / "templates" / "index.html"), '<p class="p-8"></p>')
+    write(str(project / "app" / "templates" / "new.html"))
+
+    cache = make_cache(project, {"mode": "standalone", "binary_version": "v4.3.0"})
+    reasons = cache.get_rebuild_reasons(cache.compute_fingerprint())
+
+    assert reasons == [
+        "binary_version changed: None -> v4.3.0",
+        "changed files: ../../app/templates/index.html",
+        "new files: ../../app/templates/new.html",
+    ]
+
+
+def test_build_cache_restores_missing_output(project):
+    """
+    GIVEN a build has been stored in the cache
+    WHEN the compiled stylesheet is deleted and the cache is restored
+    THEN the cached stylesheet should be put back in place
+    """
+    cache = make_cache(project)
+    build(cache, "body{color:red}")
+    os.remove(cache.output_path)
+
+    cache.restore()
+
+    with open(cache.output_path) as f:
+        assert f.read() == "body{color:red}"
+
+
+def test_build_command_skips_build_when_cache_is_fresh(settings, app_name, tmp_path):
+    """
+    GIVEN a standalone Tailwind app with TAILWIND_BUILD_CACHE_DIR set
+    WHEN the build command runs twice without changes, then with --force
+    THEN the second build should be served from the cache and --force should rebuild
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    settings.TAILWIND_BUILD_CACHE_DIR = str(tmp_path)
+    # keep the scan small: only the app's own templates
+    write(
+        os.path.join(get_app_path(app_name), "static_src", "src", "styles.css"),
+        '@import "tailwindcss";\n@source "../../templates";\n',
+    )
+
+    def fake_build(command):
+        write(TailwindProject.resolve(app_name).css_output_path, "body{}")
+
+    with mock.patch.object(Command, "tailwind_cli_build_command", fake_build):
+        first, second, forced = StringIO(), StringIO(), StringIO()
+        call_command("tailwind", "build", stdout=first)
+        os.remove(TailwindProject.resolve(app_name).css_output_path)
+        call_command("tailwind", "build", stdout=second)
+        call_command("tailwind", "build", "--force", stdout=forced)
+
+    assert f"Rebuilding '{app_name}': no cached build found" in first.getvalue()
+    assert f"Build cache of '{app_name}' is up to date" in second.getvalue()
+    assert os.path.isfile(TailwindProject.resolve(app_name).css_output_path)
+    assert f"Rebuilding '{app_name}': --force was given" in forced.getvalue()
+
+
+def test_failed_build_is_not_cached(settings, app_name, tmp_path, monkeypatch):
+    """
+    GIVEN a cached build of a standalone Tailwind app whose template then changes
+    WHEN the Tailwind binary fails, even though it leaves a stylesheet behind
+    THEN the build should fail, and the next build shouldn't restore the stale stylesheet
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+    )
+    settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    settings.TAILWIND_BUILD_CACHE_DIR = str(tmp_path / "cache")
+    settings.TAILWIND_STANDALONE_BINARY_VERSION = "fake"
+    app_path = get_app_path(app_name)
+    write(
+        os.path.join(app_path, "static_src", "src", "styles.css"),
+        '@import "tailwindcss";\n@source "../../templates";\n',
+    )
+    write(os.path.join(app_path, "templates", "index.html"), '<p class="p-4"></p>')
+    bin_dir = tmp_path / "bin" / "fake"
+    bin_dir.mkdir(parents=True)
+    monkeypatch.setenv("TAILWINDCSS_BIN_DIR", str(tmp_path / "bin"))
+
+    make_fake_tailwind_cli(str(bin_dir))
+    call_command("tailwind", "build", stdout=StringIO())
+    write(os.path.join(app_path, "templates", "index.html"), '<p class="p-8"></p>')
+    make_fake_tailwind_cli(str(bin_dir), exit_code=1)
+
+    for _ in range(2):
+        out = StringIO()
+        with pytest.raises(CommandError, match="failed with exit code 1"):
+            call_command("tailwind", "build", stdout=out)
+        assert "is up to date" not in out.getvalue()
+    assert os.path.isfile(TailwindProject.resolve(app_name).css_output_path)
@@ -1,12 +1,27 @@
 import json
 import os
+import sys
+import threading
+import time
+import uuid
+from io import StringIO
+from unittest import mock
 
 import pytest
 from django.core.management import call_command
 from django.core.management import CommandError
+from django.template import Context
+from django.template import Template
 
+from tailwind.management.commands.tailwind import Command
+from tailwind.manifest import read_manifest
+from tailwind.project import TailwindProject
 from tailwind.utils import get_app_path
 
+from .conftest import init_standalone_apps
+from .conftest import make_fake_package_manager
+from .conftest import make_fake_tailwind_cli
+
 
 @pytest.mark.parametrize("no_package_lock", [True, False])
 def test_tailwind_install_and_build_v3(no_package_lock, settings, app_name):
@@ -138,6 +153,81 @@ def test_tailwind_install_and_build_v4(no_package_lock, settings, app_name):
     )
 
 
+def test_tailwind_install_and_build_v4_lean(settings, app_name):
+    """
+    GIVEN a new lean Tailwind v4 app is initialized
+    WHEN the install and build commands are run
+    THEN @tailwindcss/cli should be installed without PostCSS and build the CSS output
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--tailwind-version", "4l", "--no-input"
+    )
+
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+
+    static_src_path = os.path.join(get_app_path(app_name), "static_src")
+    assert not os.path.isfile(os.path.join(static_src_path, "postcss.config.js"))
+    with open(os.path.join(static_src_path, "package.json")) as f:
+        dev_dependencies = json.load(f)["devDependencies"]
+    assert sorted(dev_dependencies) == ["@tailwindcss/cli", "tailwindcss"]
+
+    call_command("tailwind", "install")
+    assert os.path.isdir(os.path.join(static_src_path, "node_modules", "@tailwindcss", "cli"))
+
+    call_command("tailwind", "build")
+    assert os.path.isfile(
+        os.path.join(get_app_path(app_name), "static", "css", "dist", "styles.css")
+    ), "Tailwind has built a css/styles.css file"
+
+
+@pytest.mark.parametrize("clean_output", [True, False])
+def test_tailwind_build_v4_lean_cleans_output_in_python(settings, tmp_path, app_name, clean_output):
+    """
+    GIVEN a lean Tailwind v4 app building to the static root, with a previous build and other
+    static files next to it
+    WHEN the build command is run
+    THEN the previous build should be removed in Python only if package.json asks for it,
+    other static files should be kept, and only `npm run build` should run
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--tailwind-version", "4l", "--no-input"
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    package_json_path = os.path.join(get_app_path(app_name), "static_src", "package.json")
+    with open(package_json_path) as f:
+        package_json = json.load(f)
+    package_json["scripts"]["build"] = "tailwindcss -i ./src/styles.css -o ../static/styles.css"
+    package_json["django-tailwind"]["cleanOutput"] = clean_output
+    with open(package_json_path, "w") as f:
+        json.dump(package_json, f)
+    log = tmp_path / "npm.log"
+    settings.NPM_BIN_PATH = make_fake_package_manager(str(tmp_path), "npm", log)
+    static_dir = os.path.join(get_app_path(app_name), "static")
+    build_output = [
+        "styles.css",
+        "styles.css.gz",
+        "styles.css.br",
+        "styles.0123456789ab.css",
+        "styles.0123456789ab.css.gz",
+        "styles.manifest.json",
+    ]
+    static_files = ["img/logo.png", "styles-print.css", "other.css"]
+    for name in build_output + static_files:
+        os.makedirs(os.path.dirname(os.path.join(static_dir, name)), exist_ok=True)
+        with open(os.path.join(static_dir, name), "w") as f:
+            f.write("")
+
+    call_command("tailwind", "build", stdout=StringIO())
+
+    for name in build_output:
+        assert os.path.exists(os.path.join(static_dir, name)) is not clean_output
+    for name in static_files:
+        assert os.path.exists(os.path.join(static_dir, name))
+    assert log.read_text() == "run build\n"
+
+
 def test_tailwind_install_and_build_v4_standalone(settings, app_name):
     """
     GIVEN a new Tailwind v4s (standalone) app is initialized
@@ -388,3 +478,203 @@ def test_tailwind_plugin_install_no_plugin_name_error(settings, app_name):
         call_command("tailwind", "plugin_install")
 
     assert "the following arguments are required: plugin_name" in str(exc_info.value)
+
+
+def test_tailwind_build_multiple_apps_in_parallel(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN two standalone Tailwind apps listed in TAILWIND_APP_NAME
+    WHEN the build command is run
+    THEN both apps should be built, with output prefixed by the app name
+    """
+    cleanup_apps += init_standalone_apps(settings, 2)
+    fake_cli = make_fake_tailwind_cli(str(tmp_path))
+
+    out = StringIO()
+    with mock.patch.object(Command, "get_tailwind_cli_bin_path", return_value=fake_cli):
+        call_command("tailwind", "build", stdout=out)
+
+    for app_name in cleanup_apps:
+        assert os.path.isfile(TailwindProject.resolve(app_name).css_output_path)
+        assert f"[{app_name}] built static/css/dist/styles.css" in out.getvalue()
+
+
+FAKE_NPM_BUILD = """#!{python}
+import json
+import os
+import shlex
+import sys
+
+# `npm run <script>` writes a stylesheet to the -o argument of the script, following `npm run`
+with open("package.json") as f:
+    scripts = json.load(f)["scripts"]
+args = shlex.split(scripts[sys.argv[2]])
+while args[:2] == ["npm", "run"]:
+    args = shlex.split(scripts[args[2]])
+output = args[args.index("-o") + 1]
+os.makedirs(os.path.dirname(output), exist_ok=True)
+with open(output, "w") as f:
+    f.write("body{{}}")
+"""
+
+
+def test_tailwind_build_multiple_npm_apps_with_distinct_outputs(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN two npm-based Tailwind apps whose build scripts write to distinct static paths
+    WHEN they are built twice with the build cache and content versioning enabled
+    THEN each app's own stylesheet should be versioned, cached and linked by its tag
+    """
+    outputs = {}
+    for static_dir in ["admin", "public"]:
+        app_name = f"test_theme_{str(uuid.uuid1()).replace('-', '_')}"
+        cleanup_apps.append(app_name)
+        call_command(
+            "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4l"
+        )
+        outputs[app_name] = f"{static_dir}/css/styles.css"
+    settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, *cleanup_apps]
+    settings.TAILWIND_APP_NAME = cleanup_apps
+    for app_name, output in outputs.items():
+        package_json_path = os.path.join(get_app_path(app_name), "static_src", "package.json")
+        with open(package_json_path) as f:
+            package_json = json.load(f)
+        build_script = f"tailwindcss -i ./src/styles.css -o ../static/{output} --minify"
+        if app_name == cleanup_apps[0]:
+            package_json["scripts"]["build"] = build_script
+        else:
+            # like the v3 and v4 templates, whose build script runs another one
+            package_json["scripts"]["build"] = "npm run build:tailwind"
+            package_json["scripts"]["build:tailwind"] = build_script
+        with open(package_json_path, "w") as f:
+            json.dump(package_json, f)
+    npm = tmp_path / "npm"
+    npm.write_text(FAKE_NPM_BUILD.format(python=sys.executable))
+    os.chmod(npm, 0o755)
+    settings.NPM_BIN_PATH = str(npm)
+    settings.TAILWIND_BUILD_CACHE_DIR = str(tmp_path / "cache")
+    settings.TAILWIND_CSS_VERSIONING = "query"
+
+    call_command("tailwind", "build", stdout=StringIO())
+    out = StringIO()
+    call_command("tailwind", "build", stdout=out)
+    settings.DEBUG = False
+
+    for app_name, output in outputs.items():
+        assert TailwindProject.resolve(app_name).css_output_path == os.path.join(
+            get_app_path(app_name), "static", output
+        )
+        assert f"Build cache of '{app_name}' is up to date" in out.getvalue()
+        css_hash = read_manifest(output)["hash"]
+        tag = Template(f'{{% load tailwind_tags %}}{{% tailwind_css app="{app_name}" %}}')
+        assert f'href="/static/{output}?v={css_hash}"' in tag.render(Context({}))
+
+
+def test_tailwind_build_multiple_apps_fails_if_any_app_fails(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN two standalone Tailwind apps listed in TAILWIND_APP_NAME
+    WHEN the build of any of them fails
+    THEN the build command should raise CommandError naming the failed apps
+    """
+    cleanup_apps += init_standalone_apps(settings, 2)
+    fake_cli = make_fake_tailwind_cli(str(tmp_path), exit_code=1)
+
+    with (
+        mock.patch.object(Command, "get_tailwind_cli_bin_path", return_value=fake_cli),
+        pytest.raises(CommandError, match="Tailwind build failed for"),
+    ):
+        call_command("tailwind", "build", stdout=StringIO())
+
+
+FAKE_TAILWIND_WATCHER = """#!{python}
+import sys
+
+print("watching", flush=True)
+sys.stdin.read()
+"""
+
+
+def test_tailwind_start_attaches_to_watcher_daemon(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN a watcher daemon started with `tailwind daemon start`
+    WHEN `tailwind start` is run
+    THEN it should attach to the running daemon instead of starting a new watcher
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    fake_watcher = tmp_path / "tailwindcss"
+    fake_watcher.write_text(FAKE_TAILWIND_WATCHER.format(python=sys.executable))
+    fake_watcher.chmod(0o755)
+
+    out = StringIO()
+    with mock.patch.object(Command, "get_tailwind_cli_bin_path", return_value=str(fake_watcher)):
+        call_command("tailwind", "daemon", "start", stdout=out)
+        assert "Started the watcher daemon" in out.getvalue()
+
+        call_command("tailwind", "daemon", "status", stdout=out)
+        assert "is running" in out.getvalue()
+
+        start_out = StringIO()
+        start = threading.Thread(
+            target=call_command, args=("tailwind", "start"), kwargs={"stdout": start_out}
+        )
+        with mock.patch("tailwind.management.commands.tailwind.WatcherDaemon.start") as spawn:
+            start.start()
+            deadline = time.monotonic() + 10
+            while "watching" not in start_out.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            call_command("tailwind", "daemon", "stop", stdout=out)
+            start.join(timeout=10)
+
+    assert not spawn.called
+    assert "Attached to the watcher daemon" in start_out.getvalue()
+    assert "watching" in start_out.getvalue()
+    assert "Stopped the watcher daemon" in out.getvalue()
+
+
+def test_tailwind_scan_reports_class_usage_and_sources(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN a built standalone Tailwind app
+    WHEN the scan command is run twice with --sources
+    THEN class usage should be reported, unchanged files reused and @source lines printed
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    output_path = TailwindProject.resolve(app_name).css_output_path
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(".bg-gray-50{background:#fafafa}.not-used-anywhere{color:red}")
+
+    out = StringIO()
+    call_command("tailwind", "scan", "--sources", stdout=out)
+    call_command("tailwind", "scan", stdout=out)
+
+    output = out.getvalue()
+    assert "0 unchanged" in output
+    assert "0 scanned" in output
+    assert "2 classes in the stylesheet" in output
+    assert "Not found: not-used-anywhere" in output
+    assert f"{app_name}/templates/base.html" in output
+    assert '@source "../../**/*.html";' in output
+    assert os.path.isfile(os.path.join(get_app_path(app_name), "static_src", ".tailwind-scan.json"))
+
+
+def test_tailwind_build_generates_sources(settings, cleanup_apps):
+    """
+    GIVEN TAILWIND_GENERATE_SOURCES and a standalone app whose styles.css imports sources.css
+    WHEN the build command is run
+    THEN sources.css should list the templates directory of the app
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_GENERATE_SOURCES = True
+    styles_dir = os.path.join(get_app_path(app_name), "static_src", "src")
+    with open(os.path.join(styles_dir, "styles.css"), "w") as f:
+        f.write('@import "tailwindcss";\n@import "./sources.css";\n')
+
+    out = StringIO()
+    with mock.patch.object(Command, "tailwind_cli_build_command"):
+        call_command("tailwind", "build", stdout=out)
+
+    with open(os.path.join(styles_dir, "sources.css")) as f:
+        assert '@source "../../templates";' in f.read()
+    assert "@source directives to" in out.getvalue()
+    assert "to use the generated @source directives" not in out.getvalue()
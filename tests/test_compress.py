@@ -0,0 +1,86 @@
+import gzip
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tailwind.compress import compress_file
+from tailwind.management.commands.tailwind import Command
+from tailwind.project import TailwindProject
+
+
+def test_compress_file_writes_gzip_sibling(tmp_path):
+    """
+    GIVEN a compiled stylesheet
+    WHEN compress_file is called
+    THEN a gzip sibling with the same contents should be written and its sizes reported
+    """
+    css_path = tmp_path / "styles.css"
+    css_path.write_text("body{color:red}" * 100)
+
+    results = {result.encoding: result for result in compress_file(str(css_path))}
+
+    assert gzip.decompress((tmp_path / "styles.css.gz").read_bytes()) == css_path.read_bytes()
+    assert results["gzip"].raw_size == 1500
+    assert results["gzip"].compressed_size < results["gzip"].raw_size
+    assert not results["gzip"].skipped
+
+
+def test_compress_file_writes_brotli_sibling(tmp_path):
+    """
+    GIVEN a compiled stylesheet and the brotli package installed
+    WHEN compress_file is called
+    THEN a brotli sibling with the same contents should be written
+    """
+    brotli = pytest.importorskip("brotli")
+    css_path = tmp_path / "styles.css"
+    css_path.write_text("body{color:red}" * 100)
+
+    compress_file(str(css_path))
+
+    assert brotli.decompress((tmp_path / "styles.css.br").read_bytes()) == css_path.read_bytes()
+
+
+def test_compress_file_skips_unchanged_output(tmp_path):
+    """
+    GIVEN a stylesheet that has already been compressed
+    WHEN compress_file is called again, before and after the stylesheet changes
+    THEN compression should be skipped only while the contents are unchanged
+    """
+    css_path = tmp_path / "styles.css"
+    css_path.write_text("body{color:red}")
+    compress_file(str(css_path))
+
+    assert all(result.skipped for result in compress_file(str(css_path)))
+
+    css_path.write_text("body{color:blue}")
+    assert not any(result.skipped for result in compress_file(str(css_path)))
+    assert gzip.decompress((tmp_path / "styles.css.gz").read_bytes()) == b"body{color:blue}"
+
+
+def test_post_build_precompresses_stylesheet(settings, app_name):
+    """
+    GIVEN a Tailwind app with a compiled stylesheet and TAILWIND_PRECOMPRESS enabled
+    WHEN the post-build stage runs
+    THEN the stylesheet should be precompressed and the sizes reported
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    settings.TAILWIND_PRECOMPRESS = True
+
+    output_path = TailwindProject.resolve(app_name).css_output_path
+    os.makedirs(os.path.dirname(output_path))
+    with open(output_path, "w") as f:
+        f.write("body{color:red}")
+
+    out = StringIO()
+    command = Command(stdout=out)
+    command.use_app(app_name)
+    command.post_build()
+
+    assert os.path.isfile(f"{output_path}.gz")
+    assert "styles.css.gz: 15 bytes" in out.getvalue()
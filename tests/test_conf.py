@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+from django.template import Context
+from django.template import Template
+
+from tailwind import get_config
+from tailwind import get_settings
+from tailwind.conf import TailwindSettings
+
+
+def test_get_config_reads_typed_settings(settings):
+    """
+    GIVEN Tailwind settings are overridden in settings.py
+    WHEN get_settings and get_config are called
+    THEN both should return the overridden values
+    """
+    settings.TAILWIND_APP_NAME = "theme"
+    settings.TAILWIND_CSS_PATH = "css/custom.css"
+    settings.NPM_BIN_PATH = "/usr/local/bin/npm"
+
+    assert get_settings().app_name == "theme"
+    assert get_settings().css_path == "css/custom.css"
+    assert get_settings().standalone_build_command_args == (
+        "-i static_src/src/styles.css -o static/css/custom.css --minify"
+    )
+    assert get_config("TAILWIND_CSS_PATH") == "css/custom.css"
+    assert get_config("NPM_BIN_PATH") == "/usr/local/bin/npm"
+
+
+def test_get_config_unknown_setting():
+    """
+    GIVEN a setting name Tailwind doesn't know about
+    WHEN get_config is called with it
+    THEN it should raise KeyError
+    """
+    with pytest.raises(KeyError):
+        get_config("TAILWIND_UNKNOWN")
+
+
+def test_get_settings_is_cached_until_settings_change(settings):
+    """
+    GIVEN Tailwind settings have been resolved once
+    WHEN get_settings is called again, and then after a setting changes
+    THEN the same object should be returned until the change invalidates it
+    """
+    settings.TAILWIND_CSS_PATH = "css/one.css"
+    first = get_settings()
+    assert get_settings() is first
+
+    settings.TAILWIND_CSS_PATH = "css/two.css"
+    assert get_settings() is not first
+    assert get_settings().css_path == "css/two.css"
+
+
+def test_get_settings_resolves_settings_once_per_change(settings):
+    """
+    GIVEN the tailwind_css tag is rendered repeatedly
+    WHEN get_settings is called on every render, and then a setting changes
+    THEN the settings should be resolved once, and again only after the change
+    """
+    settings.TAILWIND_APP_NAME = "theme"
+    template = Template("{% load tailwind_tags %}{% tailwind_css %}")
+
+    with mock.patch.object(
+        TailwindSettings, "from_settings", wraps=TailwindSettings.from_settings
+    ) as from_settings:
+        get_settings.cache_clear()
+        for _ in range(10):
+            template.render(Context({}))
+            get_settings()
+        assert from_settings.call_count == 1
+
+        settings.TAILWIND_CSS_PATH = "css/changed.css"
+        for _ in range(10):
+            get_settings()
+        assert from_settings.call_count == 2
@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+
+from tailwind.daemon import WatcherDaemon
+from tailwind.processes import Job
+
+# Prints a line, then exits only when its stdin is closed, like `tailwindcss --watch`
+WATCHER_SCRIPT = (
+    "import sys; print('watching', flush=True); sys.stdin.read(); print('stdin closed')"
+)
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def read_log(daemon):
+    with open(daemon.log_path) as f:
+        return f.read()
+
+
+def make_job(tmp_path):
+    return Job("theme", [sys.executable, "-c", WATCHER_SCRIPT], str(tmp_path))
+
+
+def test_daemon_keeps_running_and_stops(tmp_path):
+    """
+    GIVEN a watcher daemon was started
+    WHEN the starting process goes on without it
+    THEN the watcher keeps running with its stdin open until the daemon is stopped
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    state = daemon.start(make_job(tmp_path))
+    try:
+        wait_for(lambda: "watching" in read_log(daemon))
+        time.sleep(0.2)
+        assert daemon.get_state()["pid"] == state["pid"]
+        assert "stdin closed" not in read_log(daemon)
+    finally:
+        assert daemon.stop()
+
+    assert daemon.get_state() is None
+    assert not os.path.exists(daemon.state_path)
+    assert not daemon.stop()
+
+
+def test_daemon_removes_stale_state(tmp_path):
+    """
+    GIVEN a state file left behind by a daemon that no longer runs
+    WHEN the daemon's state is read
+    THEN it is reported as not running and the state file is removed
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    daemon.write_state({"pid": 2**22 + 1, "args": [], "cwd": str(tmp_path)})
+
+    assert daemon.get_state() is None
+    assert not os.path.exists(daemon.state_path)
+
+
+def test_daemon_ignores_a_reused_pid(tmp_path):
+    """
+    GIVEN a state file whose pid now belongs to a process started later than the daemon
+    WHEN the daemon's state is read
+    THEN it is reported as not running and the process is left alone
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    daemon.write_state(
+        {"pid": os.getpid(), "pid_start_time": "earlier", "args": [], "cwd": str(tmp_path)}
+    )
+
+    assert daemon.get_state() is None
+    assert not os.path.exists(daemon.state_path)
+    assert not daemon.stop()
+
+
+def test_concurrent_starts_share_one_daemon(tmp_path):
+    """
+    GIVEN no watcher daemon is running
+    WHEN several sessions start one at the same time
+    THEN only one supervisor is started, and the other sessions are told so
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    barrier = threading.Barrier(4)
+    states = []
+
+    def start():
+        barrier.wait()
+        states.append(WatcherDaemon(str(tmp_path)).start(make_job(tmp_path)))
+
+    threads = [threading.Thread(target=start) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    try:
+        [state] = [state for state in states if state is not None]
+        assert len(states) == 4
+        assert daemon.get_state()["pid"] == state["pid"]
+        assert state["pid_start_time"]
+        assert not os.path.exists(daemon.lock_path)
+    finally:
+        daemon.stop()
+
+
+def test_daemon_breaks_a_stale_lock(tmp_path):
+    """
+    GIVEN a lock file left behind by a session that no longer runs
+    WHEN the daemon is started
+    THEN the lock is taken over and the daemon starts
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    with open(daemon.lock_path, "w") as f:
+        f.write(str(2**22 + 1))
+
+    state = daemon.start(make_job(tmp_path))
+    try:
+        assert daemon.get_state()["pid"] == state["pid"]
+    finally:
+        daemon.stop()
+
+
+def test_daemon_attach_follows_log_until_daemon_exits(tmp_path):
+    """
+    GIVEN a running watcher daemon
+    WHEN a session attaches to it and the daemon is stopped later
+    THEN the session receives the watcher's output and returns
+    """
+    daemon = WatcherDaemon(str(tmp_path))
+    daemon.start(make_job(tmp_path))
+    lines = []
+    attached = threading.Thread(target=daemon.attach, args=(lines.append, 0.05))
+    attached.start()
+    try:
+        wait_for(lambda: "watching" in lines)
+    finally:
+        daemon.stop()
+    attached.join(timeout=10)
+
+    assert not attached.is_alive()
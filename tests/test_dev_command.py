@@ -8,6 +8,8 @@ from django.core.management.base import CommandError
 from .conftest import call_command_with_output
 from .conftest import get_tailwind_versions
 
+SUPERVISOR_RUN = "tailwind.management.commands.tailwind.Supervisor.run"
+
 
 @pytest.mark.parametrize("tailwind_version", get_tailwind_versions())
 def test_tailwind_dev_command_creates_procfile_real(
@@ -34,17 +36,12 @@ def test_tailwind_dev_command_creates_procfile_real(
     # Ensure Procfile.tailwind doesn't exist
     assert not os.path.exists(procfile_path)
 
-    # Mock subprocess to prevent actual honcho execution
-    with mock.patch("subprocess.run") as mock_subprocess:
-        # Mock honcho is installed
-        mock_subprocess.side_effect = [
-            mock.Mock(),  # honcho --version succeeds
-            KeyboardInterrupt(),  # honcho start interrupted immediately
-        ]
-
-        # Call dev command - should create Procfile
-        with pytest.raises(SystemExit):
-            call_command("tailwind", "dev")
+    # Call dev command with the supervisor mocked out - should create Procfile
+    with (
+        mock.patch(SUPERVISOR_RUN, side_effect=KeyboardInterrupt),
+        pytest.raises(SystemExit),
+    ):
+        call_command("tailwind", "dev")
 
     # Verify file was actually created
     assert os.path.exists(procfile_path), "Procfile.tailwind should be created"
@@ -90,17 +87,12 @@ redis: redis-server"""
     with open(procfile_path, "w") as f:
         f.write(custom_content)
 
-    # Mock subprocess to prevent actual honcho execution
-    with mock.patch("subprocess.run") as mock_subprocess:
-        # Mock honcho is installed
-        mock_subprocess.side_effect = [
-            mock.Mock(),  # honcho --version succeeds
-            KeyboardInterrupt(),  # honcho start interrupted immediately
-        ]
-
-        # Call dev command - should NOT overwrite existing Procfile
-        with pytest.raises(SystemExit):
-            call_command_with_output("tailwind", "dev")
+    # Call dev command with the supervisor mocked out - should NOT overwrite existing Procfile
+    with (
+        mock.patch(SUPERVISOR_RUN, side_effect=KeyboardInterrupt),
+        pytest.raises(SystemExit),
+    ):
+        call_command_with_output("tailwind", "dev")
 
     # Verify file still exists and wasn't overwritten
     assert os.path.exists(procfile_path), "Procfile.tailwind should still exist"
@@ -113,13 +105,14 @@ redis: redis-server"""
 
 
 @pytest.mark.parametrize("tailwind_version", get_tailwind_versions())
-def test_tailwind_dev_command_subprocess_error(settings, app_name, procfile_path, tailwind_version):
+def test_tailwind_dev_command_runs_procfile_processes(
+    settings, app_name, procfile_path, tailwind_version
+):
     """
-    GIVEN a Tailwind app is initialized and honcho is available
-    WHEN the dev command is run but honcho start fails
-    THEN a CommandError should be raised with subprocess failure message
+    GIVEN a Tailwind app is initialized and a custom Procfile.tailwind exists
+    WHEN the dev command is run
+    THEN every process of the Procfile should be run by the built-in supervisor
     """
-    # Setup
     call_command(
         "tailwind",
         "init",
@@ -132,19 +125,50 @@ def test_tailwind_dev_command_subprocess_error(settings, app_name, procfile_path
     settings.INSTALLED_APPS += [app_name]
     settings.TAILWIND_APP_NAME = app_name
 
-    # Mock subprocess to simulate honcho start failure
-    with mock.patch("subprocess.run") as mock_subprocess:
-        import subprocess
+    with open(procfile_path, "w") as f:
+        f.write("django: python manage.py runserver 0.0.0.0:8000\nredis: redis-server\n")
 
-        # Mock honcho version check to succeed, but start to fail
-        mock_subprocess.side_effect = [
-            mock.Mock(),  # honcho --version succeeds
-            subprocess.CalledProcessError(1, ["honcho", "start"]),  # honcho start fails
-        ]
+    with (
+        mock.patch("tailwind.management.commands.tailwind.Supervisor") as supervisor_class,
+        mock.patch("subprocess.run") as mock_subprocess,
+    ):
+        call_command_with_output("tailwind", "dev")
 
-        # Expect CommandError to be raised
-        with pytest.raises(CommandError, match="Failed to start honcho"):
-            call_command("tailwind", "dev")
+    assert supervisor_class.call_args.args[0] == {
+        "django": "python manage.py runserver 0.0.0.0:8000",
+        "redis": "redis-server",
+    }
+    assert supervisor_class.return_value.run.called
+    assert not mock_subprocess.called, "No honcho subprocess should be started"
+
+
+@pytest.mark.parametrize("tailwind_version", get_tailwind_versions())
+def test_tailwind_dev_command_empty_procfile_error(
+    settings, app_name, procfile_path, tailwind_version
+):
+    """
+    GIVEN a Tailwind app is initialized and Procfile.tailwind defines no processes
+    WHEN the dev command is run
+    THEN a CommandError should be raised
+    """
+    # Setup
+    call_command(
+        "tailwind",
+        "init",
+        "--app-name",
+        app_name,
+        "--tailwind-version",
+        tailwind_version,
+        "--no-input",
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+
+    with open(procfile_path, "w") as f:
+        f.write("# nothing to run\n")
+
+    with pytest.raises(CommandError, match="No processes found"):
+        call_command("tailwind", "dev")
 
 
 @pytest.mark.parametrize("tailwind_version", get_tailwind_versions())
@@ -169,14 +193,8 @@ def test_tailwind_dev_command_graceful_keyboard_interrupt(
     settings.INSTALLED_APPS += [app_name]
     settings.TAILWIND_APP_NAME = app_name
 
-    # Mock subprocess to simulate KeyboardInterrupt
-    with mock.patch("subprocess.run") as mock_subprocess:
-        # Mock honcho version check to succeed, but start to be interrupted
-        mock_subprocess.side_effect = [
-            mock.Mock(),  # honcho --version succeeds
-            KeyboardInterrupt(),  # honcho start interrupted
-        ]
-
+    # Simulate KeyboardInterrupt while the processes run
+    with mock.patch(SUPERVISOR_RUN, side_effect=KeyboardInterrupt):
         # Should not raise exception, should handle gracefully
         with pytest.raises(SystemExit):
             call_command("tailwind", "dev")
@@ -206,22 +224,17 @@ def test_tailwind_dev_command_messages_in_the_output(
     settings.INSTALLED_APPS += [app_name]
     settings.TAILWIND_APP_NAME = app_name
 
-    # Mock subprocess to prevent actual honcho execution
-    with mock.patch("subprocess.run") as mock_subprocess:
-        # Mock honcho is installed
-        mock_subprocess.side_effect = [
-            mock.Mock(),  # honcho --version succeeds
-            KeyboardInterrupt(),  # honcho start interrupted immediately
-        ]
-
-        # Call dev command - should create Procfile
-        with pytest.raises(SystemExit):
-            out, _ = call_command_with_output("tailwind", "dev")
-
-            assert "Procfile.tailwind created" in out
-            assert "Starting Tailwind watcher and Django development server" in out
-            assert "You can access the server at: http://127.0.0.1:8000/"
-            assert "Press Ctrl+C to stop the servers"
+    # Call dev command with the supervisor mocked out - should create Procfile
+    with (
+        mock.patch(SUPERVISOR_RUN, side_effect=KeyboardInterrupt),
+        pytest.raises(SystemExit),
+    ):
+        out, _ = call_command_with_output("tailwind", "dev")
+
+        assert "Procfile.tailwind created" in out
+        assert "Starting Tailwind watcher and Django development server" in out
+        assert "You can access the server at: http://127.0.0.1:8000/"
+        assert "Press Ctrl+C to stop the servers"
 
 
 def test_tailwind_dev_command_help_includes_dev():
@@ -0,0 +1,84 @@
+import os
+from io import StringIO
+
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+
+from tailwind.finders import TailwindFinder
+from tailwind.utils import get_app_path
+from tailwind.utils import replace_output_arg
+
+from .conftest import init_standalone_apps
+from .conftest import make_fake_tailwind_cli
+
+FINDERS = [
+    "tailwind.finders.TailwindFinder",
+    "django.contrib.staticfiles.finders.FileSystemFinder",
+    "django.contrib.staticfiles.finders.AppDirectoriesFinder",
+]
+
+
+def test_build_writes_to_output_dir_and_finder_serves_it(
+    settings,
+    tmp_path,
+    monkeypatch,
+    cleanup_apps,
+):
+    """
+    GIVEN a standalone Tailwind app and TAILWIND_OUTPUT_DIR
+    WHEN the build command is run
+    THEN the stylesheet should be written outside the app and found by TailwindFinder
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_STANDALONE_BINARY_VERSION = "fake"
+    settings.TAILWIND_OUTPUT_DIR = str(tmp_path / "output")
+    settings.STATICFILES_FINDERS = FINDERS
+    bin_dir = tmp_path / "bin" / "fake"
+    bin_dir.mkdir(parents=True)
+    make_fake_tailwind_cli(str(bin_dir))
+    monkeypatch.setenv("TAILWINDCSS_BIN_DIR", str(tmp_path / "bin"))
+
+    call_command("tailwind", "build", stdout=StringIO())
+
+    output_path = tmp_path / "output" / app_name / "css" / "dist" / "styles.css"
+    assert output_path.is_file()
+    assert not os.path.exists(os.path.join(get_app_path(app_name), "static"))
+    assert finders.find("css/dist/styles.css") == str(output_path)
+
+
+def test_tailwind_finder_lists_and_finds_output_files(settings, tmp_path):
+    """
+    GIVEN files in the TAILWIND_OUTPUT_DIR directory of a Tailwind app
+    WHEN TailwindFinder looks them up or lists them
+    THEN it should return them, but nothing outside the app's directory
+    """
+    settings.TAILWIND_APP_NAME = "theme"
+    settings.TAILWIND_OUTPUT_DIR = str(tmp_path)
+    stylesheet = tmp_path / "theme" / "css" / "dist" / "styles.css"
+    stylesheet.parent.mkdir(parents=True)
+    stylesheet.write_text("body{}")
+    (tmp_path / "secret.txt").write_text("")
+    finder = TailwindFinder()
+
+    assert finder.find("css/dist/styles.css") == str(stylesheet)
+    assert finder.find("css/dist/styles.css", find_all=True) == [str(stylesheet)]
+    assert finder.find("../secret.txt") == []
+    assert [path for path, _ in finder.list([])] == ["css/dist/styles.css"]
+
+    settings.TAILWIND_OUTPUT_DIR = None
+    assert finder.find("css/dist/styles.css") == []
+
+
+def test_replace_output_arg():
+    """
+    GIVEN standalone binary arguments with and without an output argument
+    WHEN the output argument is replaced
+    THEN only the output path should change, or be appended
+    """
+    assert (
+        replace_output_arg("-i src/styles.css -o static/styles.css --minify", "/out/styles.css")
+        == "-i src/styles.css -o /out/styles.css --minify"
+    )
+    assert replace_output_arg("--output=a.css --watch", "b.css") == "--output=b.css --watch"
+    assert replace_output_arg("--minify", "b.css") == "--minify -o b.css"
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.http import Http404
+from django.template import Context
+from django.template import Template
+from django.test import RequestFactory
+from django.utils.html import escapejs
+
+from tailwind import views
+from tailwind.live_reload import FileWatcher
+from tailwind.live_reload import get_watcher
+
+# An URLconf without tailwind.urls
+urlpatterns = []
+
+
+def write_stylesheet(static_dir, contents="body{}"):
+    output_path = static_dir / "css" / "dist" / "styles.css"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(contents)
+    return output_path
+
+
+def touch(path, seconds_later=1):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds_later * 10**9))
+
+
+@pytest.fixture
+def live_reload_settings(settings, tmp_path):
+    settings.DEBUG = True
+    settings.TAILWIND_APP_NAME = "theme"
+    settings.TAILWIND_LIVE_RELOAD = True
+    settings.ROOT_URLCONF = "tests.urls"
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    return settings
+
+
+def test_file_watcher_wakes_waiting_clients_on_change(tmp_path):
+    """
+    GIVEN several clients waiting on a file watcher
+    WHEN the watched file changes
+    THEN every client should receive the new version from the single polling thread
+    """
+    path = write_stylesheet(tmp_path)
+    watcher = FileWatcher(str(path), interval=0.01)
+    version = watcher.version
+    results = []
+    clients = [
+        threading.Thread(target=lambda: results.append(watcher.wait_for_change(version, 5)))
+        for _ in range(3)
+    ]
+    for client in clients:
+        client.start()
+
+    touch(path)
+    for client in clients:
+        client.join(timeout=5)
+
+    assert results == [os.stat(path).st_mtime_ns] * 3
+    assert watcher.wait_for_change(results[0], timeout=0.05) == results[0]
+
+
+def test_get_watcher_shares_one_watcher_per_file(tmp_path):
+    """
+    GIVEN a file watched by several connections
+    WHEN a watcher is requested for every connection
+    THEN the same watcher should be returned
+    """
+    path = str(write_stylesheet(tmp_path))
+
+    assert get_watcher(path) is get_watcher(path)
+
+
+def test_live_reload_view_streams_css_events(live_reload_settings, tmp_path):
+    """
+    GIVEN a compiled stylesheet and DEBUG on
+    WHEN the stylesheet changes while the live reload stream is open
+    THEN a css event carrying the new version should be sent
+    """
+    path = write_stylesheet(tmp_path)
+    response = views.live_reload(RequestFactory().get("/__tailwind__/live-reload/"))
+    stream = iter(response.streaming_content)
+
+    assert response["Content-Type"] == "text/event-stream"
+    assert next(stream) == b"retry: 1000\n\n"
+
+    with mock.patch.object(views, "KEEPALIVE_INTERVAL", 0.05):
+        assert next(stream) == b": keepalive\n\n"
+        touch(path)
+        time.sleep(0.5)
+        while (chunk := next(stream)) == b": keepalive\n\n":
+            pass
+
+    assert chunk == f"event: css\ndata: {os.stat(path).st_mtime_ns}\n\n".encode()
+
+
+def test_live_reload_view_only_streams_tailwind_stylesheets(live_reload_settings, tmp_path):
+    """
+    GIVEN a static file that isn't the stylesheet of a Tailwind app
+    WHEN the live reload view is requested with its path
+    THEN it should respond with 404
+    """
+    (tmp_path / "secret.txt").write_text("")
+
+    with pytest.raises(Http404, match="Unknown Tailwind stylesheet"):
+        views.live_reload(RequestFactory().get("/__tailwind__/live-reload/?path=secret.txt"))
+
+
+def test_live_reload_view_is_not_available_in_production(live_reload_settings, tmp_path):
+    """
+    GIVEN DEBUG is off
+    WHEN the live reload view is requested
+    THEN it should respond with 404
+    """
+    live_reload_settings.DEBUG = False
+    write_stylesheet(tmp_path)
+
+    with pytest.raises(Http404):
+        views.live_reload(RequestFactory().get("/__tailwind__/live-reload/"))
+
+
+def test_tailwind_css_injects_live_reload_script(live_reload_settings):
+    """
+    GIVEN TAILWIND_LIVE_RELOAD and DEBUG are on and tailwind.urls is included
+    WHEN the tailwind_css tag is rendered
+    THEN the live reload script should follow the stylesheet link
+    """
+    output = Template("{% load tailwind_tags %}{% tailwind_css %}").render(Context({}))
+
+    assert f'new EventSource("{escapejs("/__tailwind__/live-reload/")}")' in output
+    assert output.index('<link rel="stylesheet"') < output.index("<script>")
+    assert 'new URL("/static/css/dist/styles.css", document.baseURI)' in output
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{"DEBUG": False}, {"TAILWIND_LIVE_RELOAD": False}, {"ROOT_URLCONF": "tests.test_live_reload"}],
+)
+def test_tailwind_css_without_live_reload_script(live_reload_settings, overrides):
+    """
+    GIVEN DEBUG or TAILWIND_LIVE_RELOAD is off, or tailwind.urls isn't included
+    WHEN the tailwind_css tag is rendered
+    THEN no live reload script should be added
+    """
+    for name, value in overrides.items():
+        setattr(live_reload_settings, name, value)
+
+    output = Template("{% load tailwind_tags %}{% tailwind_css %}").render(Context({}))
+
+    assert "EventSource" not in output
@@ -0,0 +1,51 @@
+import json
+
+from tailwind.manifest import get_hashed_path
+from tailwind.manifest import get_manifest_path
+from tailwind.manifest import hash_file
+from tailwind.manifest import write_manifest
+
+
+def test_get_manifest_and_hashed_paths():
+    """
+    GIVEN a stylesheet path
+    WHEN the manifest and hashed paths are derived from it
+    THEN they should sit next to the stylesheet
+    """
+    assert get_manifest_path("css/dist/styles.css") == "css/dist/styles.manifest.json"
+    assert get_hashed_path("css/dist/styles.css", "abc123") == "css/dist/styles.abc123.css"
+
+
+def test_write_manifest_records_content_hash(tmp_path):
+    """
+    GIVEN a compiled stylesheet
+    WHEN write_manifest is called in "query" mode
+    THEN the manifest should record the content hash and no hashed copy should be written
+    """
+    output_path = tmp_path / "styles.css"
+    output_path.write_text("body{color:red}")
+
+    manifest = write_manifest(str(output_path), "css/dist/styles.css", "query")
+
+    assert manifest["hash"] == hash_file(str(output_path))
+    assert len(manifest["hash"]) == 12
+    assert json.loads((tmp_path / "styles.manifest.json").read_text()) == manifest
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["styles.css", "styles.manifest.json"]
+
+
+def test_write_manifest_replaces_stale_hashed_copies(tmp_path):
+    """
+    GIVEN a stylesheet that was built with "filename" versioning before
+    WHEN its content changes and write_manifest is called again
+    THEN only the hashed copy of the current content should remain
+    """
+    output_path = tmp_path / "styles.css"
+    output_path.write_text("body{color:red}")
+    old_manifest = write_manifest(str(output_path), "css/dist/styles.css", "filename")
+
+    output_path.write_text("body{color:blue}")
+    new_manifest = write_manifest(str(output_path), "css/dist/styles.css", "filename")
+
+    assert old_manifest["hash"] != new_manifest["hash"]
+    assert not (tmp_path / f"styles.{old_manifest['hash']}.css").exists()
+    assert (tmp_path / f"styles.{new_manifest['hash']}.css").read_text() == "body{color:blue}"
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import os
+import pathlib
+import sys
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tailwind.npm import Bun
+from tailwind.npm import detect_package_manager
+from tailwind.npm import get_package_manager
+from tailwind.npm import NPM
+from tailwind.npm import NPMException
+from tailwind.npm import PNPM
+from tailwind.npm import Yarn
+from tailwind.project import TailwindProject
+
+from .conftest import make_fake_package_manager
+
+FAKE_NPM = """#!{python}
+import sys
+import time
+
+args = sys.argv[1:]
+if args[0] == "sleep":
+    time.sleep(float(args[1]))
+print("npm", *args, flush=True)
+print("warning", file=sys.stderr, flush=True)
+sys.exit(int(args[-1]) if args[-1].isdigit() else 0)
+"""
+
+
+@pytest.fixture
+def npm(tmp_path):
+    path = tmp_path / "npm"
+    path.write_text(FAKE_NPM.format(python=sys.executable))
+    os.chmod(path, 0o755)
+    return NPM(cwd=str(tmp_path), npm_bin_path=str(path))
+
+
+def test_npm_run_captures_and_streams_output(npm):
+    """
+    GIVEN an npm command that prints to stdout and stderr
+    WHEN it is run with capture and a line callback
+    THEN the result should hold the exit code, duration and every line, in order
+    """
+    lines = []
+
+    result = npm.run("run", "build", capture=True, on_line=lines.append)
+
+    assert result.ok
+    assert result.exit_code == 0
+    assert result.duration > 0
+    assert result.output == ["npm run build", "warning"]
+    assert lines == result.output
+    assert result.text == "npm run build\nwarning"
+
+
+def test_npm_run_reports_failures_and_timeouts(npm):
+    """
+    GIVEN npm commands that fail or run too long
+    WHEN they are run
+    THEN the result should report the exit code or the timeout instead of exiting
+    """
+    failed = npm.run("run", "2", capture=True)
+    timed_out = npm.run("sleep", "10", capture=True, timeout=0.2)
+
+    assert not failed.ok
+    assert failed.exit_code == 2
+    assert not timed_out.ok
+    assert timed_out.timed_out
+    assert timed_out.duration < 5
+
+
+def test_npm_run_async_runs_commands_concurrently(npm):
+    """
+    GIVEN two npm commands that each take a while
+    WHEN they are run with run_async and gathered
+    THEN both should finish in about the time of one
+    """
+
+    async def run_both():
+        return await asyncio.gather(
+            npm.run_async("sleep", "0.5", capture=True),
+            npm.run_async("sleep", "0.5", capture=True),
+        )
+
+    first, second = asyncio.run(run_both())
+
+    assert first.ok and second.ok
+    assert first.output[0] == "npm sleep 0.5"
+    assert first.duration < 1 and second.duration < 1
+
+
+def test_npm_run_async_times_out(npm):
+    """
+    GIVEN an npm command that runs too long
+    WHEN it is run with run_async and a timeout
+    THEN it should be killed and the result flagged as timed out
+    """
+    result = asyncio.run(npm.run_async("sleep", "10", capture=True, timeout=0.2))
+
+    assert result.timed_out
+    assert not result.ok
+
+
+def test_npm_command_exits_on_failure(npm, tmp_path):
+    """
+    GIVEN the legacy NPM.command() API
+    WHEN the command fails, or npm can't be found
+    THEN it should exit with code 1, or raise NPMException
+    """
+    with pytest.raises(SystemExit) as exc_info:
+        npm.command("run", "1")
+    assert exc_info.value.code == 1
+
+    with pytest.raises(NPMException, match="npm is not installed"):
+        NPM(cwd=str(tmp_path), npm_bin_path=str(tmp_path / "missing")).run("run", "build")
+
+
+@pytest.mark.parametrize(
+    "lockfile,expected",
+    [
+        ("pnpm-lock.yaml", PNPM),
+        ("bun.lock", Bun),
+        ("bun.lockb", Bun),
+        ("yarn.lock", Yarn),
+        ("package-lock.json", NPM),
+        (None, NPM),
+    ],
+)
+def test_detect_package_manager_from_lockfile(tmp_path, lockfile, expected):
+    """
+    GIVEN a project with one of the supported lockfiles, or none
+    WHEN its package manager is detected
+    THEN the tool owning the lockfile should be picked, falling back to npm
+    """
+    if lockfile:
+        (tmp_path / lockfile).write_text("")
+
+    assert detect_package_manager(str(tmp_path)) is expected
+
+
+def test_detect_package_manager_from_package_json(tmp_path):
+    """
+    GIVEN a project without lockfile whose package.json names a package manager
+    WHEN its package manager is detected
+    THEN the named tool should be picked
+    """
+    (tmp_path / "package.json").write_text(json.dumps({"packageManager": "yarn@1.22.22"}))
+
+    assert detect_package_manager(str(tmp_path)) is Yarn
+
+
+def test_get_package_manager_uses_settings(settings, tmp_path):
+    """
+    GIVEN TAILWIND_PACKAGE_MANAGER, its executable path and a shared store directory
+    WHEN the package manager is resolved
+    THEN the configured tool should run with frozen installs from the shared store
+    """
+    (tmp_path / "yarn.lock").write_text("")
+    settings.TAILWIND_PACKAGE_MANAGER = "pnpm"
+    settings.TAILWIND_PACKAGE_MANAGER_BIN_PATH = "/opt/pnpm"
+    settings.TAILWIND_PACKAGE_MANAGER_STORE_DIR = "/var/cache/pnpm"
+
+    package_manager = get_package_manager(str(tmp_path))
+
+    assert isinstance(package_manager, PNPM)
+    assert package_manager.npm_bin_path == "/opt/pnpm"
+    assert package_manager.get_install_args(frozen=True) == [
+        "install",
+        "--frozen-lockfile",
+        "--store-dir",
+        "/var/cache/pnpm",
+    ]
+
+    settings.TAILWIND_PACKAGE_MANAGER = "pip"
+    with pytest.raises(NPMException, match="Unknown package manager 'pip'"):
+        get_package_manager(str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "cls,frozen_args,add_args,update_args",
+    [
+        (NPM, ["ci"], ["install", "daisyui", "--save-dev"], ["update"]),
+        (PNPM, ["install", "--frozen-lockfile"], ["add", "--save-dev", "daisyui"], ["update"]),
+        (Bun, ["install", "--frozen-lockfile"], ["add", "--dev", "daisyui"], ["update"]),
+        (Yarn, ["install", "--frozen-lockfile"], ["add", "--dev", "daisyui"], ["upgrade"]),
+    ],
+)
+def test_package_manager_subcommands(cls, frozen_args, add_args, update_args):
+    """
+    GIVEN each supported package manager
+    WHEN the subcommands used by the tailwind command are built
+    THEN they should map onto the tool's own subcommands and flags
+    """
+    package_manager = cls(npm_bin_path=cls.name)
+
+    assert package_manager.get_install_args(frozen=True) == frozen_args
+    assert package_manager.get_add_dev_args("daisyui") == add_args
+    assert package_manager.get_update_args() == update_args
+    assert package_manager.get_outdated_args() == ["outdated"]
+    assert package_manager.get_run_args("build") == ["run", "build"]
+
+
+def test_tailwind_commands_use_detected_package_manager(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN a Tailwind v4 app with a pnpm lockfile
+    WHEN check-updates and update are run
+    THEN they should run pnpm with its own subcommands
+    """
+    app_name = f"test_theme_{uuid.uuid4().hex}"
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4"
+    )
+    cleanup_apps.append(app_name)
+    settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    (pathlib.Path(TailwindProject.resolve(app_name).src_path) / "pnpm-lock.yaml").write_text("")
+    log = tmp_path / "pnpm.log"
+    settings.TAILWIND_PACKAGE_MANAGER_BIN_PATH = make_fake_package_manager(
+        str(tmp_path), "pnpm", log
+    )
+
+    call_command("tailwind", "check-updates", stdout=StringIO())
+    call_command("tailwind", "update", stdout=StringIO())
+
+    assert log.read_text() == "outdated\nupdate\n"
@@ -0,0 +1,43 @@
+import sys
+
+from tailwind.processes import Job
+from tailwind.processes import run_jobs
+
+
+def python_job(name, code):
+    return Job(name, [sys.executable, "-c", code], cwd=None)
+
+
+def test_run_jobs_prefixes_output_and_returns_exit_codes():
+    """
+    GIVEN several jobs, one of which fails
+    WHEN they are run concurrently
+    THEN every output line should be prefixed with its job name and exit codes returned
+    """
+    lines = []
+
+    exit_codes = run_jobs(
+        [
+            python_job("admin", "print('one'); print('two')"),
+            python_job("public", "import sys; print('oops'); sys.exit(3)"),
+        ],
+        lines.append,
+        max_workers=2,
+    )
+
+    assert exit_codes == {"admin": 0, "public": 3}
+    assert sorted(lines) == ["[admin ] one", "[admin ] two", "[public] oops"]
+
+
+def test_run_jobs_reports_missing_executable():
+    """
+    GIVEN a job whose executable doesn't exist
+    WHEN it is run
+    THEN it should fail with exit code 127 and say why
+    """
+    lines = []
+
+    exit_codes = run_jobs([Job("admin", ["/nonexistent/tailwindcss"], cwd=None)], lines.append)
+
+    assert exit_codes == {"admin": 127}
+    assert lines[0].startswith("[admin] Failed to start /nonexistent/tailwindcss")
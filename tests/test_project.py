@@ -0,0 +1,68 @@
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management import CommandError
+
+from tailwind import project as project_module
+from tailwind.management.commands.tailwind import Command
+from tailwind.project import TailwindProject
+from tailwind.utils import get_app_path
+
+from .conftest import init_standalone_apps
+
+
+def test_tailwind_project_resolves_standalone_app(settings, cleanup_apps):
+    """
+    GIVEN a standalone Tailwind app
+    WHEN it is resolved into a TailwindProject
+    THEN its paths, mode and output path should be derived from the app and settings
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    app_path = get_app_path(app_name)
+
+    project = TailwindProject.resolve(app_name)
+
+    assert project.app_path == app_path
+    assert project.src_path == os.path.join(app_path, "static_src")
+    assert project.styles_dir == os.path.join(app_path, "static_src", "src")
+    assert project.is_tailwind_app
+    assert project.is_standalone
+    assert project.css_output_path == os.path.join(app_path, "static", "css/dist/styles.css")
+
+
+def test_tailwind_project_of_a_regular_app_is_not_a_tailwind_app(settings):
+    """
+    GIVEN an installed app without static_src
+    WHEN it is named in TAILWIND_APP_NAME and a command is run
+    THEN validation should fail with a clear message
+    """
+    settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, "tests"]
+    settings.TAILWIND_APP_NAME = "tests"
+
+    assert not TailwindProject.resolve("tests").is_tailwind_app
+    with pytest.raises(CommandError, match="'tests' isn't a Tailwind app"):
+        call_command("tailwind", "build", stdout=StringIO())
+
+
+def test_tailwind_build_resolves_the_app_once(settings, cleanup_apps):
+    """
+    GIVEN a standalone Tailwind app
+    WHEN the build command validates, builds and records stats
+    THEN the app's location should be looked up only once
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    settings.TAILWIND_APP_NAME = cleanup_apps[0]
+
+    with (
+        mock.patch.object(
+            project_module, "get_app_path", wraps=project_module.get_app_path
+        ) as get_app_path_mock,
+        mock.patch.object(Command, "tailwind_cli_build_command"),
+    ):
+        call_command("tailwind", "build", stdout=StringIO())
+
+    assert get_app_path_mock.call_count == 1
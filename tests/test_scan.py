@@ -0,0 +1,106 @@
+import os
+
+from tailwind.scan import ClassIndex
+from tailwind.scan import extract_candidates
+from tailwind.scan import extract_css_classes
+from tailwind.scan import get_scan_roots
+
+
+def write(path, contents):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def test_extract_candidates():
+    """
+    GIVEN a template with utility, variant and arbitrary-value classes
+    WHEN candidates are extracted
+    THEN every class should be found once, without trailing punctuation
+    """
+    candidates = extract_candidates(
+        '<div class="p-4 md:hover:bg-blue-500 w-[32rem] !mt-0 p-4">Hello.</div>'
+    )
+
+    assert {"p-4", "md:hover:bg-blue-500", "w-[32rem]", "!mt-0", "div", "class"} <= set(candidates)
+    assert candidates == sorted(set(candidates))
+
+
+def test_extract_css_classes():
+    """
+    GIVEN a compiled stylesheet with escaped selectors, at-rules and decimal values
+    WHEN its classes are extracted
+    THEN only class selectors should be returned, unescaped
+    """
+    css = (
+        "/* .commented */.p-4{padding:1rem}"
+        "@media (width>=48rem){.md\\:flex{display:flex}.w-\\[32rem\\]{width:32rem}}"
+        ".mt-0\\.5{margin-top:0.125rem}"
+    )
+
+    assert extract_css_classes(css) == {"p-4", "md:flex", "w-[32rem]", "mt-0.5"}
+
+
+def test_class_index_updates_incrementally(tmp_path):
+    """
+    GIVEN an index of a project's files
+    WHEN it is updated after a file changed, one was added and one removed
+    THEN only the changed and new files should be scanned again
+    """
+    app = tmp_path / "app"
+    write(app / "templates" / "a.html", '<p class="p-4"></p>')
+    write(app / "templates" / "b.html", '<p class="m-2"></p>')
+    removed = write(app / "views.py", 'CLASSES = "flex"')
+    write(app / "migrations" / "0001_initial.py", 'CLASSES = "hidden"')
+    index = ClassIndex(str(tmp_path / "index.json"), [str(app)])
+
+    assert index.update() == (3, 0, 0)
+
+    changed = app / "templates" / "a.html"
+    changed.write_text('<p class="p-8"></p>')
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    write(app / "templates" / "c.html", '<p class="grid"></p>')
+    removed.unlink()
+
+    index = ClassIndex(str(tmp_path / "index.json"), [str(app)])
+    assert index.update() == (2, 1, 1)
+    assert "p-8" in index.files[str(changed)]["candidates"]
+    assert not any("migrations" in path for path in index.files)
+
+
+def test_class_index_usage_stats_and_source_globs(tmp_path):
+    """
+    GIVEN an index of two roots, where only templates use stylesheet classes
+    WHEN usage stats and @source globs are requested
+    THEN hot files, unused classes and globs covering only those templates are returned
+    """
+    app = tmp_path / "app"
+    templates = tmp_path / "templates"
+    hot = write(app / "templates" / "hot.html", '<p class="p-4 m-2 flex"></p>')
+    write(app / "models.py", "class Page: pass")
+    write(templates / "base.html", '<body class="p-4"></body>')
+    index = ClassIndex(str(tmp_path / "index.json"), [str(app), str(templates)])
+    index.update()
+    css_classes = {"p-4", "m-2", "flex", "hidden"}
+
+    assert index.get_hot_files(css_classes, limit=1) == [(str(hot), 3)]
+    assert index.get_unused_classes(css_classes) == {"hidden"}
+    assert index.get_source_globs(str(tmp_path / "theme" / "static_src" / "src"), css_classes) == [
+        "../../../app/**/*.html",
+        "../../../templates/**/*.html",
+    ]
+
+
+def test_get_scan_roots_skips_site_packages(settings):
+    """
+    GIVEN INSTALLED_APPS with project apps and apps installed as packages
+    WHEN the scan roots are collected
+    THEN only project directories should be returned, without nested duplicates
+    """
+    settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, "tests"]
+    roots = get_scan_roots()
+
+    assert os.path.join(settings.BASE_DIR, "tests") in roots
+    assert not any("site-packages" in root for root in roots)
+    assert not any(root.startswith(parent + os.sep) for parent in roots for root in roots)
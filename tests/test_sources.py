@@ -0,0 +1,140 @@
+from tailwind.sources import expand_braces
+from tailwind.sources import get_source_globs
+from tailwind.sources import glob_to_regex
+from tailwind.sources import imports_generated_sources
+from tailwind.sources import iter_source_files
+from tailwind.sources import write_generated_sources
+
+
+def write(path, contents=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def test_get_source_globs_from_v4_stylesheet(tmp_path):
+    """
+    GIVEN a Tailwind v4 stylesheet with @source directives, one of them commented out
+    WHEN get_source_globs is called
+    THEN it should return the active globs resolved against the stylesheet directory
+    """
+    write(
+        tmp_path / "theme" / "static_src" / "src" / "styles.css",
+        '@import "tailwindcss";\n'
+        '/* @source "../ignored"; */\n'
+        '@source "../../../**/*.{html,py,js}";\n'
+        '@source not "../../../legacy/**";\n',
+    )
+
+    includes, excludes = get_source_globs(str(tmp_path / "theme" / "static_src"))
+
+    assert includes == [f"{tmp_path.as_posix()}/**/*.{{html,py,js}}"]
+    assert excludes == [f"{tmp_path.as_posix()}/legacy/**"]
+
+
+def test_get_source_globs_follows_local_imports(tmp_path):
+    """
+    GIVEN a Tailwind v4 stylesheet importing a local stylesheet with @source directives
+    WHEN get_source_globs is called
+    THEN the imported globs should be resolved against the imported stylesheet's directory
+    """
+    write(
+        tmp_path / "theme" / "static_src" / "src" / "styles.css",
+        '@import "tailwindcss";\n@import "./generated/sources.css";\n',
+    )
+    write(
+        tmp_path / "theme" / "static_src" / "src" / "generated" / "sources.css",
+        '@source "../../../../templates";\n@import "../styles.css";\n',
+    )
+    (tmp_path / "templates").mkdir()
+
+    includes, excludes = get_source_globs(str(tmp_path / "theme" / "static_src"))
+
+    assert includes == [f"{tmp_path.as_posix()}/templates/**/*"]
+    assert excludes == []
+
+
+def test_write_generated_sources(tmp_path):
+    """
+    GIVEN template and static directories of a project
+    WHEN the generated sources file is written twice
+    THEN it should list them relative to the stylesheet, and only be rewritten on change
+    """
+    styles_dir = tmp_path / "theme" / "static_src" / "src"
+    styles_css = write(styles_dir / "styles.css", '@import "tailwindcss";\n')
+    source_dirs = [
+        (str(tmp_path / "theme" / "templates"), None),
+        (str(tmp_path / "blog" / "static"), "js"),
+    ]
+
+    path, changed = write_generated_sources(str(styles_dir), source_dirs)
+    assert changed
+    with open(path) as f:
+        assert f.read().splitlines()[1:] == [
+            '@source "../../templates";',
+            '@source "../../../blog/static/**/*.js";',
+        ]
+    assert write_generated_sources(str(styles_dir), source_dirs) == (path, False)
+
+    assert not imports_generated_sources(str(styles_css))
+    styles_css.write_text('@import "tailwindcss";\n@import "./sources.css";\n')
+    assert imports_generated_sources(str(styles_css))
+
+
+def test_get_source_globs_from_v3_config(tmp_path):
+    """
+    GIVEN a Tailwind v3 config with commented-out and negated content globs
+    WHEN get_source_globs is called
+    THEN it should return the active globs resolved against the config directory
+    """
+    write(
+        tmp_path / "theme" / "static_src" / "tailwind.config.js",
+        "module.exports = {\n"
+        "  content: [\n"
+        "    '../templates/**/*.html',\n"
+        "    // '../../**/*.js',\n"
+        "    '!../../**/node_modules',\n"
+        "  ],\n"
+        "}\n",
+    )
+
+    includes, excludes = get_source_globs(str(tmp_path / "theme" / "static_src"))
+
+    assert includes == [f"{tmp_path.as_posix()}/theme/templates/**/*.html"]
+    assert excludes == [f"{tmp_path.as_posix()}/**/node_modules"]
+
+
+def test_glob_helpers():
+    """
+    GIVEN globs with braces and recursive wildcards
+    WHEN they are expanded and translated to regexes
+    THEN they should match like Tailwind's globs do
+    """
+    assert expand_braces("a/*.{html,py}") == ["a/*.html", "a/*.py"]
+    assert glob_to_regex("/a/**/*.html").match("/a/index.html")
+    assert glob_to_regex("/a/**/*.html").match("/a/b/c/index.html")
+    assert not glob_to_regex("/a/*.html").match("/a/b/index.html")
+
+
+def test_iter_source_files_prunes_ignored_dirs(tmp_path):
+    """
+    GIVEN a project with templates, node_modules and a virtualenv
+    WHEN iter_source_files walks it with a catch-all glob
+    THEN only project files matching the glob should be returned
+    """
+    write(tmp_path / "app" / "templates" / "index.html")
+    write(tmp_path / "app" / "views.py")
+    write(tmp_path / "app" / "legacy" / "old.html")
+    write(tmp_path / "app" / "static" / "styles.css")
+    write(tmp_path / "node_modules" / "pkg" / "index.js")
+    write(tmp_path / "env" / "pyvenv.cfg")
+    write(tmp_path / "env" / "lib" / "site.py")
+
+    files = iter_source_files(
+        [f"{tmp_path.as_posix()}/**/*.{{html,py,js}}"], [f"{tmp_path.as_posix()}/app/legacy/**"]
+    )
+
+    assert sorted(files) == [
+        str(tmp_path / "app" / "templates" / "index.html"),
+        str(tmp_path / "app" / "views.py"),
+    ]
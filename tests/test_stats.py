@@ -0,0 +1,222 @@
+import json
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+from tailwind.management.commands.tailwind import Command
+from tailwind.project import TailwindProject
+from tailwind.stats import BuildStats
+from tailwind.stats import count_css_rules
+from tailwind.stats import CSSBundleStats
+from tailwind.stats import iter_css_tokens
+from tailwind.utils import get_app_path
+
+from .conftest import init_standalone_apps
+
+BUNDLE_CSS = """/*! tailwindcss v4 */
+@layer theme, base, components, utilities;
+@layer theme { :root { --color-red-500: oklch(63.7% 0.237 25.331); --spacing: 0.25rem; } }
+@layer utilities {
+  .md\\:flex { @media (width >= 48rem) { display: flex; } }
+  .p-4 { padding: calc(var(--spacing) * 4); }
+  .before\\:content-\\[\\'\\{\\'\\] { --tw-content: "{;}"; content: var(--tw-content); }
+}
+@property --tw-content { syntax: "*"; inherits: false; initial-value: ""; }
+@keyframes spin { to { transform: rotate(360deg); } }
+"""
+
+
+def test_count_css_rules():
+    """
+    GIVEN a stylesheet with plain rules, nested at-rules and comments
+    WHEN count_css_rules is called
+    THEN only style rules should be counted
+    """
+    css = """
+    /* .commented { color: red } */
+    @layer utilities {
+      .p-4 { padding: 1rem }
+      @media (min-width: 640px) { .sm\\:p-8 { padding: 2rem } }
+    }
+    body, html { margin: 0 }
+    """
+
+    assert count_css_rules(css) == 3
+
+
+def test_build_stats_summary_and_json(tmp_path):
+    """
+    GIVEN timings and output stats recorded for an app
+    WHEN the stats are formatted and written
+    THEN both the summary and the JSON file should contain them
+    """
+    stats = BuildStats("build")
+    app_stats = stats.app("theme")
+    app_stats.add_phase("compile", 1.5)
+    app_stats.css_size, app_stats.css_rules, app_stats.source_files = 2048, 10, 3
+
+    stats_file = tmp_path / "stats.json"
+    stats.write(str(stats_file))
+
+    assert stats.format_summary()[0] == (
+        "theme: compile 1.50s; 2,048 bytes, 10 rules, 3 source files"
+    )
+    data = json.loads(stats_file.read_text())
+    assert data["command"] == "build"
+    assert data["apps"]["theme"]["phases"] == {"compile": 1.5}
+
+
+def test_build_command_writes_stats_file(settings, app_name, tmp_path):
+    """
+    GIVEN a standalone Tailwind app
+    WHEN the build command is run with --stats-file
+    THEN the stats summary should be printed and written as JSON
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    with open(os.path.join(get_app_path(app_name), "static_src", "src", "styles.css"), "w") as f:
+        f.write('@import "tailwindcss";\n@source "../../templates";\n')
+
+    def fake_build(command):
+        output_path = TailwindProject.resolve(app_name).css_output_path
+        os.makedirs(os.path.dirname(output_path))
+        with open(output_path, "w") as f:
+            f.write(".a{color:red}.b{color:blue}")
+
+    out = StringIO()
+    stats_file = tmp_path / "stats.json"
+    with mock.patch.object(Command, "tailwind_cli_build_command", fake_build):
+        call_command("tailwind", "build", "--stats-file", str(stats_file), stdout=out)
+
+    assert "Build stats:" in out.getvalue()
+    app_stats = json.loads(stats_file.read_text())["apps"][app_name]
+    assert set(app_stats["phases"]) == {"compile", "post_build"}
+    assert app_stats["css_size"] == 27
+    assert app_stats["css_rules"] == 2
+    assert app_stats["source_files"] == 1
+
+
+def test_build_stats_reuse_the_build_cache_source_count(settings, app_name, tmp_path):
+    """
+    GIVEN a standalone Tailwind app with the build cache enabled
+    WHEN the build command is run
+    THEN the source files should be counted by the fingerprint pass, not walked again
+    """
+    call_command(
+        "tailwind", "init", "--app-name", app_name, "--no-input", "--tailwind-version", "4s"
+    )
+    settings.INSTALLED_APPS += [app_name]
+    settings.TAILWIND_APP_NAME = app_name
+    settings.TAILWIND_BUILD_CACHE_DIR = str(tmp_path / "cache")
+    with open(os.path.join(get_app_path(app_name), "static_src", "src", "styles.css"), "w") as f:
+        f.write('@import "tailwindcss";\n@source "../../templates";\n')
+
+    def fake_build(command):
+        output_path = TailwindProject.resolve(app_name).css_output_path
+        os.makedirs(os.path.dirname(output_path))
+        with open(output_path, "w") as f:
+            f.write(".a{color:red}")
+
+    stats_file = tmp_path / "stats.json"
+    with (
+        mock.patch.object(Command, "tailwind_cli_build_command", fake_build),
+        mock.patch("tailwind.stats.iter_source_files") as iter_source_files,
+    ):
+        call_command("tailwind", "build", "--stats-file", str(stats_file), stdout=StringIO())
+
+    iter_source_files.assert_not_called()
+    assert json.loads(stats_file.read_text())["apps"][app_name]["source_files"] == 1
+
+
+def test_iter_css_tokens_across_chunk_boundaries():
+    """
+    GIVEN a stylesheet with comments, strings and escaped characters
+    WHEN it is tokenized whole and in chunks of every size up to 8 characters
+    THEN the tokens should be the same, with braces in strings and escapes kept as text
+    """
+
+    def tokenize(chunks):
+        # text may be split in several tokens at chunk boundaries
+        tokens = []
+        for token in iter_css_tokens(chunks):
+            if token in ("{", "}", ";") or not tokens or tokens[-1] in ("{", "}", ";"):
+                tokens.append(token)
+            else:
+                tokens[-1] += token
+        return tokens
+
+    tokens = tokenize([BUNDLE_CSS])
+    for size in range(1, 9):
+        chunks = [BUNDLE_CSS[i : i + size] for i in range(0, len(BUNDLE_CSS), size)]
+        assert tokenize(chunks) == tokens
+    assert "/*! tailwindcss v4 */" not in "".join(tokens)
+    assert ' --tw-content: "{;}"' in tokens
+    assert tokens.count("{") == tokens.count("}") == 10
+
+
+def test_css_bundle_stats(tmp_path):
+    """
+    GIVEN a compiled Tailwind v4 stylesheet
+    WHEN it is analyzed
+    THEN sizes, rules, layers and custom properties should be counted and sizes attributed
+    """
+    path = tmp_path / "styles.css"
+    path.write_text(BUNDLE_CSS)
+
+    stats = CSSBundleStats.from_file(str(path)).as_dict(top=2, class_files={"p-4": ["a.html"]})
+
+    assert stats["size"] == len(BUNDLE_CSS.encode())
+    assert 0 < stats["compressed_sizes"]["gzip"] < stats["size"]
+    assert stats["rules"] == 4
+    assert list(stats["layers"]) == ["theme", "base", "components", "utilities"]
+    assert stats["layers"]["base"] == 0
+    assert stats["custom_properties"] == 3
+    assert stats["custom_property_declarations"] == 3
+    assert stats["largest_media_queries"] == [{"query": "(width >= 48rem)", "size": 43}]
+    assert stats["largest_utilities"] == [
+        {"class": "before:content-['{']", "size": 83, "files": []},
+        {"class": "md:flex", "size": 59, "files": []},
+    ]
+    assert stats["largest_selectors"] == [
+        {"selector": ".before\\:content-\\[\\'\\{\\'\\]", "size": 83},
+        {"selector": ":root", "size": 74},
+    ]
+
+
+def test_stats_command_prints_table_and_json(settings, cleanup_apps):
+    """
+    GIVEN a built Tailwind app and a template using one of its utilities
+    WHEN the stats command is run, as a table and as JSON
+    THEN it should break down the stylesheet and list the template as a user of the utility
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    output_path = TailwindProject.resolve(app_name).css_output_path
+    os.makedirs(os.path.dirname(output_path))
+    with open(output_path, "w") as f:
+        f.write(BUNDLE_CSS)
+    template = os.path.join(get_app_path(app_name), "templates", "page.html")
+    with open(template, "w") as f:
+        f.write('<div class="p-4 md:flex"></div>')
+
+    out = StringIO()
+    call_command("tailwind", "stats", stdout=out)
+    json_out = StringIO()
+    call_command("tailwind", "stats", "--json", "--top", "1", stdout=json_out)
+
+    output = out.getvalue()
+    assert f"  Size: {len(BUNDLE_CSS.encode()):,} bytes, " in output
+    assert "  4 rules, 4 layers, 3 custom properties (3 declarations)" in output
+    assert "         43  @media (width >= 48rem)" in output
+    [md_flex] = [line for line in output.splitlines() if line.startswith("         59  md:flex  (")]
+    assert os.path.relpath(template) in md_flex
+    assert "  (not found in any indexed file)" in output
+    stats = json.loads(json_out.getvalue())["apps"][app_name]
+    assert stats["largest_utilities"] == [
+        {"class": "before:content-['{']", "size": 83, "files": []}
+    ]
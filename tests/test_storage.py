@@ -0,0 +1,94 @@
+import json
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+from tailwind.management.commands.tailwind import Command
+from tailwind.project import TailwindProject
+
+from .conftest import init_standalone_apps
+
+MANIFEST_STORAGE = "tailwind.storage.TailwindManifestStaticFilesStorage"
+
+
+def configure_storage(settings, tmp_path, backend):
+    settings.STATIC_ROOT = str(tmp_path / "static_root")
+    settings.STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": backend},
+    }
+
+
+def make_fake_build(app_name, calls):
+    def fake_build(command):
+        calls.append(app_name)
+        output_path = TailwindProject.resolve(app_name).css_output_path
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w") as f:
+            f.write(f".build-{len(calls)}{{color:red}}")
+
+    return fake_build
+
+
+def test_collectstatic_builds_and_hashes_stylesheet(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN the Tailwind manifest storage and a standalone app that hasn't been built
+    WHEN collectstatic is run
+    THEN the app should be built and its hashed, precompressed stylesheet written to STATIC_ROOT
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_PRECOMPRESS = True
+    configure_storage(settings, tmp_path, MANIFEST_STORAGE)
+    calls = []
+
+    with mock.patch.object(Command, "tailwind_cli_build_command", make_fake_build(app_name, calls)):
+        call_command("collectstatic", "--no-input", stdout=StringIO())
+
+    assert calls == [app_name]
+    with open(tmp_path / "static_root" / "staticfiles.json") as f:
+        hashed_path = json.load(f)["paths"]["css/dist/styles.css"]
+    assert hashed_path != "css/dist/styles.css"
+    hashed_file = tmp_path / "static_root" / hashed_path
+    assert hashed_file.read_text() == ".build-1{color:red}"
+    assert os.path.isfile(f"{hashed_file}.gz")
+
+
+def test_collectstatic_skips_build_when_cache_is_up_to_date(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN the Tailwind storage and TAILWIND_BUILD_CACHE_DIR
+    WHEN collectstatic is run twice without changes in between
+    THEN the app should only be built once and STATIC_ROOT should hold the cached stylesheet
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_BUILD_CACHE_DIR = str(tmp_path / "cache")
+    configure_storage(settings, tmp_path, "tailwind.storage.TailwindStaticFilesStorage")
+    calls = []
+
+    with mock.patch.object(Command, "tailwind_cli_build_command", make_fake_build(app_name, calls)):
+        call_command("collectstatic", "--no-input", stdout=StringIO())
+        call_command("collectstatic", "--no-input", stdout=StringIO())
+
+    assert calls == [app_name]
+    collected = tmp_path / "static_root" / "css" / "dist" / "styles.css"
+    assert collected.read_text() == ".build-1{color:red}"
+
+
+def test_collectstatic_dry_run_does_not_build(settings, tmp_path, cleanup_apps):
+    """
+    GIVEN the Tailwind storage
+    WHEN collectstatic is run with --dry-run
+    THEN nothing should be built
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    configure_storage(settings, tmp_path, MANIFEST_STORAGE)
+    calls = []
+
+    with mock.patch.object(Command, "tailwind_cli_build_command", make_fake_build(app_name, calls)):
+        call_command("collectstatic", "--no-input", "--dry-run", stdout=StringIO())
+
+    assert calls == []
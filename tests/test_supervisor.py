@@ -0,0 +1,102 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+from tailwind.supervisor import parse_procfile
+from tailwind.supervisor import Supervisor
+
+PYTHON = f'"{sys.executable}"'
+
+
+def test_parse_procfile(tmp_path):
+    """
+    GIVEN a Procfile with comments and blank lines
+    WHEN it is parsed
+    THEN every `name: command` line should be returned in order
+    """
+    procfile = tmp_path / "Procfile.tailwind"
+    procfile.write_text(
+        "# dev processes\n"
+        "django: python manage.py runserver 0.0.0.0:8000\n"
+        "\n"
+        "tailwind: python manage.py tailwind start\n"
+    )
+
+    assert parse_procfile(procfile) == {
+        "django": "python manage.py runserver 0.0.0.0:8000",
+        "tailwind": "python manage.py tailwind start",
+    }
+
+
+def test_supervisor_prefixes_output_of_every_process():
+    """
+    GIVEN two processes that print a line and exit cleanly
+    WHEN the supervisor runs them
+    THEN every line should be prefixed with its process name, aligned
+    """
+    lines = []
+    Supervisor(
+        {
+            "django": f"{PYTHON} -c \"print('hello from django')\"",
+            "tw": f"{PYTHON} -c \"print('hello from tailwind')\"",
+        },
+        lines.append,
+    ).run()
+
+    assert any(line.endswith("django | hello from django") for line in lines)
+    assert any(line.endswith("tw     | hello from tailwind") for line in lines)
+
+
+def test_supervisor_restarts_crashed_process_with_backoff(tmp_path):
+    """
+    GIVEN a process that crashes twice before succeeding
+    WHEN the supervisor runs it
+    THEN it should be restarted after a delay that doubles with every crash
+    """
+    counter = tmp_path / "runs"
+    script = (
+        "import pathlib, sys; p = pathlib.Path(sys.argv[1]); "
+        "n = len(p.read_text()) if p.exists() else 0; p.write_text('x' * (n + 1)); "
+        "sys.exit(1 if n < 2 else 0)"
+    )
+    lines = []
+    Supervisor(
+        {"flaky": f'{PYTHON} -c "{script}" "{counter}"'},
+        lines.append,
+        restart_delay=0.05,
+    ).run()
+
+    assert counter.read_text() == "xxx"
+    restarts = [line for line in lines if "exited with code 1" in line]
+    assert restarts[0].endswith("restarting in 0.05s")
+    assert restarts[1].endswith("restarting in 0.1s")
+
+
+def test_supervisor_stops_every_process_on_sigterm():
+    """
+    GIVEN two long-running processes
+    WHEN the supervisor receives SIGTERM
+    THEN both processes should be stopped and the supervisor should return
+    """
+    lines = []
+    supervisor = Supervisor(
+        {
+            "sleeper": f'{PYTHON} -c "import time; time.sleep(60)"',
+            "reader": f'{PYTHON} -c "import sys; sys.stdin.read()"',
+        },
+        lines.append,
+    )
+
+    def send_sigterm():
+        while sum("started" in line for line in lines) < 2:
+            time.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    threading.Thread(target=send_sigterm, daemon=True).start()
+    started = time.monotonic()
+    supervisor.run()
+
+    assert time.monotonic() - started < 10
+    assert sum(line.endswith("| stopped") for line in lines) == 2
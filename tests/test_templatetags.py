@@ -1,8 +1,20 @@
+import os
 import time
+from io import StringIO
+from unittest import mock
 
+from django.core.management import call_command
 from django.template import Context
 from django.template import Template
 
+from tailwind import manifest as manifest_module
+from tailwind.manifest import read_manifest
+from tailwind.manifest import write_manifest
+from tailwind.templatetags.tailwind_tags import render_tag_cached
+
+from .conftest import init_standalone_apps
+from .conftest import make_fake_tailwind_cli
+
 
 def test_tailwind_css_in_production(settings):
     """
@@ -133,3 +145,289 @@ def test_tailwind_preload_css_with_version(settings):
     ).render(Context())
 
     assert '<link rel="preload" href="/static/css/dist/styles.css?v=123" as="style">' in output
+
+
+def build_versioned_stylesheet(static_dir, versioning):
+    output_path = static_dir / "css" / "dist" / "styles.css"
+    output_path.parent.mkdir(parents=True)
+    output_path.write_text("body{color:red}")
+    return write_manifest(str(output_path), "css/dist/styles.css", versioning)
+
+
+def test_tailwind_css_with_content_hash_versioning(settings, tmp_path):
+    """
+    GIVEN the stylesheet was built with TAILWIND_CSS_VERSIONING="query"
+    WHEN the tailwind_css and tailwind_preload_css tags are rendered in production
+    THEN both should reference the stylesheet with its content hash as the version
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.TAILWIND_CSS_VERSIONING = "query"
+    manifest = build_versioned_stylesheet(tmp_path, "query")
+
+    output = Template(
+        """
+        {% load tailwind_tags %}
+        {% tailwind_preload_css %}
+        {% tailwind_css %}
+        """
+    ).render(Context({}))
+
+    assert (
+        f'<link rel="preload" href="/static/css/dist/styles.css?v={manifest["hash"]}" as="style">'
+        in output
+    )
+    assert (
+        f'<link rel="stylesheet" type="text/css" href="/static/css/dist/styles.css?v={manifest["hash"]}">'
+        in output
+    )
+
+
+def test_tailwind_css_with_hashed_filename_versioning(settings, tmp_path):
+    """
+    GIVEN the stylesheet was built with TAILWIND_CSS_VERSIONING="filename"
+    WHEN the tailwind_css tag is rendered in production
+    THEN it should reference the hashed copy of the stylesheet
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.TAILWIND_CSS_VERSIONING = "filename"
+    manifest = build_versioned_stylesheet(tmp_path, "filename")
+
+    output = Template(
+        """
+        {% load tailwind_tags %}
+        {% tailwind_css %}
+        """
+    ).render(Context({}))
+
+    assert (tmp_path / manifest["hashed_path"]).is_file()
+    assert (
+        f'<link rel="stylesheet" type="text/css" href="/static/css/dist/styles.{manifest["hash"]}.css">'
+        in output
+    )
+
+
+def test_tailwind_css_with_versioning_but_no_manifest(settings, tmp_path):
+    """
+    GIVEN TAILWIND_CSS_VERSIONING is set but the stylesheet has no manifest
+    WHEN the tailwind_css tag is rendered in production
+    THEN it should fall back to the plain static CSS path
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.TAILWIND_CSS_VERSIONING = "query"
+    read_manifest.cache_clear()
+
+    output = Template(
+        """
+        {% load tailwind_tags %}
+        {% tailwind_css %}
+        """
+    ).render(Context({}))
+
+    assert '<link rel="stylesheet" type="text/css" href="/static/css/dist/styles.css">' in output
+
+
+def test_tailwind_css_rendering_is_cached_in_production(settings):
+    """
+    GIVEN Tailwind is configured for production mode (DEBUG=False)
+    WHEN the tailwind_css tag is rendered several times with the same version
+    THEN the markup should be rendered once and served from the cache afterwards
+    """
+    settings.TAILWIND_APP_NAME = "theme"
+    template = Template(
+        """
+        {% load tailwind_tags %}
+        {% tailwind_css v=1 %}
+        {% tailwind_preload_css v=1 %}
+        """
+    )
+
+    first = template.render(Context({}))
+    second = template.render(Context({}))
+
+    assert first == second
+    cache_info = render_tag_cached.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (2, 2)
+
+
+def test_tailwind_css_rendering_is_not_cached_in_debug(settings):
+    """
+    GIVEN Tailwind is configured for debug mode (DEBUG=True)
+    WHEN the tailwind_css tag is rendered
+    THEN the rendering cache should not be used
+    """
+    settings.TAILWIND_APP_NAME = "theme"
+    settings.DEBUG = True
+
+    Template("{% load tailwind_tags %}{% tailwind_css %}").render(Context({}))
+
+    assert render_tag_cached.cache_info().currsize == 0
+
+
+def write_stylesheet(static_dir, contents, path="css/dist/styles.css"):
+    output_path = static_dir / path
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(contents)
+    return output_path
+
+
+def test_tailwind_inline_css(settings, tmp_path):
+    """
+    GIVEN a compiled stylesheet within the inline size budget
+    WHEN the tailwind_inline_css tag is rendered
+    THEN the stylesheet should be embedded in a style block
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    write_stylesheet(tmp_path, "body{color:red}")
+
+    output = Template("{% load tailwind_tags %}{% tailwind_inline_css %}").render(Context({}))
+
+    assert output == "<style>body{color:red}</style>"
+
+
+def test_tailwind_inline_css_critical_subset(settings, tmp_path):
+    """
+    GIVEN a critical subset of the stylesheet
+    WHEN the tailwind_inline_css tag is rendered with its path
+    THEN the subset should be embedded with closing style tags neutralized
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    write_stylesheet(tmp_path, 'a::after{content:"</style>"}', path="css/dist/critical.css")
+
+    output = Template(
+        '{% load tailwind_tags %}{% tailwind_inline_css path="css/dist/critical.css" %}'
+    ).render(Context({}))
+
+    assert output == '<style>a::after{content:"<\\/style>"}</style>'
+
+
+def test_tailwind_inline_css_over_budget_falls_back_to_link(settings, tmp_path):
+    """
+    GIVEN a compiled stylesheet larger than TAILWIND_INLINE_CSS_MAX_SIZE
+    WHEN the tailwind_inline_css tag is rendered
+    THEN it should fall back to the stylesheet link
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.TAILWIND_INLINE_CSS_MAX_SIZE = 10
+    write_stylesheet(tmp_path, "body{color:red}")
+
+    output = Template("{% load tailwind_tags %}{% tailwind_inline_css %}").render(Context({}))
+
+    assert '<link rel="stylesheet" type="text/css" href="/static/css/dist/styles.css">' in output
+
+
+def test_tailwind_inline_css_missing_file_falls_back_to_link(settings, tmp_path):
+    """
+    GIVEN the compiled stylesheet can't be found by the staticfiles finders
+    WHEN the tailwind_inline_css tag is rendered
+    THEN it should fall back to the stylesheet link
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+
+    output = Template("{% load tailwind_tags %}{% tailwind_inline_css v=1 %}").render(Context({}))
+
+    assert (
+        '<link rel="stylesheet" type="text/css" href="/static/css/dist/styles.css?v=1">' in output
+    )
+
+
+def test_tailwind_inline_css_reloads_on_change_in_debug(settings, tmp_path):
+    """
+    GIVEN the stylesheet has been inlined once in debug mode
+    WHEN the file changes on disk
+    THEN the next render should embed the new contents
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.DEBUG = True
+    output_path = write_stylesheet(tmp_path, "body{color:red}")
+    template = Template("{% load tailwind_tags %}{% tailwind_inline_css %}")
+    assert template.render(Context({})) == "<style>body{color:red}</style>"
+
+    output_path.write_text("body{color:blue}")
+    os.utime(output_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    assert template.render(Context({})) == "<style>body{color:blue}</style>"
+
+
+def test_tailwind_css_dev_version_changes_only_on_rebuild(settings, tmp_path):
+    """
+    GIVEN a compiled stylesheet in debug mode
+    WHEN the tailwind_css tag is rendered before and after the stylesheet is rebuilt
+    THEN the version should stay the same until the rebuild and change after it
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.DEBUG = True
+    output_path = write_stylesheet(tmp_path, "body{color:red}")
+    template = Template("{% load tailwind_tags %}{% tailwind_css %}")
+    stat = os.stat(output_path)
+    expected_version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    first = template.render(Context({}))
+    assert f"styles.css?v={expected_version}" in first
+    assert template.render(Context({})) == first
+
+    output_path.write_text("body{color:blue}")
+    os.utime(output_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    with mock.patch.object(manifest_module, "DEV_VERSION_CHECK_INTERVAL", 0):
+        assert template.render(Context({})) != first
+
+
+def test_tailwind_css_dev_version_stat_is_rate_limited(settings, tmp_path):
+    """
+    GIVEN a compiled stylesheet in debug mode
+    WHEN the tailwind_css tag is rendered many times within the check interval
+    THEN the stylesheet should be located and stat()ed only once
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    settings.DEBUG = True
+    write_stylesheet(tmp_path, "body{color:red}")
+    template = Template("{% load tailwind_tags %}{% tailwind_css %}")
+
+    with (
+        mock.patch.object(
+            manifest_module, "find_static_file", wraps=manifest_module.find_static_file
+        ) as find,
+        mock.patch.object(
+            manifest_module, "stat_version", wraps=manifest_module.stat_version
+        ) as stat_version,
+    ):
+        for _ in range(10):
+            template.render(Context({}))
+
+    assert find.call_count == 1
+    # the cached path is empty on the first render, then the found file is stat()ed
+    assert stat_version.call_count == 2
+
+
+def test_tailwind_css_links_and_versions_each_app(settings, tmp_path, monkeypatch, cleanup_apps):
+    """
+    GIVEN two Tailwind apps building to their own stylesheets with TAILWIND_CSS_VERSIONING
+    WHEN they are built and the tags are rendered with app= in production
+    THEN each tag should link its app's stylesheet with that stylesheet's content hash
+    """
+    cleanup_apps += init_standalone_apps(settings, 2)
+    settings.TAILWIND_STANDALONE_BUILD_COMMAND_ARGS = {
+        app_name: f"-i static_src/src/styles.css -o static/css/{app_name}.css --minify"
+        for app_name in cleanup_apps
+    }
+    settings.TAILWIND_STANDALONE_BINARY_VERSION = "fake"
+    settings.TAILWIND_CSS_VERSIONING = "query"
+    bin_dir = tmp_path / "bin" / "fake"
+    bin_dir.mkdir(parents=True)
+    make_fake_tailwind_cli(str(bin_dir))
+    monkeypatch.setenv("TAILWINDCSS_BIN_DIR", str(tmp_path / "bin"))
+    call_command("tailwind", "build", stdout=StringIO())
+    settings.DEBUG = False
+
+    first, second = cleanup_apps
+    output = Template(
+        f"""
+        {{% load tailwind_tags %}}
+        {{% tailwind_preload_css app="{first}" %}}
+        {{% tailwind_css app="{second}" %}}
+        """
+    ).render(Context({}))
+
+    first_hash = read_manifest(f"css/{first}.css")["hash"]
+    second_hash = read_manifest(f"css/{second}.css")["hash"]
+    assert f'href="/static/css/{first}.css?v={first_hash}" as="style"' in output
+    assert f'href="/static/css/{second}.css?v={second_hash}">' in output
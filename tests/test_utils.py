@@ -4,6 +4,8 @@ import tempfile
 from tailwind.utils import extract_host_and_port
 from tailwind.utils import extract_protocol_from_command
 from tailwind.utils import extract_server_url_from_procfile
+from tailwind.utils import get_script_output_arg
+from tailwind.utils import remove_watch_args
 
 
 def test_extract_protocol_from_command():
@@ -77,3 +79,33 @@ def test_extract_server_url_from_procfile():
         f.flush()
         assert extract_server_url_from_procfile(f.name) is None
         os.unlink(f.name)
+
+
+def test_remove_watch_args():
+    """
+    GIVEN standalone binary arguments with watch and poll flags
+    WHEN remove_watch_args is called
+    THEN it should return the arguments without those flags
+    """
+    assert (
+        remove_watch_args("-i src/styles.css -o out.css --watch") == "-i src/styles.css -o out.css"
+    )
+    assert remove_watch_args("-w --poll -i in.css --watch=always") == "-i in.css"
+
+
+def test_get_script_output_arg_follows_run_scripts():
+    """
+    GIVEN package.json scripts whose build script runs other scripts
+    WHEN get_script_output_arg is called for the build script
+    THEN it should return the -o argument of the script that compiles the stylesheet
+    """
+    scripts = {
+        "build": "npm run build:clean && npm run build:tailwind",
+        "build:clean": "rimraf ../static/css/dist",
+        "build:tailwind": "postcss ./src/styles.css -o ../static/admin/styles.css --minify",
+        "loop": "npm run loop",
+    }
+
+    assert get_script_output_arg(scripts, "build") == "../static/admin/styles.css"
+    assert get_script_output_arg(scripts, "loop") is None
+    assert get_script_output_arg(scripts, "missing") is None
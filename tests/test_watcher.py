@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from tailwind import watcher as watcher_module
+from tailwind.utils import get_app_path
+from tailwind.watcher import DebouncedWatcher
+from tailwind.watcher import WatchedApp
+
+from .conftest import init_standalone_apps
+from .conftest import make_fake_tailwind_cli
+
+
+def make_app(tmp_path):
+    (tmp_path / "static_src" / "src").mkdir(parents=True)
+    (tmp_path / "static_src" / "src" / "styles.css").write_text(
+        '@import "tailwindcss";\n@source "../../templates";\n'
+    )
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "static" / "css" / "dist").mkdir(parents=True)
+    return WatchedApp(
+        "theme",
+        str(tmp_path / "static_src"),
+        str(tmp_path / "static" / "css" / "dist" / "styles.css"),
+    )
+
+
+def touch(path, content="x"):
+    path.write_text(content)
+    # a later mtime, even on file systems with coarse timestamps
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+
+def test_watcher_coalesces_bursts_into_one_rebuild(tmp_path):
+    """
+    GIVEN a debounced watcher over a Tailwind app
+    WHEN many templates change in a burst, and more change while the rebuild runs
+    THEN it should wait for a quiet period, rebuild once for the burst and once for the rest
+    """
+    app = make_app(tmp_path)
+    rebuilt = []
+
+    def rebuild(app_name):
+        rebuilt.append(app_name)
+        if len(rebuilt) == 1:
+            touch(tmp_path / "templates" / "late.html")
+        return True
+
+    watcher = DebouncedWatcher([app], rebuild, debounce=0.2)
+
+    for index in range(20):
+        touch(tmp_path / "templates" / f"page{index}.html")
+    assert watcher.poll() == ["theme"]
+    assert not watcher.is_settled()
+    touch(tmp_path / "templates" / "page0.html", "changed again")
+    watcher.poll()
+    time.sleep(0.2)
+    assert watcher.poll() == []
+    assert watcher.is_settled()
+
+    [first] = watcher.rebuild_pending()
+    assert first.app_name == "theme"
+    assert first.changed_files == 20
+    assert first.ok
+    assert first.latency >= first.duration
+
+    assert watcher.poll() == ["theme"]
+    time.sleep(0.2)
+    watcher.poll()
+    [second] = watcher.rebuild_pending()
+    assert second.changed_files == 1
+    assert rebuilt == ["theme", "theme"]
+
+
+def test_watcher_ignores_build_output(tmp_path):
+    """
+    GIVEN a debounced watcher whose app scans the directory its stylesheet is written to
+    WHEN the stylesheet and its compressed copy are written
+    THEN no rebuild should be scheduled
+    """
+    app = make_app(tmp_path)
+    (tmp_path / "static_src" / "src" / "styles.css").write_text('@source "../../static";\n')
+    watcher = DebouncedWatcher([app], lambda app_name: True, debounce=0)
+
+    touch(tmp_path / "static" / "css" / "dist" / "styles.css")
+    touch(tmp_path / "static" / "css" / "dist" / "styles.css.gz")
+
+    assert watcher.poll() == []
+    touch(tmp_path / "static" / "app.js")
+    assert watcher.poll() == ["theme"]
+
+
+def test_watcher_parses_source_globs_only_when_styles_change(tmp_path):
+    """
+    GIVEN a debounced watcher over a Tailwind app
+    WHEN templates change, then styles.css adds an @source
+    THEN the globs should only be parsed again for the styles.css change, and cover the new source
+    """
+    app = make_app(tmp_path)
+    (tmp_path / "components").mkdir()
+    watcher = DebouncedWatcher([app], lambda app_name: True, debounce=0)
+
+    with mock.patch.object(
+        watcher_module, "get_source_globs", wraps=watcher_module.get_source_globs
+    ) as get_source_globs:
+        for index in range(3):
+            touch(tmp_path / "templates" / f"page{index}.html")
+            assert watcher.poll() == ["theme"]
+        touch(tmp_path / "components" / "button.html")
+        assert watcher.poll() == []
+        assert get_source_globs.call_count == 0
+
+        with open(tmp_path / "static_src" / "src" / "styles.css", "a") as f:
+            f.write('@source "../../components";\n')
+        assert watcher.poll() == ["theme"]
+        touch(tmp_path / "components" / "button.html", "changed")
+        assert watcher.poll() == ["theme"]
+        assert get_source_globs.call_count == 1
+
+
+def test_watcher_uses_file_events_with_watchfiles(tmp_path):
+    """
+    GIVEN a debounced watcher over a Tailwind app, with watchfiles installed
+    WHEN a template and the build output change while it runs
+    THEN it should rebuild once for the template, without rescanning the watched files
+    """
+    pytest.importorskip("watchfiles")
+    app = make_app(tmp_path)
+    rebuilds = []
+    watcher = DebouncedWatcher([app], lambda app_name: True, debounce=0.1, poll_interval=0.05)
+
+    def change_files():
+        time.sleep(0.5)
+        touch(tmp_path / "static" / "css" / "dist" / "styles.css")
+        touch(tmp_path / "templates" / "page.html")
+
+    changes = threading.Thread(target=change_files)
+    changes.start()
+    with mock.patch.object(DebouncedWatcher, "poll") as poll:
+        watcher.run(rebuilds.append, lambda: rebuilds)
+    changes.join()
+
+    poll.assert_not_called()
+    [rebuild] = rebuilds
+    assert rebuild.changed_files == 1
+
+
+def test_start_with_debounce_rebuilds_after_changes(
+    settings,
+    tmp_path,
+    capfd,
+    monkeypatch,
+    cleanup_apps,
+):
+    """
+    GIVEN a standalone Tailwind app
+    WHEN `tailwind start --debounce` is run and a template changes
+    THEN it should build once, rebuild after the quiet period and report the latency
+    """
+    cleanup_apps += init_standalone_apps(settings, 1)
+    app_name = settings.TAILWIND_APP_NAME = cleanup_apps[0]
+    settings.TAILWIND_STANDALONE_BINARY_VERSION = "fake"
+    bin_dir = tmp_path / "bin" / "fake"
+    bin_dir.mkdir(parents=True)
+    make_fake_tailwind_cli(str(bin_dir))
+    monkeypatch.setenv("TAILWINDCSS_BIN_DIR", str(tmp_path / "bin"))
+    template = tmp_path / "page.html"
+    styles_css = os.path.join(get_app_path(app_name), "static_src", "src", "styles.css")
+    with open(styles_css, "a") as f:
+        f.write(f'\n@source "{tmp_path}";\n')
+    run = DebouncedWatcher.run
+
+    def run_once(watcher, on_rebuild):
+        rebuilds = []
+        watcher.poll_interval = 0.05
+        # the template is touched before the watcher runs, so only a rescan notices it
+        watcher.watchfiles = None
+        touch(template)
+        run(watcher, lambda rebuild: rebuilds.append(on_rebuild(rebuild)), lambda: rebuilds)
+
+    out = StringIO()
+    with mock.patch.object(DebouncedWatcher, "run", run_once):
+        call_command("tailwind", "start", "--debounce", "0.1", stdout=out)
+
+    output = out.getvalue()
+    assert "rebuilding once changes have been quiet for 0.1s" in output
+    assert capfd.readouterr().out.count("built static/css/dist/styles.css") == 2
+    assert f"Rebuilt '{app_name}' for 1 changed file (build " in output
+    assert "ms after the first change" in output